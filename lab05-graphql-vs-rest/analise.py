@@ -4,13 +4,14 @@ Disciplina: Laboratório de Experimentação de Software
 Curso: Engenharia de Software
 """
 
-import pandas as pd
-import numpy as np
-from scipy import stats
+import csv
 import os
 import warnings
 warnings.filterwarnings('ignore')
 
+from quantis import (SKETCH_FILE, load_sketches, rollup, sketch_mean, sketch_quantile,
+                     sketches_from_dataframe, update_group_sketches)
+
 # Configuração
 INPUT_DIR = "results"
 INPUT_FILE = "experiment_results.csv"
@@ -20,7 +21,8 @@ INPUT_FILE = "experiment_results.csv"
 # ============================================
 
 def load_data():
-    """Carrega os dados do experimento"""
+    """Carrega os dados do experimento (tipos estreitos, particionado por grupo)"""
+    from dados import read_results
     filepath = os.path.join(INPUT_DIR, INPUT_FILE)
     
     if not os.path.exists(filepath):
@@ -28,14 +30,58 @@ def load_data():
         print("Execute primeiro o experimento.py")
         exit(1)
     
-    df = pd.read_csv(filepath)
+    df = read_results(filepath)
     print(f"Dados carregados: {len(df)} registros")
     print(f"Colunas: {list(df.columns)}")
-    print(f"APIs: {df['api_type'].unique()}")
-    print(f"Complexidades: {df['complexity'].unique()}")
+    print(f"APIs: {list(df['api_type'].unique())}")
+    print(f"Complexidades: {list(df['complexity'].unique())}")
     print(f"Repositórios: {df['repository'].nunique()}\n")
     return df
 
+# ============================================
+# RESUMO RÁPIDO (SEM PANDAS/SCIPY)
+# ============================================
+
+def summary_only(filepath=None):
+    """Resumo por API e complexidade usando só a biblioteca padrão (dados brutos)
+
+    Usa os sketches salvos pelo experimento, se não forem mais antigos que
+    o CSV, ou os constrói lendo o CSV em fluxo, sem carregar pandas, scipy
+    ou bibliotecas de gráficos. Não há limpeza: é uma visão dos dados brutos.
+    """
+    filepath = filepath or os.path.join(INPUT_DIR, INPUT_FILE)
+    sketch_path = os.path.join(os.path.dirname(filepath), SKETCH_FILE)
+    
+    if os.path.exists(sketch_path) and (not os.path.exists(filepath) or
+                                        os.path.getmtime(sketch_path) >= os.path.getmtime(filepath)):
+        sketches = load_sketches(sketch_path)
+    elif os.path.exists(filepath):
+        sketches = {}
+        with open(filepath, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                update_group_sketches(sketches, row['api_type'], row['complexity'], row['repository'],
+                                      float(row['time_ms']), float(row['size_bytes']))
+    else:
+        print(f"ERRO: Arquivo não encontrado: {filepath}")
+        exit(1)
+    
+    print("=" * 70)
+    print("RESUMO RÁPIDO POR API E COMPLEXIDADE (dados brutos, sem limpeza)")
+    print("=" * 70)
+    print(f"{'Complexidade':<12} {'API':<8} {'N':>6} | {'Tempo μ':>9} {'p50':>9} {'p95':>9} | {'Tam. μ':>9}")
+    print("-" * 70)
+    time_rolled = rollup(sketches, 'time_ms', by=('complexity', 'api_type'))
+    size_rolled = rollup(sketches, 'size_bytes', by=('complexity', 'api_type'))
+    for complexity in ['simple', 'medium', 'complex']:
+        for api in ['REST', 'GraphQL']:
+            t = time_rolled.get((complexity, api))
+            if t is None:
+                continue
+            size = size_rolled[(complexity, api)]
+            print(f"{complexity:<12} {api:<8} {t['count']:>6} | {sketch_mean(t):>9.1f} "
+                  f"{sketch_quantile(t, 0.5):>9.1f} {sketch_quantile(t, 0.95):>9.1f} | "
+                  f"{sketch_mean(size):>9.0f}")
+
 # ============================================
 # ESTATÍSTICAS DESCRITIVAS
 # ============================================
@@ -50,7 +96,7 @@ def descriptive_stats(df):
     print("\n" + "-" * 70)
     print("TEMPO DE RESPOSTA (ms) - Por Tipo de API")
     print("-" * 70)
-    time_stats = df.groupby('api_type')['time_ms'].agg([
+    time_stats = df.groupby('api_type', observed=True)['time_ms'].agg([
         ('N', 'count'),
         ('Média', 'mean'),
         ('Desvio Padrão', 'std'),
@@ -63,7 +109,7 @@ def descriptive_stats(df):
     print("\n" + "-" * 70)
     print("TAMANHO DA RESPOSTA (bytes) - Por Tipo de API")
     print("-" * 70)
-    size_stats = df.groupby('api_type')['size_bytes'].agg([
+    size_stats = df.groupby('api_type', observed=True)['size_bytes'].agg([
         ('N', 'count'),
         ('Média', 'mean'),
         ('Desvio Padrão', 'std'),
@@ -77,7 +123,7 @@ def descriptive_stats(df):
     print("\n" + "-" * 70)
     print("TEMPO DE RESPOSTA (ms) - Por Complexidade e API")
     print("-" * 70)
-    time_complex = df.groupby(['complexity', 'api_type'])['time_ms'].agg([
+    time_complex = df.groupby(['complexity', 'api_type'], observed=True)['time_ms'].agg([
         ('N', 'count'),
         ('Média', 'mean'),
         ('Desvio Padrão', 'std'),
@@ -88,7 +134,7 @@ def descriptive_stats(df):
     print("\n" + "-" * 70)
     print("TAMANHO DA RESPOSTA (bytes) - Por Complexidade e API")
     print("-" * 70)
-    size_complex = df.groupby(['complexity', 'api_type'])['size_bytes'].agg([
+    size_complex = df.groupby(['complexity', 'api_type'], observed=True)['size_bytes'].agg([
         ('N', 'count'),
         ('Média', 'mean'),
         ('Desvio Padrão', 'std'),
@@ -98,45 +144,116 @@ def descriptive_stats(df):
     
     return time_stats, size_stats
 
+# ============================================
+# PERCENTIS (SKETCHES DE QUANTIS)
+# ============================================
+
+PERCENTILES = [0.50, 0.90, 0.95, 0.99]
+
+def percentile_summary(df):
+    """Exibe percentis por API e complexidade a partir dos sketches
+    
+    Os sketches são construídos a partir de `df` (já limpo), e não de
+    sketches.json, que o experimento grava com os dados brutos.
+    """
+    print("\n" + "=" * 70)
+    print("PERCENTIS (sketches de quantis, erro relativo ≤ 1%)")
+    print("=" * 70)
+    
+    sketches = sketches_from_dataframe(df)
+    header = " | ".join(f"p{int(q * 100):<7}" for q in PERCENTILES)
+    results = {}
+    
+    for metric, unit in [('time_ms', 'ms'), ('size_bytes', 'bytes')]:
+        metric_name = "TEMPO DE RESPOSTA" if metric == 'time_ms' else "TAMANHO DA RESPOSTA"
+        print(f"\n{metric_name} ({unit})")
+        print(f"{'Complexidade':<12} {'API':<8} | {header}")
+        print("-" * 70)
+        rolled = rollup(sketches, metric, by=('complexity', 'api_type'))
+        for complexity in ['simple', 'medium', 'complex']:
+            for api in ['REST', 'GraphQL']:
+                sketch = rolled.get((complexity, api))
+                if sketch is None:
+                    continue
+                values = [sketch_quantile(sketch, q) for q in PERCENTILES]
+                results[(metric, complexity, api)] = dict(zip(PERCENTILES, values))
+                row = " | ".join(f"{v:<8.1f}" for v in values)
+                print(f"{complexity:<12} {api:<8} | {row}")
+    
+    return results
+
 # ============================================
 # TESTES DE NORMALIDADE
 # ============================================
 
 def normality_tests(df):
-    """Executa testes de normalidade (Shapiro-Wilk)"""
+    """Normalidade e ajuste de distribuições sobre os dados completos (normalidade.py)
+    
+    Grupos acima de SKETCH_ROWS linhas usam os sketches de quantis (os
+    mesmos de percentile_summary): KS sobre os bins em vez de ordenar o
+    vetor completo, e Shapiro nas subamostras sorteadas da coluna.
+    """
+    from dados import group_view
+    from normalidade import ALPHA, SKETCH_ROWS, fit_report, normality_verdict, sketch_fit_report
     print("\n" + "=" * 70)
-    print("TESTES DE NORMALIDADE (Shapiro-Wilk)")
+    print("TESTES DE NORMALIDADE E AJUSTE DE DISTRIBUIÇÕES")
     print("=" * 70)
     print("H0: Os dados seguem distribuição normal")
     print("H1: Os dados NÃO seguem distribuição normal")
-    print("Nível de significância: α = 0.05")
+    print(f"Nível de significância: α = {ALPHA}")
+    print("Anderson-Darling sobre todos os dados + Shapiro-Wilk repetido em subamostras")
+    print(f"(acima de {SKETCH_ROWS} linhas por grupo: KS sobre o sketch de quantis no lugar do AD)")
     print("-" * 70)
     
     results = {}
+    sketches = None
     
     for api in ['REST', 'GraphQL']:
         for metric in ['time_ms', 'size_bytes']:
-            data = df[df['api_type'] == api][metric]
-            
-            # Shapiro-Wilk (limitado a 5000 amostras)
-            sample = data.sample(min(5000, len(data)), random_state=42)
-            stat, p = stats.shapiro(sample)
+            group = group_view(df, api)
+            if len(group) > SKETCH_ROWS:
+                if sketches is None:
+                    sketches = sketches_from_dataframe(df)
+                sketch = rollup(sketches, metric)[(api,)]
+                data = group[metric].to_numpy()
+                verdict = normality_verdict(data, sketch)
+                fits = sketch_fit_report(sketch)
+                score = 'ks_statistic'
+            else:
+                data = group[metric].to_numpy(dtype=float)
+                verdict = normality_verdict(data)
+                fits = fit_report(data)
+                score = 'ad_statistic'
+            best = min(fits, key=lambda name: fits[name][score])
             
-            is_normal = "Sim" if p > 0.05 else "Não"
-            decision = "Não rejeitar H0" if p > 0.05 else "Rejeitar H0"
+            is_normal = "Sim" if verdict['normal'] else "Não"
+            decision = "Não rejeitar H0" if verdict['normal'] else "Rejeitar H0"
             
             results[f"{api}_{metric}"] = {
-                "statistic": stat,
-                "p_value": p,
-                "normal": is_normal
+                "statistic": verdict['w_median'],
+                "p_value": verdict['p_median'],
+                "normal": is_normal,
+                "ad_statistic": verdict['ad_statistic'],
+                "shapiro_reject_rate": verdict['reject_rate'],
+                "best_fit": best,
+                "fits": fits,
+                "verdict": verdict
             }
             
             metric_name = "Tempo" if metric == "time_ms" else "Tamanho"
-            print(f"{api:8} | {metric_name:8} | W = {stat:.4f} | p = {p:.6f} | Normal: {is_normal:3} | {decision}")
+            whole = (f"A² = {verdict['ad_statistic']:.2f}" if score == 'ad_statistic'
+                     else f"D (sketch) = {verdict['ks_statistic']:.4f}")
+            print(f"{api:8} | {metric_name:8} | {whole} | "
+                  f"W̃ = {verdict['w_median']:.4f} | p̃ = {verdict['p_median']:.6f} | "
+                  f"rejeições = {100 * verdict['reject_rate']:.0f}% | Normal: {is_normal:3} | {decision}")
+            print(f"{'':8} | {'':8} | melhor ajuste: {best} | " + " | ".join(
+                (f"{name}: A² = {fit['ad_statistic']:.1f}, " if 'ad_statistic' in fit else f"{name}: ")
+                + f"D = {fit['ks_statistic']:.4f}" for name, fit in fits.items()))
     
     print("-" * 70)
-    print("Interpretação: Se p < 0.05, os dados NÃO são normais.")
-    print("Recomendação: Usar testes não-paramétricos (Mann-Whitney U) se não normal.")
+    print("Interpretação: p̃ é a mediana dos p-valores do Shapiro-Wilk nas subamostras.")
+    print("Os testes de hipóteses usam o teste t se ambos os grupos forem normais,")
+    print("e Mann-Whitney U caso contrário.")
     
     return results
 
@@ -144,17 +261,32 @@ def normality_tests(df):
 # TESTES DE HIPÓTESES
 # ============================================
 
-def hypothesis_tests(df):
-    """Executa testes de hipóteses para RQ1 e RQ2"""
+def hypothesis_tests(df, normality=None):
+    """Executa testes de hipóteses para RQ1 e RQ2
+
+    `normality` (resultado de normality_tests) fornece os vereditos usados
+    na escolha do teste; sem ele, a normalidade é recalculada.
+    """
+    from dados import group_view
+    import numpy as np
+    from scipy import stats
+    from normalidade import choose_test
     print("\n" + "=" * 70)
     print("TESTES DE HIPÓTESES")
     print("=" * 70)
     
     # Separar dados
-    rest_time = df[df['api_type'] == 'REST']['time_ms']
-    graphql_time = df[df['api_type'] == 'GraphQL']['time_ms']
-    rest_size = df[df['api_type'] == 'REST']['size_bytes']
-    graphql_size = df[df['api_type'] == 'GraphQL']['size_bytes']
+    rest = group_view(df, 'REST')
+    graphql = group_view(df, 'GraphQL')
+    rest_time = rest['time_ms']
+    graphql_time = graphql['time_ms']
+    rest_size = rest['size_bytes']
+    graphql_size = graphql['size_bytes']
+    
+    def verdicts(metric):
+        if normality is None:
+            return None
+        return [normality[f"{api}_{metric}"]["verdict"] for api in ['REST', 'GraphQL']]
     
     results = {}
     
@@ -189,9 +321,15 @@ def hypothesis_tests(df):
     # Diferença percentual
     diff_pct = ((rest_time.mean() - graphql_time.mean()) / rest_time.mean()) * 100
     
+    # Teste escolhido pela normalidade dos dois grupos
+    test_used, _ = choose_test(rest_time.to_numpy(dtype=float), graphql_time.to_numpy(dtype=float),
+                               verdicts('time_ms'))
+    p_used = t_p if test_used == 't' else u_p
+    print(f"\nTeste usado na decisão: {'t' if test_used == 't' else 'Mann-Whitney U'} (p = {p_used:.6f})")
+    
     # Conclusão RQ1
     print(f"\n{'='*50}")
-    if t_p < 0.05:
+    if p_used < 0.05:
         if rest_time.mean() > graphql_time.mean():
             conclusion_rq1 = "GraphQL é significativamente MAIS RÁPIDO que REST"
         else:
@@ -216,6 +354,8 @@ def hypothesis_tests(df):
         'mean_rest': rest_time.mean(),
         'mean_graphql': graphql_time.mean(),
         'diff_percent': diff_pct,
+        'test_used': test_used,
+        'p_value': p_used,
         'conclusion': conclusion_rq1
     }
     
@@ -250,9 +390,15 @@ def hypothesis_tests(df):
     # Diferença percentual
     diff_pct2 = ((rest_size.mean() - graphql_size.mean()) / rest_size.mean()) * 100
     
+    # Teste escolhido pela normalidade dos dois grupos
+    test_used2, _ = choose_test(rest_size.to_numpy(dtype=float), graphql_size.to_numpy(dtype=float),
+                                verdicts('size_bytes'))
+    p_used2 = t_p2 if test_used2 == 't' else u_p2
+    print(f"\nTeste usado na decisão: {'t' if test_used2 == 't' else 'Mann-Whitney U'} (p = {p_used2:.6f})")
+    
     # Conclusão RQ2
     print(f"\n{'='*50}")
-    if t_p2 < 0.05:
+    if p_used2 < 0.05:
         if rest_size.mean() > graphql_size.mean():
             conclusion_rq2 = "GraphQL retorna respostas significativamente MENORES que REST"
         else:
@@ -277,6 +423,8 @@ def hypothesis_tests(df):
         'mean_rest': rest_size.mean(),
         'mean_graphql': graphql_size.mean(),
         'diff_percent': diff_pct2,
+        'test_used': test_used2,
+        'p_value': p_used2,
         'conclusion': conclusion_rq2
     }
     
@@ -288,14 +436,16 @@ def hypothesis_tests(df):
 
 def analysis_by_complexity(df):
     """Análise detalhada por nível de complexidade"""
+    from dados import group_view
+    from scipy import stats
     print("\n" + "=" * 70)
     print("ANÁLISE POR NÍVEL DE COMPLEXIDADE")
     print("=" * 70)
     
+    results = {}
     for complexity in ['simple', 'medium', 'complex']:
-        subset = df[df['complexity'] == complexity]
-        rest = subset[subset['api_type'] == 'REST']
-        graphql = subset[subset['api_type'] == 'GraphQL']
+        rest = group_view(df, 'REST', complexity)
+        graphql = group_view(df, 'GraphQL', complexity)
         
         print(f"\n{'-'*70}")
         print(f"COMPLEXIDADE: {complexity.upper()}")
@@ -320,9 +470,458 @@ def analysis_by_complexity(df):
         print(f"  REST:    {rest['size_bytes'].mean():>10.0f} bytes (±{rest['size_bytes'].std():.0f})")
         print(f"  GraphQL: {graphql['size_bytes'].mean():>10.0f} bytes (±{graphql['size_bytes'].std():.0f})")
         print(f"  Diferença: {diff_size:+.1f}% | p-value: {t_p2:.6f} {sig_size}")
+        
+        results[complexity] = {
+            'n_rest': len(rest),
+            'n_graphql': len(graphql),
+            'time_diff_percent': diff_time,
+            'time_t_p_value': t_p,
+            'time_u_p_value': stats.mannwhitneyu(rest['time_ms'], graphql['time_ms'])[1],
+            'size_diff_percent': diff_size,
+            'size_t_p_value': t_p2,
+            'size_u_p_value': stats.mannwhitneyu(rest['size_bytes'], graphql['size_bytes'])[1]
+        }
     
     print(f"\n{'-'*70}")
     print("Legenda: * p<0.05 | ** p<0.01 | *** p<0.001")
+    return results
+
+# ============================================
+# TEMPO NO SERVIDOR (CORREÇÃO DE RTT)
+# ============================================
+
+def rtt_corrected_analysis(df):
+    """Compara REST e GraphQL pelo tempo estimado no servidor (time_ms - RTT)"""
+    from scipy import stats
+    from dados import group_view
+    from rtt import BASELINE_FILE, MAX_PROBE_DISTANCE, estimate_server_time, load_baseline
+    
+    filepath = os.path.join(INPUT_DIR, BASELINE_FILE)
+    if not os.path.exists(filepath):
+        print(f"\nSondas de RTT não encontradas ({filepath}); correção de RTT ignorada.")
+        return None
+    
+    baseline = load_baseline(filepath)
+    if baseline.empty:
+        print("\nNenhuma sonda de RTT válida; correção de RTT ignorada.")
+        return None
+    df = estimate_server_time(df, baseline)
+    unmatched = int(df['server_ms'].isna().sum())
+    df = df[df['server_ms'].notna()]
+    if df.empty:
+        print(f"\nNenhuma sonda de RTT a até {MAX_PROBE_DISTANCE:.0f} s das medições; correção de RTT ignorada.")
+        return None
+    
+    print("\n" + "=" * 70)
+    print("TEMPO ESTIMADO NO SERVIDOR (time_ms - requisições × RTT)")
+    print("=" * 70)
+    print(f"Sondas de RTT: {len(baseline)} | RTT mediano: {baseline['rtt_ms'].median():.2f} ms")
+    if unmatched:
+        print(f"Medições sem sonda a até {MAX_PROBE_DISTANCE:.0f} s (ignoradas): {unmatched}")
+    print(f"{'Complexidade':<12} {'API':<8} {'Tempo μ':>9} {'RTT μ':>8} {'Req.':>5} {'Servidor μ':>11}")
+    print("-" * 70)
+    
+    results = {}
+    for complexity in ['simple', 'medium', 'complex']:
+        groups = {api: group_view(df, api, complexity) for api in ['REST', 'GraphQL']}
+        for api, subset in groups.items():
+            print(f"{complexity:<12} {api:<8} {subset['time_ms'].mean():>9.2f} {subset['rtt_ms'].mean():>8.2f} "
+                  f"{int(subset['round_trips'].iloc[0]) if len(subset) else 0:>5} {subset['server_ms'].mean():>11.2f}")
+        rest, graphql = groups['REST']['server_ms'], groups['GraphQL']['server_ms']
+        if len(rest) and len(graphql):
+            u_stat, u_p = stats.mannwhitneyu(rest, graphql, alternative='two-sided')
+            diff = ((rest.mean() - graphql.mean()) / rest.mean()) * 100 if rest.mean() else float('nan')
+            results[complexity] = {'u_statistic': u_stat, 'u_p_value': u_p, 'diff_percent': diff}
+            print(f"{'':<12} Diferença no servidor: {diff:+.1f}% | Mann-Whitney p = {u_p:.6f}")
+    
+    return results
+
+def mixed_model_analysis(df):
+    """Efeito da API ajustado por complexidade e repositório (modelo misto em misto.py)"""
+    import numpy as np
+    from misto import CONFIDENCE, api_effects, fit_mixed_model, predict_new_repository
+    
+    if df['repository'].nunique() < 2:
+        print("\nMenos de 2 repositórios; modelo misto ignorado.")
+        return None
+    
+    fit = fit_mixed_model(df)
+    
+    print("\n" + "=" * 70)
+    print("MODELO MISTO: log(time_ms) ~ complexidade * API + (1 | repositório)")
+    print("=" * 70)
+    print(f"Observações: {fit['n']} | Repositórios: {len(fit['random_effects'])} | "
+          f"Iterações EM: {fit['iterations']}{'' if fit['converged'] else ' (sem convergência)'}")
+    print(f"Desvio-padrão entre repositórios (τ): {np.sqrt(fit['tau2']):.4f} | "
+          f"residual (σ): {np.sqrt(fit['sigma2']):.4f} | "
+          f"ICC: {fit['tau2'] / (fit['tau2'] + fit['sigma2']):.3f}")
+    
+    effects = api_effects(fit)
+    print(f"\nRazão de latência GraphQL / REST ajustada (IC {int(CONFIDENCE * 100)}%):")
+    for complexity, row in effects.iterrows():
+        print(f"  {complexity:<10} {row['ratio']:.3f} [{row['ci_low']:.3f}, {row['ci_high']:.3f}] "
+              f"p = {row['p_value']:.2e}")
+    
+    predictions = predict_new_repository(fit)
+    print("\nLatência prevista para um repositório novo (mediana [intervalo de previsão]):")
+    for (complexity, api), row in predictions.iterrows():
+        print(f"  {complexity:<10} {api:<8} {row['median_ms']:>9.1f} ms "
+              f"[{row['pi_low_ms']:.1f}, {row['pi_high_ms']:.1f}]")
+    
+    effects_sorted = fit['random_effects'].sort_values()
+    print(f"\nRepositório mais rápido: {effects_sorted.index[0]} ({np.exp(effects_sorted.iloc[0]):.2f}x) | "
+          f"mais lento: {effects_sorted.index[-1]} ({np.exp(effects_sorted.iloc[-1]):.2f}x)")
+    return {'fit': fit, 'effects': effects, 'predictions': predictions}
+
+def bayesian_analysis(df):
+    """Razões de latência REST / GraphQL pela posteriori log-normal (bayesiano.py)
+    
+    O ajuste usa os dados recebidos (já limpos) e fica em memória:
+    posteriors.json, com o histórico de lotes do warm start, é mantido
+    apenas por bayesiano.py.
+    """
+    from bayesiano import latency_ratios, print_ratios, sufficient_stats
+    
+    print("\n" + "=" * 70)
+    print("ANÁLISE BAYESIANA (modelo log-normal conjugado)")
+    print("=" * 70)
+    
+    stats = sufficient_stats(df)
+    by_complexity = latency_ratios(stats, ['complexity'])
+    print_ratios(by_complexity, "Razão de latência média REST / GraphQL por complexidade")
+    
+    by_repository = latency_ratios(stats, ['complexity', 'repository'])
+    if len(by_repository):
+        decided = (by_repository['ci_low'] > 1) | (by_repository['ci_high'] < 1)
+        print(f"\nPor repositório: {decided.sum()} de {len(by_repository)} células com IC sem o 1 "
+              f"(razão entre {by_repository['ratio_mean'].min():.3f} e {by_repository['ratio_mean'].max():.3f})")
+    
+    return {'complexity': by_complexity, 'repository': by_repository}
+
+def protocol_analysis(df):
+    """Diferença REST vs GraphQL em cada protocolo (HTTP/1.1 e HTTP/2)"""
+    from scipy import stats
+    
+    if 'protocol' not in df.columns or df['protocol'].nunique() < 2:
+        return None
+    
+    print("\n" + "=" * 70)
+    print("TEMPO DE RESPOSTA POR PROTOCOLO")
+    print("=" * 70)
+    print(f"{'Protocolo':<10} {'Complexidade':<12} {'REST μ':>9} {'GraphQL μ':>10} {'Diferença':>10} {'p (M-W)':>10}")
+    print("-" * 70)
+    
+    results = {}
+    grouped = df.groupby(['protocol', 'complexity', 'api_type'], observed=True)['time_ms']
+    for (protocol, complexity), _ in df.groupby(['protocol', 'complexity'], observed=True):
+        try:
+            rest = grouped.get_group((protocol, complexity, 'REST'))
+            graphql = grouped.get_group((protocol, complexity, 'GraphQL'))
+        except KeyError:
+            continue
+        _, u_p = stats.mannwhitneyu(rest, graphql, alternative='two-sided')
+        diff = ((rest.mean() - graphql.mean()) / rest.mean()) * 100
+        results[(protocol, complexity)] = {'rest_mean': rest.mean(), 'graphql_mean': graphql.mean(),
+                                           'diff_percent': diff, 'u_p_value': u_p}
+        print(f"{protocol:<10} {complexity:<12} {rest.mean():>9.2f} {graphql.mean():>10.2f} "
+              f"{diff:>+9.1f}% {u_p:>10.6f}")
+    
+    return results
+
+def nesting_analysis(df):
+    """Latência, tamanho e requisições por profundidade de aninhamento e ponto de cruzamento"""
+    if 'depth' not in df.columns:
+        return None
+    
+    nested = df[df['depth'].notna()]
+    summary = nested.groupby(['depth', 'api_type'], observed=True).agg(
+        time_ms=('time_ms', 'mean'), size_bytes=('size_bytes', 'mean'),
+        requests=('requests', 'mean'), n=('time_ms', 'size')).unstack('api_type')
+    
+    print("\n" + "=" * 70)
+    print("CONSULTAS ANINHADAS: ESCALA POR PROFUNDIDADE")
+    print("=" * 70)
+    print(f"{'Prof.':>5} {'REST μ':>9} {'GraphQL μ':>10} {'Dif.':>8} {'Req. REST':>10} "
+          f"{'Bytes REST':>11} {'Bytes GQL':>10}")
+    print("-" * 70)
+    
+    results = {}
+    crossover = None
+    for depth in summary.index:
+        rest_time, graphql_time = summary.loc[depth, ('time_ms', 'REST')], summary.loc[depth, ('time_ms', 'GraphQL')]
+        diff = ((rest_time - graphql_time) / rest_time) * 100
+        results[int(depth)] = {'rest_mean': rest_time, 'graphql_mean': graphql_time, 'diff_percent': diff,
+                               'rest_requests': summary.loc[depth, ('requests', 'REST')]}
+        if crossover is None and graphql_time < rest_time:
+            crossover = int(depth)
+        print(f"{int(depth):>5} {rest_time:>9.2f} {graphql_time:>10.2f} {diff:>+7.1f}% "
+              f"{summary.loc[depth, ('requests', 'REST')]:>10.1f} "
+              f"{summary.loc[depth, ('size_bytes', 'REST')]:>11.0f} "
+              f"{summary.loc[depth, ('size_bytes', 'GraphQL')]:>10.0f}")
+    
+    if crossover is None:
+        print("\nGraphQL não superou REST em nenhuma profundidade avaliada.")
+    else:
+        print(f"\nPonto de cruzamento: GraphQL passa a ser mais rápido na profundidade {crossover}.")
+    return results
+
+def volume_analysis(df):
+    """Elasticidade do tamanho e da latência em relação aos eixos de volume (servidor local)
+    
+    Sem páginas pelos eixos (axis_pages), as listas da resposta têm tamanho
+    fixo: os eixos de lista ficam fora do modelo do tamanho.
+    """
+    import numpy as np
+    from volume import LIST_AXES, VOLUME_AXES
+    
+    axes = [axis for axis in VOLUME_AXES if axis in df.columns and df[axis].nunique() > 1]
+    if not axes:
+        return None
+    axis_pages = 'axis_pages' in df.columns and bool(df['axis_pages'].all())
+    size_axes = axes if axis_pages else [axis for axis in axes if axis not in LIST_AXES]
+    
+    print("\n" + "=" * 70)
+    print("VOLUME DE DADOS: ELASTICIDADES (log y = a + Σ b·log eixo)")
+    print("=" * 70)
+    print("b = variação % da métrica para cada 1% a mais no eixo")
+    if size_axes != axes:
+        print("Páginas das listas fixas (axis_pages falso): eixos de lista fora do modelo do tamanho")
+    
+    results = {}
+    for metric, title, model_axes in [('size_bytes', 'TAMANHO DA RESPOSTA', size_axes),
+                                      ('time_ms', 'TEMPO DE RESPOSTA', axes)]:
+        if not model_axes:
+            continue
+        print(f"\n{title}")
+        print(f"{'Complexidade':<12} {'API':<8} " + " ".join(f"{axis:>12}" for axis in model_axes) + f" {'R²':>6}")
+        print("-" * 70)
+        for (complexity, api_type), group in df.groupby(['complexity', 'api_type'], observed=True):
+            X = np.column_stack([np.ones(len(group))] + [np.log(group[axis].to_numpy(dtype=float)) for axis in model_axes])
+            y = np.log(group[metric].to_numpy(dtype=float).clip(min=1e-6))
+            coef = np.linalg.lstsq(X, y, rcond=None)[0]
+            residual = y - X @ coef
+            r2 = 1 - (residual @ residual) / max(((y - y.mean()) ** 2).sum(), 1e-12)
+            results[(metric, complexity, api_type)] = {**dict(zip(model_axes, coef[1:])), 'r2': r2}
+            print(f"{complexity:<12} {api_type:<8} " + " ".join(f"{b:>+12.3f}" for b in coef[1:]) + f" {r2:>6.3f}")
+    return results
+
+def conditional_analysis(df):
+    """REST com requisições condicionais (ETag) vs GraphQL: taxa de 304, latência e bytes"""
+    from scipy import stats
+    from dados import group_view
+    from rtt import ROUND_TRIPS
+    
+    if 'not_modified' not in df.columns:
+        return None
+    
+    print("\n" + "=" * 70)
+    print("REQUISIÇÕES CONDICIONAIS (ETag / If-None-Match)")
+    print("=" * 70)
+    print(f"{'Complexidade':<12} {'Taxa 304':>9} {'REST 304 μ':>11} {'REST 200 μ':>11} "
+          f"{'Bytes μ':>9} {'Economia μ':>11}")
+    print("-" * 70)
+    
+    results = {}
+    for complexity in ['simple', 'medium', 'complex']:
+        rest = group_view(df, 'REST', complexity)
+        graphql = group_view(df, 'GraphQL', complexity)
+        if not len(rest):
+            continue
+        # Taxa por sub-requisição; "revalidada" = todas as sub-requisições com 304
+        rate = rest['not_modified'].sum() / (len(rest) * ROUND_TRIPS[('REST', complexity)])
+        revalidated = rest['not_modified'] == ROUND_TRIPS[('REST', complexity)]
+        print(f"{complexity:<12} {100 * rate:>8.1f}% {rest.loc[revalidated, 'time_ms'].mean():>11.2f} "
+              f"{rest.loc[~revalidated, 'time_ms'].mean():>11.2f} {rest['size_bytes'].mean():>9.0f} "
+              f"{rest['bytes_saved'].mean():>11.0f}")
+        results[complexity] = {'not_modified_rate': rate,
+                               'rest_bytes_saved_mean': rest['bytes_saved'].mean()}
+        if len(graphql):
+            _, u_p = stats.mannwhitneyu(rest['time_ms'], graphql['time_ms'], alternative='two-sided')
+            diff = ((rest['time_ms'].mean() - graphql['time_ms'].mean()) / rest['time_ms'].mean()) * 100
+            results[complexity].update({'diff_percent': diff, 'u_p_value': u_p})
+            print(f"{'':<12} REST (com cache) vs GraphQL: tempo {diff:+.1f}% | "
+                  f"bytes {rest['size_bytes'].mean():.0f} vs {graphql['size_bytes'].mean():.0f} | "
+                  f"p = {u_p:.6f}")
+    
+    return results
+
+def client_cost_analysis(df):
+    """Custo total no cliente: tempo de resposta + desserialização (parse_ms)"""
+    from dados import group_view
+    
+    if 'parse_ms' not in df.columns or df['parse_ms'].isna().all():
+        print("\nColuna parse_ms ausente; custo de desserialização ignorado.")
+        return None
+    
+    parsers = ", ".join(sorted(df['json_parser'].dropna().unique())) if 'json_parser' in df.columns else "?"
+    print("\n" + "=" * 70)
+    print(f"CUSTO NO CLIENTE (time_ms + parse_ms) | parser: {parsers}")
+    print("=" * 70)
+    print(f"{'Complexidade':<12} {'API':<8} {'Tempo μ':>9} {'Parse μ':>9} {'Parse p95':>10} "
+          f"{'Total μ':>9} {'% parse':>8}")
+    print("-" * 70)
+    
+    results = {}
+    for complexity in ['simple', 'medium', 'complex']:
+        totals = {}
+        for api in ['REST', 'GraphQL']:
+            subset = group_view(df, api, complexity)
+            subset = subset[subset['parse_ms'].notna()]  # Corpos que não eram JSON
+            if not len(subset):
+                continue
+            parse = subset['parse_ms']
+            total = subset['time_ms'] + parse
+            totals[api] = total.mean()
+            print(f"{complexity:<12} {api:<8} {subset['time_ms'].mean():>9.2f} {parse.mean():>9.3f} "
+                  f"{parse.quantile(0.95):>10.3f} {total.mean():>9.2f} "
+                  f"{100 * parse.mean() / total.mean():>7.2f}%")
+        if len(totals) == 2:
+            diff = (totals['REST'] - totals['GraphQL']) / totals['REST'] * 100
+            results[complexity] = {'rest_total_ms': totals['REST'],
+                                   'graphql_total_ms': totals['GraphQL'], 'diff_percent': diff}
+            print(f"{'':<12} Diferença no custo total: {diff:+.1f}%")
+    
+    return results
+
+def error_analysis(df):
+    """Taxa de erros, novas tentativas e o peso das tentativas na cauda da latência
+    
+    Deve receber os dados brutos: a limpeza remove as falhas (status) e a
+    cauda (outliers), justamente o que interessa aqui. As latências são das
+    medições sem erro, com e sem novas tentativas.
+    """
+    if 'attempts' not in df.columns:
+        return None
+    
+    error = df['error_class'].astype(object).fillna('').astype(str)
+    frame = df.assign(
+        # Erros GraphQL chegam com status 200: contam pela classe do erro
+        failed=(df['status'] == 0) | (df['status'] >= 400) | (error != ''),
+        error=error,
+        # Mais tentativas que sub-requisições = houve pelo menos uma nova tentativa
+        retried=df['attempts'] > df['statuses'].astype(object).fillna('').astype(str).str.count(';') + 1
+    )
+    
+    print("\n" + "=" * 90)
+    print("ERROS E NOVAS TENTATIVAS (dados brutos, antes da limpeza)")
+    print("=" * 90)
+    print(f"{'Complexidade':<12} {'API':<8} {'N':>6} {'Erros':>7} {'Retry':>7} {'Tent. μ':>8} | "
+          f"{'p95':>8} {'p95 s/r':>8} {'p99':>8} {'p99 s/r':>8} {'Infl.':>7}")
+    print("-" * 90)
+    
+    results = {}
+    for (complexity, api), group in frame.groupby(['complexity', 'api_type'], observed=True):
+        ok = group.loc[~group['failed'], 'time_ms']
+        clean = group.loc[~group['failed'] & ~group['retried'], 'time_ms']
+        p95, p99 = ok.quantile([0.95, 0.99]) if len(ok) else (float('nan'),) * 2
+        p95_clean, p99_clean = clean.quantile([0.95, 0.99]) if len(clean) else (float('nan'),) * 2
+        inflation = (p99 / p99_clean - 1) * 100
+        results[f"{complexity}/{api}"] = {
+            'n': len(group),
+            'error_rate': group['failed'].mean(),
+            'retry_rate': group['retried'].mean(),
+            'mean_attempts': group['attempts'].mean(),
+            'errors': group.loc[group['failed'], 'error'].value_counts().to_dict(),
+            'p95': p95, 'p95_no_retry': p95_clean,
+            'p99': p99, 'p99_no_retry': p99_clean,
+            'p99_inflation_percent': inflation
+        }
+        print(f"{complexity:<12} {api:<8} {len(group):>6} {group['failed'].mean():>7.2%} "
+              f"{group['retried'].mean():>7.2%} {group['attempts'].mean():>8.2f} | "
+              f"{p95:>8.1f} {p95_clean:>8.1f} {p99:>8.1f} {p99_clean:>8.1f} {inflation:>+6.1f}%")
+    
+    failures = frame.loc[frame['failed']]
+    if len(failures):
+        print("\nErros por classe:")
+        for (api, error), n in failures.groupby(['api_type', 'error'], observed=True).size().items():
+            print(f"  {api:<8} {error or '?':<14} {n:>6}")
+    print("\ns/r = sem novas tentativas; Infl. = aumento do p99 causado pelas tentativas")
+    return results
+
+def calibration_analysis(df):
+    """Calibração do relógio e peso do piso do harness em time_ms (time_net_ms)"""
+    from calibracao import CALIBRATION_FILE, load_calibration, print_calibration
+    
+    calibration = load_calibration(os.path.join(INPUT_DIR, CALIBRATION_FILE))
+    if calibration is None:
+        return None
+    runs = set(df['run_id'].astype(str)) if 'run_id' in df.columns else set()
+    if calibration.get('run_id') not in runs:
+        print(f"\nCalibração de outra execução ou avulsa (run_id {calibration.get('run_id') or '?'}); ignorada.")
+        return None
+    
+    print("\n" + "=" * 70)
+    print("CALIBRAÇÃO DO RELÓGIO E DO HARNESS")
+    print("=" * 70)
+    print_calibration(calibration)
+    if 'time_net_ms' not in df.columns:
+        return {'calibration': calibration}
+    
+    negative = int((df['time_net_ms'] < 0).sum())
+    if negative:
+        print(f"\nAVISO: {negative} medições com time_net_ms < 0 (custo calibrado acima do tempo medido)")
+    print(f"\n{'Complexidade':<12} {'API':<8} {'Tempo μ':>9} {'Piso μ':>8} {'Líquido μ':>10} "
+          f"{'% piso':>7} {'Piso>50%':>9}")
+    print("-" * 70)
+    results = {'calibration': calibration}
+    for complexity in df['complexity'].unique():
+        means = {}
+        for api in ['REST', 'GraphQL']:
+            subset = df[(df['complexity'] == complexity) & (df['api_type'] == api)]
+            if not len(subset):
+                continue
+            means[api] = (subset['time_ms'].mean(), subset['time_net_ms'].mean())
+            dominated = (subset['overhead_ms'] > 0.5 * subset['time_ms']).mean()
+            print(f"{complexity:<12} {api:<8} {means[api][0]:>9.3f} {subset['overhead_ms'].mean():>8.3f} "
+                  f"{means[api][1]:>10.3f} {100 * subset['overhead_ms'].mean() / means[api][0]:>6.1f}% "
+                  f"{dominated:>9.1%}")
+        if len(means) == 2:
+            raw_diff = (means['REST'][0] - means['GraphQL'][0]) / means['REST'][0] * 100
+            net_diff = (means['REST'][1] - means['GraphQL'][1]) / means['REST'][1] * 100
+            results[complexity] = {'diff_percent': raw_diff, 'net_diff_percent': net_diff}
+            print(f"{'':<12} Diferença REST x GraphQL: {raw_diff:+.1f}% bruta, {net_diff:+.1f}% líquida")
+    return results
+
+def resource_correlation(df):
+    """Correlação (Spearman) entre a latência e o uso de recursos do cliente"""
+    from scipy import stats
+    from recursos import RESOURCES_FILE, join_samples, load_samples
+    
+    filepath = os.path.join(INPUT_DIR, RESOURCES_FILE)
+    if not os.path.exists(filepath):
+        print(f"\nAmostras de recursos não encontradas ({filepath}); correlação ignorada.")
+        return None
+    
+    joined = join_samples(df, load_samples(filepath))
+    metrics = [m for m in ['process_cpu_percent', 'system_cpu_percent', 'rss_mb', 'open_sockets',
+                           'net_recv_rate', 'client_overhead_ms'] if m in joined.columns]
+    
+    print("\n" + "=" * 70)
+    print("LATÊNCIA x USO DE RECURSOS DO CLIENTE (Spearman)")
+    print("=" * 70)
+    print(f"Medições associadas a uma amostra: {joined['process_cpu_percent'].notna().sum()} de {len(joined)}")
+    print(f"{'Métrica':<22} {'API':<8} {'ρ':>7} {'p-valor':>10}")
+    print("-" * 70)
+    
+    results = {}
+    for metric in metrics:
+        for api in ['REST', 'GraphQL']:
+            subset = joined.loc[joined['api_type'] == api, ['time_ms', metric]].dropna()
+            if len(subset) < 3 or subset[metric].nunique() < 2:
+                continue
+            rho, p = stats.spearmanr(subset['time_ms'], subset[metric])
+            results[(metric, api)] = {'rho': rho, 'p_value': p}
+            print(f"{metric:<22} {api:<8} {rho:>+7.3f} {p:>10.6f}")
+    
+    # Latência com o cliente saturado (CPU do sistema acima do p90) vs demais
+    cpu = joined['system_cpu_percent'].dropna() if 'system_cpu_percent' in joined.columns else None
+    if cpu is not None and cpu.nunique() > 1:
+        busy = joined['system_cpu_percent'] > cpu.quantile(0.9)
+        print(f"\nTempo médio com CPU > p90 ({cpu.quantile(0.9):.1f}%): "
+              f"{joined.loc[busy, 'time_ms'].mean():.2f} ms | "
+              f"demais: {joined.loc[~busy, 'time_ms'].mean():.2f} ms")
+    
+    return results
 
 # ============================================
 # SUMÁRIO FINAL
@@ -339,7 +938,7 @@ def print_summary(results):
 │ RQ1: Respostas GraphQL são mais rápidas que REST?                   │
 ├─────────────────────────────────────────────────────────────────────┤
 │ Resultado: {results['RQ1']['conclusion']:<55} │
-│ p-value: {results['RQ1']['t_p_value']:<59.6f} │
+│ p-value ({results['RQ1']['test_used']:<12}): {results['RQ1']['p_value']:<44.6f} │
 │ Cohen's d: {results['RQ1']['cohens_d']:<57.4f} │
 │ Média REST: {results['RQ1']['mean_rest']:<51.2f} ms │
 │ Média GraphQL: {results['RQ1']['mean_graphql']:<48.2f} ms │
@@ -350,7 +949,7 @@ def print_summary(results):
 │ RQ2: Respostas GraphQL têm tamanho menor que REST?                  │
 ├─────────────────────────────────────────────────────────────────────┤
 │ Resultado: {results['RQ2']['conclusion']:<55} │
-│ p-value: {results['RQ2']['t_p_value']:<59.6f} │
+│ p-value ({results['RQ2']['test_used']:<12}): {results['RQ2']['p_value']:<44.6f} │
 │ Cohen's d: {results['RQ2']['cohens_d']:<57.4f} │
 │ Média REST: {results['RQ2']['mean_rest']:<48.0f} bytes │
 │ Média GraphQL: {results['RQ2']['mean_graphql']:<45.0f} bytes │
@@ -368,8 +967,9 @@ Interpretação do Cohen's d:
 # EXPORTAR RESULTADOS
 # ============================================
 
-def export_analysis_results(results, df):
-    """Exporta resultados da análise para CSV"""
+def export_analysis_results(results, df, cleaning=None):
+    """Exporta resultados da análise para CSV (com os parâmetros da limpeza)"""
+    import pandas as pd
     # Criar DataFrame com resultados dos testes
     analysis_data = []
     
@@ -385,8 +985,11 @@ def export_analysis_results(results, df):
             'mean_rest': data['mean_rest'],
             'mean_graphql': data['mean_graphql'],
             'diff_percent': data['diff_percent'],
+            'test_used': data['test_used'],
+            'p_value': data['p_value'],
             'conclusion': data['conclusion'],
-            'significant': data['t_p_value'] < 0.05
+            'significant': data['p_value'] < 0.05,
+            **{f'cleaning_{key}': value for key, value in (cleaning or {}).items()}
         })
     
     analysis_df = pd.DataFrame(analysis_data)
@@ -394,6 +997,19 @@ def export_analysis_results(results, df):
     analysis_df.to_csv(filepath, index=False)
     print(f"\nResultados da análise exportados para: {filepath}")
 
+def export_report(df, results, cleaning=None, complexity=None, normality=None, mixed=None, bayesian=None):
+    """Relatório em JSON e HTML autocontido (relatorio.py), apenas com agregados
+    
+    `normality`, `mixed` e `bayesian` são os retornos de normality_tests,
+    mixed_model_analysis e bayesian_analysis.
+    """
+    from relatorio import REPORT_HTML, REPORT_JSON, build_report, save_html, save_json
+    report = build_report(df, results, cleaning, complexity, source=os.path.join(INPUT_DIR, INPUT_FILE),
+                          normality=normality, mixed=mixed, bayesian=bayesian)
+    save_json(report, os.path.join(INPUT_DIR, REPORT_JSON))
+    save_html(report, os.path.join(INPUT_DIR, REPORT_HTML))
+    return report
+
 # ============================================
 # MAIN
 # ============================================
@@ -404,26 +1020,71 @@ if __name__ == "__main__":
     print("Laboratório de Experimentação de Software")
     print("=" * 70 + "\n")
     
+    from limpeza import AUDIT_FILE, clean_data
+    
     # Carregar dados
     df = load_data()
+    raw = df
+    
+    # Limpeza (status, janelas de exclusão e outliers)
+    df, cleaning = clean_data(df, audit_path=os.path.join(INPUT_DIR, AUDIT_FILE))
     
     # Estatísticas descritivas
     descriptive_stats(df)
     
+    # Percentis
+    percentile_summary(df)
+    
     # Testes de normalidade
-    normality_tests(df)
+    normality = normality_tests(df)
     
     # Testes de hipóteses
-    results = hypothesis_tests(df)
+    results = hypothesis_tests(df, normality)
     
     # Análise por complexidade
-    analysis_by_complexity(df)
+    complexity_results = analysis_by_complexity(df)
+    
+    # Modelo misto (efeito da API ajustado por repositório)
+    mixed = mixed_model_analysis(df)
+    
+    # Comparação Bayesiana (razões de latência)
+    bayesian = bayesian_analysis(df)
+    
+    # Tempo no servidor (correção de RTT)
+    rtt_corrected_analysis(df)
+    
+    # Diferença por protocolo (HTTP/1.1 x HTTP/2)
+    protocol_analysis(df)
+    
+    # Consultas aninhadas (profundidade x latência)
+    nesting_analysis(df)
+    
+    # Volume de dados (servidor local)
+    volume_analysis(df)
+    
+    # REST com cache HTTP (ETag) vs GraphQL
+    conditional_analysis(df)
+    
+    # Custo de desserialização no cliente
+    client_cost_analysis(df)
+    
+    # Erros e novas tentativas (dados brutos)
+    error_analysis(raw)
+    
+    # Calibração do relógio (piso do harness)
+    calibration_analysis(df)
+    
+    # Latência x recursos do cliente
+    resource_correlation(df)
     
     # Sumário final
     print_summary(results)
     
     # Exportar resultados
-    export_analysis_results(results, df)
+    export_analysis_results(results, df, cleaning)
+    
+    # Relatório (JSON + HTML)
+    export_report(df, results, cleaning, complexity_results, normality, mixed, bayesian)
     
     print("\n" + "=" * 70)
     print("ANÁLISE CONCLUÍDA!")
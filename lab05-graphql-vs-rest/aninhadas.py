@@ -0,0 +1,104 @@
+"""
+Consultas Aninhadas: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Gera consultas GraphQL progressivamente mais profundas e largas
+(repositório -> issues -> comentários -> autor -> repositórios do autor)
+e o equivalente REST, montado por expansão N+1: cada nível faz uma chamada
+de acompanhamento para cada item do nível anterior. Com a profundidade e a
+largura variando, o número de requisições REST cresce enquanto o GraphQL
+continua com uma só, o que permite localizar o ponto de cruzamento.
+"""
+
+# Configuração
+NESTED_DEPTHS = [1, 2, 3, 4]  # Profundidades avaliadas (até len(NESTING_LEVELS))
+NESTED_WIDTH = 3              # Itens por lista em cada nível (first / per_page)
+
+# Consulta GraphQL aninhada ({inner} recebe os níveis); backends podem trocar
+# este template e os níveis (chaves "nested_query" e "nesting_levels")
+NESTED_QUERY = ("query($owner: String!, $repo: String!) {{ "
+                "repository(owner: $owner, name: $repo) {{ name {inner} }} }}")
+
+# Níveis de aninhamento, do mais externo ao mais interno.
+# graphql: trecho da consulta ({inner} recebe o nível seguinte)
+# rest: URL de acompanhamento de cada item do nível anterior
+# parent_key: caminho, no item do nível anterior, do valor usado na URL
+NESTING_LEVELS = [
+    {
+        "name": "issues",
+        "graphql": "issues(first: {width}, orderBy: {{field: CREATED_AT, direction: DESC}}) "
+                   "{{ nodes {{ number title {inner} }} }}",
+        "rest": "{base}/repos/{owner}/{repo}/issues?per_page={width}&state=all",
+        "parent_key": None
+    },
+    {
+        "name": "comments",
+        "graphql": "comments(first: {width}) {{ nodes {{ body {inner} }} }}",
+        "rest": "{base}/repos/{owner}/{repo}/issues/{key}/comments?per_page={width}",
+        "parent_key": ("number",)
+    },
+    {
+        "name": "author",
+        "graphql": "author {{ login ... on User {{ name {inner} }} }}",
+        "rest": "{base}/users/{key}",
+        "parent_key": ("user", "login")
+    },
+    {
+        "name": "repositories",
+        "graphql": "repositories(first: {width}) {{ nodes {{ name {inner} }} }}",
+        "rest": "{base}/users/{key}/repos?per_page={width}",
+        "parent_key": ("login",)
+    },
+]
+
+# ============================================
+# GERAÇÃO DAS CONSULTAS
+# ============================================
+
+def graphql_nested_query(depth, width=NESTED_WIDTH, levels=NESTING_LEVELS, template=NESTED_QUERY):
+    """Consulta GraphQL com `depth` níveis de aninhamento e `width` itens por lista"""
+    inner = ""
+    for level in reversed(levels[:depth]):
+        inner = level["graphql"].format(width=width, inner=inner)
+    return template.format(inner=inner)
+
+def item_key(item, path):
+    """Valor do item no caminho `path` (None se ausente)"""
+    for key in path:
+        if not isinstance(item, dict):
+            return None
+        item = item.get(key)
+    return item
+
+def rest_level_urls(level, parents, owner, repo, base, width=NESTED_WIDTH, levels=NESTING_LEVELS):
+    """URLs de acompanhamento de um nível (sem repetição) para os itens do nível anterior"""
+    spec = levels[level]
+    if spec["parent_key"] is None:
+        return [spec["rest"].format(base=base, owner=owner, repo=repo, width=width)]
+    urls = []
+    for parent in parents:
+        key = item_key(parent, spec["parent_key"])
+        if key is None:
+            continue
+        url = spec["rest"].format(base=base, owner=owner, repo=repo, key=key, width=width)
+        if url not in urls:
+            urls.append(url)
+    return urls
+
+def rest_children(payload, width=NESTED_WIDTH):
+    """Itens de uma resposta REST que alimentam o nível seguinte"""
+    if isinstance(payload, list):
+        return payload[:width]
+    if isinstance(payload, dict) and "message" not in payload:
+        return [payload]
+    return []
+
+def rest_request_count(depth, width=NESTED_WIDTH, levels=NESTING_LEVELS):
+    """Máximo de requisições REST (repositório + expansão N+1) para depth e width"""
+    total, items = 1, 1
+    for level in levels[:depth]:
+        calls = 1 if level["parent_key"] is None else items
+        total += calls
+        items = calls * (1 if level["name"] == "author" else width)
+    return total
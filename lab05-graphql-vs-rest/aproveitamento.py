@@ -0,0 +1,278 @@
+"""
+Aproveitamento dos Campos (Over-fetching): GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Percorre em fluxo os corpos JSON capturados pelo experimento
+(CAPTURE_BODIES em experimento.py) e separa, em cada resposta, os bytes
+dos campos efetivamente consumidos (os mesmos selecionados pelas consultas
+GraphQL) dos bytes transferidos. O resultado é uma métrica de bytes por
+campo útil por nível de complexidade.
+
+Uso:
+    python aproveitamento.py
+"""
+
+import csv
+import os
+import re
+from collections import defaultdict
+
+# Configuração
+INPUT_DIR = "results"
+INPUT_FILE = "experiment_results.csv"
+BODIES_DIR = "results/bodies"
+BODY_FILE_PATTERN = re.compile(r"\d+_\d+_.+\.json")  # {request_id}_{índice}_{rótulo}.json
+OUTPUT_FILE = "field_utilization.csv"
+CHUNK_SIZE = 64 * 1024  # Bytes lidos por vez de cada corpo
+
+# Campos consumidos por (api_type, complexity, rótulo do corpo).
+# "*" representa qualquer elemento de uma lista.
+REPO_FIELDS_REST = [("name",), ("description",), ("stargazers_count",), ("forks_count",)]
+REPO_FIELDS_GRAPHQL = [("data", "repository", f) for f in
+                       ["name", "description", "stargazerCount", "forkCount"]]
+
+CONSUMED_FIELDS = {
+    ("REST", "simple", "repo"): REPO_FIELDS_REST + [("created_at",), ("updated_at",), ("language",)],
+    ("REST", "medium", "repo"): REPO_FIELDS_REST,
+    ("REST", "medium", "issues"): [("*", "title"), ("*", "state"), ("*", "created_at"),
+                                   ("*", "user", "login")],
+    ("REST", "complex", "repo"): REPO_FIELDS_REST,
+    ("REST", "complex", "issues"): [("*", "title"), ("*", "state"), ("*", "created_at")],
+    # A lista de contribuidores REST não traz o nome; só o login é aproveitado
+    ("REST", "complex", "contributors"): [("*", "login")],
+    ("REST", "complex", "branches"): [("*", "name")],
+    ("GraphQL", "simple", "graphql"): REPO_FIELDS_GRAPHQL + [
+        ("data", "repository", "createdAt"), ("data", "repository", "updatedAt"),
+        ("data", "repository", "primaryLanguage", "name")],
+    ("GraphQL", "medium", "graphql"): REPO_FIELDS_GRAPHQL + [
+        ("data", "repository", "issues", "nodes", "*", f) for f in ["title", "state", "createdAt"]] + [
+        ("data", "repository", "issues", "nodes", "*", "author", "login")],
+    ("GraphQL", "complex", "graphql"): REPO_FIELDS_GRAPHQL + [
+        ("data", "repository", "issues", "nodes", "*", f) for f in ["title", "state", "createdAt"]] + [
+        ("data", "repository", "mentionableUsers", "nodes", "*", "login"),
+        ("data", "repository", "mentionableUsers", "nodes", "*", "name"),
+        ("data", "repository", "refs", "nodes", "*", "name")],
+}
+
+WHITESPACE = b" \t\r\n"
+DELIMITERS = b",]}" + WHITESPACE
+
+# ============================================
+# LEITURA EM FLUXO
+# ============================================
+
+def scan_leaves(f, chunk_size=CHUNK_SIZE):
+    """Percorre um JSON em blocos e produz (caminho, início, fim) de cada valor folha
+
+    Para valores dentro de objetos o intervalo cobre o membro inteiro
+    ("chave": valor); dentro de listas, apenas o valor. Só as chaves são
+    acumuladas em memória, nunca os valores.
+    """
+    stack = []            # [tipo ('obj'/'arr'), chave atual, início do membro]
+    expect_key = False
+    state = None          # None, 'key', 'string' ou 'literal'
+    escape = False
+    key_buf = bytearray()
+    value_start = 0
+    offset = 0
+
+    def leaf(end):
+        path = tuple(entry[1] for entry in stack)
+        start = stack[-1][2] if stack and stack[-1][0] == 'obj' else value_start
+        return path, start, end
+
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        i, n = 0, len(chunk)
+        while i < n:
+            byte = chunk[i]
+            if state in ('key', 'string'):
+                if escape:
+                    escape = False
+                    if state == 'key':
+                        key_buf.append(byte)
+                    i += 1
+                    continue
+                # Avança direto até a próxima aspa ou barra invertida
+                quote = chunk.find(b'"', i)
+                slash = chunk.find(b'\\', i)
+                stop = min(p for p in (quote, slash, n) if p >= 0)
+                if state == 'key':
+                    key_buf += chunk[i:stop]
+                if stop == n:
+                    i = n
+                    continue
+                if stop == slash:
+                    escape = True
+                    if state == 'key':
+                        key_buf.append(chunk[stop])
+                    i = stop + 1
+                    continue
+                # Fim da string
+                i = stop + 1
+                if state == 'key':
+                    stack[-1][1] = key_buf.decode('utf-8', errors='replace')
+                    expect_key = False
+                elif stack:
+                    yield leaf(offset + i)
+                state = None
+                continue
+
+            if state == 'literal':
+                if byte in DELIMITERS:
+                    state = None
+                    if stack:
+                        yield leaf(offset + i)
+                    continue  # Reprocessa o delimitador
+                i += 1
+                continue
+
+            if byte in WHITESPACE or byte == ord(':'):
+                pass
+            elif byte == ord('{'):
+                stack.append(['obj', None, None])
+                expect_key = True
+            elif byte == ord('['):
+                stack.append(['arr', '*', None])
+            elif byte in (ord('}'), ord(']')):
+                stack.pop()
+                expect_key = False
+            elif byte == ord(','):
+                expect_key = bool(stack) and stack[-1][0] == 'obj'
+            elif byte == ord('"'):
+                if expect_key:
+                    state = 'key'
+                    key_buf = bytearray()
+                    stack[-1][2] = offset + i
+                else:
+                    state = 'string'
+                    value_start = offset + i
+            else:
+                state = 'literal'
+                value_start = offset + i
+            i += 1
+        offset += n
+
+    if state == 'literal' and stack:
+        yield leaf(offset)
+
+def extract_fields(obj, patterns):
+    """Valores de cada padrão de campo em um JSON já decodificado: {padrão: [valores]}"""
+    values = {}
+    for pattern in patterns:
+        found = [obj]
+        for key in pattern:
+            if key == "*":
+                found = [item for node in found if isinstance(node, list) for item in node]
+            else:
+                found = [node[key] for node in found if isinstance(node, dict) and key in node]
+        values[pattern] = found
+    return values
+
+def field_utilization(filepath, consumed):
+    """Bytes totais, bytes úteis e contagem de campos (úteis e totais) de um corpo"""
+    consumed = set(consumed)
+    useful_bytes = useful_fields = total_fields = 0
+    with open(filepath, 'rb') as f:
+        for path, start, end in scan_leaves(f):
+            total_fields += 1
+            # Elementos de listas aparecem como "*" no caminho, como nos padrões
+            if path in consumed:
+                useful_fields += 1
+                useful_bytes += end - start
+    return {
+        "total_bytes": os.path.getsize(filepath),
+        "useful_bytes": useful_bytes,
+        "useful_fields": useful_fields,
+        "total_fields": total_fields
+    }
+
+# ============================================
+# ANÁLISE POR REQUISIÇÃO E POR COMPLEXIDADE
+# ============================================
+
+def body_files(bodies_dir):
+    """Agrupa os arquivos de corpo por request_id: {id: [(rótulo, caminho), ...]}"""
+    files = defaultdict(list)
+    for name in sorted(os.listdir(bodies_dir)):
+        if not BODY_FILE_PATTERN.fullmatch(name):
+            continue
+        request_id, _, label = os.path.splitext(name)[0].split("_", 2)
+        files[request_id].append((label, os.path.join(bodies_dir, name)))
+    return files
+
+def analyse_overfetching(results_path=None, bodies_dir=BODIES_DIR):
+    """Calcula o aproveitamento de cada requisição capturada e resume por complexidade"""
+    results_path = results_path or os.path.join(INPUT_DIR, INPUT_FILE)
+    files = body_files(bodies_dir)
+    rows = []
+    with open(results_path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            request_id = row.get("request_id")
+            if request_id not in files:
+                continue
+            totals = defaultdict(int)
+            for label, filepath in files[request_id]:
+                consumed = CONSUMED_FIELDS.get((row["api_type"], row["complexity"], label), [])
+                for key, value in field_utilization(filepath, consumed).items():
+                    totals[key] += value
+            rows.append({
+                "request_id": request_id,
+                "api_type": row["api_type"],
+                "complexity": row["complexity"],
+                "repository": row["repository"],
+                **totals,
+                "wasted_bytes": totals["total_bytes"] - totals["useful_bytes"],
+                "bytes_per_useful_field": (totals["total_bytes"] / totals["useful_fields"]
+                                           if totals["useful_fields"] else float('nan'))
+            })
+    return rows
+
+def print_overfetching(rows):
+    """Resumo por complexidade e API"""
+    print("=" * 70)
+    print("APROVEITAMENTO DOS CAMPOS (OVER-FETCHING)")
+    print("=" * 70)
+    print(f"{'Complexidade':<12} {'API':<8} {'N':>5} {'Bytes μ':>9} {'Úteis μ':>9} "
+          f"{'% útil':>7} {'B/campo útil':>13}")
+    print("-" * 70)
+    for complexity in ['simple', 'medium', 'complex']:
+        for api in ['REST', 'GraphQL']:
+            group = [r for r in rows if r["complexity"] == complexity and r["api_type"] == api]
+            if not group:
+                continue
+            total = sum(r["total_bytes"] for r in group)
+            useful = sum(r["useful_bytes"] for r in group)
+            fields = sum(r["useful_fields"] for r in group)
+            print(f"{complexity:<12} {api:<8} {len(group):>5} {total / len(group):>9.0f} "
+                  f"{useful / len(group):>9.0f} {100 * useful / total if total else 0:>6.1f}% "
+                  f"{total / fields if fields else float('nan'):>13.1f}")
+
+def save_overfetching(rows, filepath=None):
+    """Salva a métrica por requisição em CSV"""
+    filepath = filepath or os.path.join(INPUT_DIR, OUTPUT_FILE)
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nAproveitamento por requisição salvo em: {filepath}")
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    if not os.path.isdir(BODIES_DIR):
+        print(f"ERRO: Diretório de corpos não encontrado: {BODIES_DIR}")
+        print("Execute o experimento com CAPTURE_BODIES = True")
+        exit(1)
+
+    rows = analyse_overfetching()
+    if not rows:
+        print("Nenhuma requisição com corpo capturado.")
+        exit(1)
+    print_overfetching(rows)
+    save_overfetching(rows)
@@ -0,0 +1,175 @@
+"""
+Backends das APIs: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Um backend descreve onde e como o experimento consulta as duas APIs.
+É um dicionário com as chaves:
+  - name: nome exibido
+  - rest_url, graphql_url: endereços base (obrigatórios)
+  - baseline_url: URL das sondas de RTT (padrão: raiz da API REST)
+  - headers_rest, headers_graphql: headers; "{token}" é trocado pelo token
+  - requires_token: se a execução exige um token configurado
+  - auth_check: caminho REST usado para testar a conexão (resposta com "login")
+  - repos: identificadores (owner, repo) dos objetos experimentais (obrigatório)
+  - warmup_repo: objeto consultado no aquecimento
+  - rest_paths: caminho REST de cada rótulo (repo, issues, contributors, branches)
+  - graphql_queries: consulta GraphQL de cada complexidade (simple, medium, complex)
+  - nesting_levels: níveis das consultas aninhadas (trecho GraphQL e URL REST de
+    cada nível; formato em aninhadas.NESTING_LEVELS)
+  - nested_query: template da consulta GraphQL aninhada ({inner} recebe os níveis)
+  - start / stop (opcionais): sobem o serviço antes da execução e o encerram
+    depois (stop recebe o que start devolveu)
+  - volume (opcional): True se o serviço gera os repositórios de volume.py
+
+Além dos backends embutidos ("github" e "local", o servidor de
+servidor_local.py), BACKEND em experimento.py pode ser o nome de um módulo
+importável que define um dicionário BACKEND (plugin). Chaves ausentes
+de autenticação e de templates herdam do backend do GitHub.
+"""
+
+import importlib
+
+import servidor_local
+from aninhadas import NESTED_QUERY, NESTING_LEVELS
+
+# Caminhos REST (com {owner}, {repo} e {per_page})
+REST_PATHS = {
+    "repo": "/repos/{owner}/{repo}",
+    "issues": "/repos/{owner}/{repo}/issues?per_page={per_page}&state=all",
+    "contributors": "/repos/{owner}/{repo}/contributors?per_page={per_page}",
+    "branches": "/repos/{owner}/{repo}/branches?per_page={per_page}"
+}
+
+# Consultas GraphQL equivalentes a cada complexidade
+GRAPHQL_QUERIES = {
+    "simple": """
+    query($owner: String!, $repo: String!) {
+        repository(owner: $owner, name: $repo) {
+            name
+            description
+            stargazerCount
+            forkCount
+            createdAt
+            updatedAt
+            primaryLanguage { name }
+        }
+    }
+    """,
+    "medium": """
+    query($owner: String!, $repo: String!) {
+        repository(owner: $owner, name: $repo) {
+            name
+            description
+            stargazerCount
+            forkCount
+            issues(first: 10, orderBy: {field: CREATED_AT, direction: DESC}) {
+                nodes {
+                    title
+                    state
+                    createdAt
+                    author { login }
+                }
+            }
+        }
+    }
+    """,
+    "complex": """
+    query($owner: String!, $repo: String!) {
+        repository(owner: $owner, name: $repo) {
+            name
+            description
+            stargazerCount
+            forkCount
+            issues(first: 5, orderBy: {field: CREATED_AT, direction: DESC}) {
+                nodes { title state createdAt }
+            }
+            mentionableUsers(first: 5) {
+                nodes { login name }
+            }
+            refs(refPrefix: "refs/heads/", first: 5) {
+                nodes { name }
+            }
+        }
+    }
+    """
+}
+
+GITHUB = {
+    "name": "GitHub",
+    "rest_url": "https://api.github.com",
+    "graphql_url": "https://api.github.com/graphql",
+    "headers_rest": {
+        "Authorization": "token {token}",
+        "Accept": "application/vnd.github.v3+json",
+        "Cache-Control": "no-cache"
+    },
+    "headers_graphql": {
+        "Authorization": "bearer {token}",
+        "Content-Type": "application/json",
+        "Cache-Control": "no-cache"
+    },
+    "requires_token": True,
+    "auth_check": "/user",
+    "repos": [
+        ("facebook", "react"),
+        ("microsoft", "vscode"),
+        ("tensorflow", "tensorflow"),
+        ("torvalds", "linux"),
+        ("django", "django"),
+        ("python", "cpython"),
+        ("nodejs", "node"),
+        ("kubernetes", "kubernetes"),
+        ("angular", "angular"),
+        ("vuejs", "vue")
+    ],
+    "warmup_repo": ("octocat", "Hello-World"),
+    "rest_paths": REST_PATHS,
+    "graphql_queries": GRAPHQL_QUERIES,
+    "nesting_levels": NESTING_LEVELS,
+    "nested_query": NESTED_QUERY
+}
+
+LOCAL = {
+    "name": "servidor local",
+    "rest_url": f"http://{servidor_local.HOST}:{servidor_local.PORT}",
+    "graphql_url": f"http://{servidor_local.HOST}:{servidor_local.PORT}/graphql",
+    "headers_rest": {"Accept": "application/json", "Cache-Control": "no-cache"},
+    "headers_graphql": {"Content-Type": "application/json", "Cache-Control": "no-cache"},
+    "requires_token": False,
+    "repos": servidor_local.repository_ids(),
+    "warmup_repo": servidor_local.repository_ids()[0],
+    "start": servidor_local.start_process,
+    "stop": servidor_local.stop_process,
+    "volume": True
+}
+
+BACKENDS = {"github": GITHUB, "local": LOCAL}
+REQUIRED_KEYS = ["rest_url", "graphql_url", "repos"]
+INHERITED_KEYS = ["headers_rest", "headers_graphql", "requires_token", "auth_check",
+                  "rest_paths", "graphql_queries", "nesting_levels", "nested_query"]
+
+# ============================================
+# CARREGAMENTO
+# ============================================
+
+def load_backend(name):
+    """Backend embutido ou do módulo-plugin `name` (dicionário BACKEND), completo"""
+    if name in BACKENDS:
+        spec = BACKENDS[name]
+    else:
+        try:
+            spec = importlib.import_module(name).BACKEND
+        except (ImportError, AttributeError) as e:
+            raise ValueError(f"Backend desconhecido: {name} ({e})")
+    missing = [key for key in REQUIRED_KEYS if key not in spec]
+    if missing:
+        raise ValueError(f"Backend {name} sem as chaves obrigatórias: {missing}")
+    backend = {**{key: GITHUB[key] for key in INHERITED_KEYS}, "name": name, **spec}
+    backend.setdefault("baseline_url", f"{backend['rest_url']}/")
+    backend.setdefault("warmup_repo", backend["repos"][0])
+    return backend
+
+def auth_headers(template, token):
+    """Headers com o token aplicado"""
+    return {key: value.format(token=token) for key, value in template.items()}
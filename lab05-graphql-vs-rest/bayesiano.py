@@ -0,0 +1,183 @@
+"""
+Comparação Bayesiana: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Modelo log-normal conjugado por grupo: log(time_ms) ~ Normal(mu, sigma²)
+com priori Normal-Gama-Inversa. A posteriori depende apenas das
+estatísticas suficientes (n, média e soma dos quadrados dos desvios do
+log), que são guardadas por (api_type, complexity, repository) e somadas
+de forma exata. Um novo lote de medições atualiza as estatísticas salvas
+(warm start) sem reprocessar os dados anteriores.
+
+Da posteriori são amostradas (de forma vetorizada) as razões de latência
+média REST / GraphQL por complexidade e por repositório.
+
+posteriors.json é mantido só por este script, sempre com dados limpos
+(limpeza.clean_data em cada lote); a análise (analise.py) ajusta o modelo
+em memória com os dados já limpos e não altera o arquivo.
+
+Uso:
+    python bayesiano.py                               # Ajusta com os dados atuais
+    python bayesiano.py --warm-start novo_lote.csv    # Atualiza as posterioris salvas
+"""
+
+import argparse
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+# Configuração
+INPUT_DIR = "results"
+INPUT_FILE = "experiment_results.csv"
+POSTERIOR_FILE = "posteriors.json"
+METRIC = "time_ms"
+GROUP_FIELDS = ['api_type', 'complexity', 'repository']
+PRIOR = {"mu": np.log(100.0), "kappa": 0.01, "alpha": 1.0, "beta": 1.0}  # Priori fraca
+DRAWS = 20000        # Amostras da posteriori por grupo
+CREDIBLE = 0.95      # Massa do intervalo de credibilidade
+SEED = 42
+
+# ============================================
+# ESTATÍSTICAS SUFICIENTES
+# ============================================
+
+def sufficient_stats(df, metric=METRIC):
+    """(n, mean, ss) do log da métrica por (api_type, complexity, repository)"""
+    logs = np.log(df[metric].astype(float).clip(lower=1e-6))
+    grouped = logs.groupby([df[field].astype(str) for field in GROUP_FIELDS], observed=True)
+    stats = grouped.agg(['count', 'mean', 'var'])
+    stats.columns = ['n', 'mean', 'var']
+    stats['ss'] = stats['var'].fillna(0) * (stats['n'] - 1)
+    return stats[['n', 'mean', 'ss']]
+
+def combine_stats(stats, by):
+    """Agrega estatísticas suficientes em um nível mais grosso (ex.: api_type, complexity)"""
+    n = stats['n'].groupby(level=by).sum()
+    mean = (stats['n'] * stats['mean']).groupby(level=by).sum() / n
+    # Soma dos quadrados do log: dentro dos grupos + entre grupos
+    squares = (stats['ss'] + stats['n'] * stats['mean'] ** 2).groupby(level=by).sum()
+    return pd.DataFrame({'n': n, 'mean': mean, 'ss': (squares - n * mean ** 2).clip(lower=0)})
+
+def merge_stats(previous, new):
+    """Soma exata de dois conjuntos de estatísticas suficientes (mesmo índice de grupos)"""
+    previous, new = previous.align(new, fill_value=0)
+    n = previous['n'] + new['n']
+    mean = (previous['n'] * previous['mean'] + new['n'] * new['mean']) / n
+    ss = previous['ss'] + new['ss'] + previous['n'] * new['n'] / n * (previous['mean'] - new['mean']) ** 2
+    return pd.DataFrame({'n': n, 'mean': mean, 'ss': ss})
+
+# ============================================
+# POSTERIORI E RAZÕES DE LATÊNCIA
+# ============================================
+
+def posterior(stats, prior=PRIOR):
+    """Parâmetros Normal-Gama-Inversa da posteriori de cada grupo (vetorizado)"""
+    n, mean, ss = stats['n'], stats['mean'], stats['ss']
+    kappa = prior["kappa"] + n
+    return pd.DataFrame({
+        'mu': (prior["kappa"] * prior["mu"] + n * mean) / kappa,
+        'kappa': kappa,
+        'alpha': prior["alpha"] + n / 2,
+        'beta': prior["beta"] + ss / 2 + prior["kappa"] * n * (mean - prior["mu"]) ** 2 / (2 * kappa)
+    })
+
+def sample_log_means(params, draws=DRAWS, rng=None):
+    """Amostras de log E[tempo] = mu + sigma²/2 de cada grupo: matriz (grupos, draws)"""
+    rng = rng or np.random.default_rng(SEED)
+    shape = (len(params), draws)
+    sigma2 = params['beta'].to_numpy()[:, None] / rng.gamma(params['alpha'].to_numpy()[:, None], size=shape)
+    mu = params['mu'].to_numpy()[:, None] + rng.standard_normal(shape) * np.sqrt(sigma2 / params['kappa'].to_numpy()[:, None])
+    return mu + sigma2 / 2
+
+def latency_ratios(stats, by, prior=PRIOR, draws=DRAWS, seed=SEED):
+    """Posteriori da razão de latência média REST / GraphQL em cada grupo do nível `by`
+
+    `by` é uma lista de campos além de api_type (ex.: ['complexity']).
+    """
+    level = combine_stats(stats, ['api_type'] + by)
+    params = posterior(level, prior)
+    if 'REST' not in params.index.get_level_values('api_type') or \
+            'GraphQL' not in params.index.get_level_values('api_type'):
+        return pd.DataFrame()
+    rest = params.xs('REST', level='api_type')
+    graphql = params.xs('GraphQL', level='api_type')
+    common = rest.index.intersection(graphql.index)
+    rng = np.random.default_rng(seed)
+    log_ratio = sample_log_means(rest.loc[common], draws, rng) - sample_log_means(graphql.loc[common], draws, rng)
+    ratio = np.exp(log_ratio)
+    tail = (1 - CREDIBLE) / 2
+    return pd.DataFrame({
+        'ratio_mean': ratio.mean(axis=1),
+        'ratio_median': np.median(ratio, axis=1),
+        'ci_low': np.quantile(ratio, tail, axis=1),
+        'ci_high': np.quantile(ratio, 1 - tail, axis=1),
+        'p_rest_slower': (log_ratio > 0).mean(axis=1),
+        'n_rest': level.xs('REST', level='api_type').loc[common, 'n'].to_numpy(),
+        'n_graphql': level.xs('GraphQL', level='api_type').loc[common, 'n'].to_numpy()
+    }, index=common)
+
+# ============================================
+# PERSISTÊNCIA (WARM START)
+# ============================================
+
+def save_stats(stats, filepath, prior=PRIOR):
+    """Salva as estatísticas suficientes e a priori em JSON"""
+    groups = {"|".join(key): {"n": int(row.n), "mean": float(row.mean), "ss": float(row.ss)}
+              for key, row in zip(stats.index, stats.itertuples())}
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump({"metric": METRIC, "prior": {k: float(v) for k, v in prior.items()},
+                   "groups": groups}, f)
+    print(f"Posterioris salvas em: {filepath} ({len(groups)} grupos)")
+
+def load_stats(filepath):
+    """Carrega (estatísticas, priori) salvas por save_stats"""
+    with open(filepath, encoding='utf-8') as f:
+        data = json.load(f)
+    index = pd.MultiIndex.from_tuples([tuple(key.split("|")) for key in data["groups"]],
+                                      names=GROUP_FIELDS)
+    stats = pd.DataFrame(list(data["groups"].values()), index=index)[['n', 'mean', 'ss']]
+    return stats, data["prior"]
+
+# ============================================
+# RELATÓRIO
+# ============================================
+
+def print_ratios(ratios, title):
+    """Tabela das razões REST / GraphQL"""
+    print(f"\n{title}")
+    print(f"{'Grupo':<32} {'Razão μ':>8} {'IC ' + str(int(CREDIBLE * 100)) + '%':>17} {'P(REST>GQL)':>12}")
+    print("-" * 72)
+    for key, row in ratios.iterrows():
+        label = " / ".join(key) if isinstance(key, tuple) else str(key)
+        print(f"{label:<32} {row['ratio_mean']:>8.3f} [{row['ci_low']:>6.3f}, {row['ci_high']:>6.3f}] "
+              f"{row['p_rest_slower']:>12.3f}")
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Comparação Bayesiana log-normal REST vs GraphQL")
+    parser.add_argument("input", nargs="?", default=os.path.join(INPUT_DIR, INPUT_FILE),
+                        help="CSV com as medições (ou o novo lote, com --warm-start)")
+    parser.add_argument("--warm-start", action="store_true",
+                        help="Atualiza as posterioris salvas com o CSV informado")
+    args = parser.parse_args()
+
+    from dados import read_results
+    from limpeza import clean_data
+
+    posterior_path = os.path.join(INPUT_DIR, POSTERIOR_FILE)
+    batch, _ = clean_data(read_results(args.input))
+    stats = sufficient_stats(batch)
+    prior = PRIOR
+    if args.warm_start and os.path.exists(posterior_path):
+        previous, prior = load_stats(posterior_path)
+        print(f"Warm start: {int(previous['n'].sum())} medições anteriores + {int(stats['n'].sum())} novas")
+        stats = merge_stats(previous, stats)
+
+    print_ratios(latency_ratios(stats, ['complexity'], prior), "RAZÃO DE LATÊNCIA MÉDIA REST / GraphQL")
+    save_stats(stats, posterior_path, prior)
@@ -0,0 +1,273 @@
+"""
+Benchmarks da Análise e do Dashboard: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Mede o tempo de cada etapa de analise.py e de cada gráfico de dashboard.py
+sobre dados sintéticos (sintetico.py) em escalas crescentes, acumula o
+histórico em CSV e sinaliza regressões em relação à execução anterior.
+
+Uso:
+    python benchmark.py
+    python benchmark.py --sizes 1000 100000 --plots-max-rows 10000
+
+Inclui também o tempo de inicialização dos scripts (importações e
+`cli.py analyse --summary-only`), registrado com rows = 0.
+"""
+
+import argparse
+import csv
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import redirect_stdout
+from datetime import datetime
+
+import matplotlib
+matplotlib.use('Agg')
+
+import analise
+import dashboard
+from dados import API_ORDER, COMPLEXITY_ORDER, group_view, read_results
+from limpeza import clean_data
+from sintetico import generate_csv, load_profile
+
+# Configuração
+BENCH_SIZES = [10**3, 10**4, 10**5, 10**6]
+PLOTS_MAX_ROWS = 10**5        # Gráficos acima desse tamanho são pulados
+REPEAT = 3                    # Repetições por alvo (vale o menor tempo)
+REGRESSION_THRESHOLD = 1.20   # Regressão: 20% mais lento que a execução anterior
+OUTPUT_DIR = "results/benchmarks"
+HISTORY_FILE = "history.csv"
+INGESTION_FILE = "ingestion.csv"
+
+ANALYSIS_TARGETS = [
+    ("descriptive_stats", analise.descriptive_stats),
+    ("percentile_summary", analise.percentile_summary),
+    ("clean_data", clean_data),
+    ("normality_tests", analise.normality_tests),
+    ("hypothesis_tests", analise.hypothesis_tests),
+    ("analysis_by_complexity", analise.analysis_by_complexity),
+]
+
+DASHBOARD_TARGETS = [
+    ("plot_time_boxplot", dashboard.plot_time_boxplot),
+    ("plot_size_boxplot", dashboard.plot_size_boxplot),
+    ("plot_distributions", dashboard.plot_distributions),
+    ("plot_bar_ci", dashboard.plot_bar_ci),
+    ("plot_violin", dashboard.plot_violin),
+    ("plot_heatmap", dashboard.plot_heatmap),
+    ("plot_summary", dashboard.plot_summary),
+    ("create_summary_table", dashboard.create_summary_table),
+    ("plot_percentiles", dashboard.plot_percentiles),
+]
+
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+STARTUP_TARGETS = [
+    ("startup:import analise", ["-c", "import analise"]),
+    ("startup:import dashboard", ["-c", "import dashboard"]),
+    ("startup:cli --summary-only", [os.path.join(MODULE_DIR, "cli.py"), "analyse", "--summary-only"]),
+]
+
+# ============================================
+# MEDIÇÃO
+# ============================================
+
+def time_call(func, *args, repeat=REPEAT):
+    """Menor tempo (s) de `repeat` execuções, com a saída suprimida"""
+    best = float('inf')
+    for _ in range(repeat):
+        with redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            func(*args)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+def git_commit():
+    """Commit atual (para o histórico), se disponível"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"],
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ""
+
+def run_benchmarks(sizes, plots_max_rows=PLOTS_MAX_ROWS, repeat=REPEAT):
+    """Executa os benchmarks em cada tamanho e retorna as medições"""
+    profile = load_profile()
+    measurements = []
+
+    with tempfile.TemporaryDirectory() as workdir:
+        # Redireciona entradas e saídas dos scripts para o diretório temporário
+        analise.INPUT_DIR = dashboard.INPUT_DIR = workdir
+        dashboard.OUTPUT_DIR = os.path.join(workdir, "graficos")
+        os.makedirs(dashboard.OUTPUT_DIR)
+
+        for size in sizes:
+            print(f"\n--- {size} linhas ---")
+            generate_csv(size, os.path.join(workdir, analise.INPUT_FILE), profile=profile)
+
+            # load_data é medido isoladamente; o DataFrame carregado alimenta os demais alvos
+            targets = [("load_data", analise.load_data, ())]
+            with redirect_stdout(io.StringIO()):
+                df = analise.load_data()
+            targets += [(name, func, (df,)) for name, func in ANALYSIS_TARGETS]
+            if size <= plots_max_rows:
+                targets += [(name, func, (df,)) for name, func in DASHBOARD_TARGETS]
+
+            for name, func, args in targets:
+                seconds = time_call(func, *args, repeat=repeat)
+                measurements.append({"rows": size, "target": name, "seconds": seconds})
+                print(f"  {name:<24} {seconds:>10.4f} s")
+
+    return measurements
+
+def bench_startup(repeat=REPEAT):
+    """Tempo de inicialização (processo novo) das importações e do resumo rápido"""
+    print("\n--- inicialização ---")
+    env = {**os.environ, "PYTHONPATH": MODULE_DIR}
+    measurements = []
+    for name, args in STARTUP_TARGETS:
+        best = float('inf')
+        for _ in range(repeat):
+            start = time.perf_counter()
+            subprocess.run([sys.executable] + args, env=env, check=True,
+                           stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            best = min(best, time.perf_counter() - start)
+        measurements.append({"rows": 0, "target": name, "seconds": best})
+        print(f"  {name:<28} {best:>8.4f} s")
+    return measurements
+
+def load_default(filepath):
+    """Leitor anterior: tipos padrão e fatias por máscara booleana (cópias)"""
+    import pandas as pd
+    df = pd.read_csv(filepath)
+    return df, [df[(df['api_type'] == api) & (df['complexity'] == comp)]
+                for api in API_ORDER for comp in COMPLEXITY_ORDER]
+
+def load_typed(filepath):
+    """Leitor tipado: categóricos, numéricos estreitos e fatias por view"""
+    df = read_results(filepath)
+    return df, [group_view(df, api, comp) for api in API_ORDER for comp in COMPLEXITY_ORDER]
+
+def measure_peak(func, *args):
+    """(tempo em s, pico de memória em MiB, memória retida do DataFrame em MiB)"""
+    tracemalloc.start()
+    start = time.perf_counter()
+    df, _ = func(*args)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds, peak / 2**20, df.memory_usage(deep=True).sum() / 2**20
+
+def bench_ingestion(sizes):
+    """Compara o leitor padrão com o tipado em tempo, pico de memória e memória retida"""
+    profile = load_profile()
+    rows = []
+    print("\n--- leitura: padrão vs tipada ---")
+    print(f"  {'linhas':>10} {'leitor':<8} {'tempo (s)':>10} {'pico (MiB)':>11} {'retido (MiB)':>13}")
+    with tempfile.TemporaryDirectory() as workdir:
+        filepath = os.path.join(workdir, "ingestion.csv")
+        for size in sizes:
+            generate_csv(size, filepath, profile=profile)
+            results = {name: measure_peak(func, filepath)
+                       for name, func in [("padrão", load_default), ("tipada", load_typed)]}
+            for name, (seconds, peak, retained) in results.items():
+                rows.append({"rows": size, "loader": name, "seconds": round(seconds, 6),
+                             "peak_mib": round(peak, 3), "retained_mib": round(retained, 3)})
+                print(f"  {size:>10} {name:<8} {seconds:>10.4f} {peak:>11.1f} {retained:>13.1f}")
+            (t0, p0, r0), (t1, p1, r1) = results["padrão"], results["tipada"]
+            print(f"  {'':>10} redução: tempo {100 * (1 - t1 / t0):+.1f}% | "
+                  f"pico {100 * (1 - p1 / p0):+.1f}% | retido {100 * (1 - r1 / r0):+.1f}%")
+
+    filepath = os.path.join(OUTPUT_DIR, INGESTION_FILE)
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()))
+        writer.writeheader()
+        writer.writerows(rows)
+    print(f"\nComparação de leitura salva em: {filepath}")
+
+# ============================================
+# HISTÓRICO E REGRESSÕES
+# ============================================
+
+def load_history(filepath):
+    """Última medição registrada por (rows, target)"""
+    previous = {}
+    if os.path.exists(filepath):
+        with open(filepath, newline='', encoding='utf-8') as f:
+            for row in csv.DictReader(f):
+                previous[(int(row["rows"]), row["target"])] = row
+    return previous
+
+def check_regressions(measurements, previous, threshold=REGRESSION_THRESHOLD):
+    """Lista os alvos que ficaram mais lentos que o limite em relação à execução anterior"""
+    regressions = []
+    for m in measurements:
+        before = previous.get((m["rows"], m["target"]))
+        if before is None:
+            continue
+        ratio = m["seconds"] / float(before["seconds"])
+        if ratio > threshold:
+            regressions.append((m, before, ratio))
+    return regressions
+
+def append_history(measurements, filepath):
+    """Acrescenta as medições ao histórico"""
+    directory = os.path.dirname(filepath)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    new_file = not os.path.exists(filepath)
+    run_at = datetime.now().isoformat()
+    commit = git_commit()
+    with open(filepath, 'a', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=["run_at", "commit", "rows", "target", "seconds"])
+        if new_file:
+            writer.writeheader()
+        for m in measurements:
+            writer.writerow({"run_at": run_at, "commit": commit, **m,
+                             "seconds": round(m["seconds"], 6)})
+    print(f"\nHistórico atualizado: {filepath}")
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmarks de analise.py e dashboard.py")
+    parser.add_argument("--sizes", type=int, nargs="+", default=BENCH_SIZES)
+    parser.add_argument("--plots-max-rows", type=int, default=PLOTS_MAX_ROWS)
+    parser.add_argument("--repeat", type=int, default=REPEAT)
+    parser.add_argument("--fail-on-regression", action="store_true")
+    parser.add_argument("--ingestion", action="store_true",
+                        help="Compara o leitor padrão com o tipado (tempo e memória)")
+    args = parser.parse_args()
+
+    print("=" * 60)
+    print("BENCHMARKS: ANÁLISE E DASHBOARD")
+    print("=" * 60)
+
+    if args.ingestion:
+        bench_ingestion(args.sizes)
+
+    history_path = os.path.join(OUTPUT_DIR, HISTORY_FILE)
+    previous = load_history(history_path)
+    measurements = bench_startup(args.repeat)
+    measurements += run_benchmarks(args.sizes, args.plots_max_rows, args.repeat)
+    regressions = check_regressions(measurements, previous)
+    append_history(measurements, history_path)
+
+    if regressions:
+        print("\nREGRESSÕES DETECTADAS:")
+        for m, before, ratio in regressions:
+            print(f"  {m['target']} ({m['rows']} linhas): {float(before['seconds']):.4f} s "
+                  f"-> {m['seconds']:.4f} s ({ratio:.2f}x, commit anterior {before['commit']})")
+        if args.fail_on_regression:
+            exit(1)
+    else:
+        print("\nNenhuma regressão em relação à execução anterior.")
@@ -0,0 +1,187 @@
+"""
+Calibração do Relógio e do Harness: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+As medições usam um único relógio monotônico em nanossegundos (clock_ns,
+time.perf_counter_ns; no Linux é o mesmo CLOCK_MONOTONIC de
+time.monotonic_ns, comum a todos os processos da máquina). Cada linha do
+experimento registra start_ns / end_ns desse relógio, o que permite ordenar
+medições de executores concorrentes sem depender do relógio de parede.
+
+A calibração mede:
+  - a resolução do relógio (declarada por time.get_clock_info e observada:
+    menor incremento entre leituras seguidas) e o custo de uma leitura;
+  - o piso do harness: tempo de uma requisição no-op (GET /noop no servidor
+    local, corpo vazio) feita pelo mesmo caminho das medições, e a parte
+    dele gasta no cliente (preparo da requisição e leitura da resposta, fora
+    do `elapsed` do cliente HTTP, que cobre o envio e a ida e volta);
+  - âncoras (relógio de parede, relógio monotônico) no início e no fim da
+    execução, para converter start_ns em horário e estimar a deriva.
+
+time_net_ms = time_ms - (leitura do relógio + custo fixo do cliente por
+sub-requisição): o REST complexo, com 4 chamadas, desconta 4 vezes o custo
+do cliente, e o GraphQL, uma. A ida e volta do no-op não é subtraída: cada
+rodada de requisições em sequência do REST paga a sua, e é parte da
+diferença medida.
+time_net_ms não é truncado em zero; valores negativos indicam que o custo
+calibrado passou do tempo medido. É relevante sobretudo para latências
+abaixo de 1 ms em backends locais, em que o piso é da mesma ordem da medição.
+
+A calibração salva com o experimento leva o run_id da execução, e a análise
+só a usa com um CSV da mesma execução.
+
+Uso:
+    python calibracao.py   # calibra contra o servidor local e salva o JSON
+"""
+
+import json
+import os
+import statistics
+import time
+
+# Configuração
+CLOCK = "perf_counter"           # Relógio das medições (time.get_clock_info)
+clock_ns = time.perf_counter_ns
+CLOCK_SAMPLES = 10000            # Pares de leituras para resolução e custo
+NOOP_SAMPLES = 200               # Requisições no-op medidas
+NOOP_WARMUP = 20                 # Requisições no-op descartadas
+CALIBRATION_FILE = "clock_calibration.json"
+
+# ============================================
+# RELÓGIO
+# ============================================
+
+def clock_info():
+    """Implementação, resolução declarada (ns) e propriedades do relógio"""
+    info = time.get_clock_info(CLOCK)
+    return {
+        "clock": CLOCK,
+        "implementation": info.implementation,
+        "declared_resolution_ns": info.resolution * 1e9,
+        "monotonic": info.monotonic,
+        "adjustable": info.adjustable
+    }
+
+def observed_resolution(samples=CLOCK_SAMPLES):
+    """Menor incremento (ns) observado entre uma leitura e a primeira leitura diferente"""
+    steps = []
+    for _ in range(samples):
+        first = clock_ns()
+        second = clock_ns()
+        while second == first:
+            second = clock_ns()
+        steps.append(second - first)
+    return min(steps)
+
+def read_cost(samples=CLOCK_SAMPLES):
+    """Mediana (ns) do intervalo entre duas leituras consecutivas do relógio"""
+    deltas = []
+    for _ in range(samples):
+        first = clock_ns()
+        deltas.append(clock_ns() - first)
+    return statistics.median(deltas)
+
+def anchor():
+    """Par (relógio de parede, relógio das medições) lido no mesmo instante"""
+    return {"wall_ns": time.time_ns(), "clock_ns": clock_ns()}
+
+def drift_ppm(first, last):
+    """Deriva do relógio de parede em relação ao monotônico entre duas âncoras (ppm)"""
+    elapsed = last["clock_ns"] - first["clock_ns"]
+    if elapsed <= 0:
+        return None
+    return ((last["wall_ns"] - first["wall_ns"]) - elapsed) / elapsed * 1e6
+
+# ============================================
+# PISO DO HARNESS (REQUISIÇÃO NO-OP)
+# ============================================
+
+def noop_floor(request, samples=NOOP_SAMPLES, warmup=NOOP_WARMUP):
+    """Mediana, p05 e p95 (ms) do tempo de `request()`, uma requisição no-op
+
+    `request()` devolve a resposta; client_ms é a mediana do tempo fora do
+    `elapsed` dela (custo fixo do cliente em cada medição).
+    """
+    for _ in range(warmup):
+        request()
+    times, client = [], []
+    for _ in range(samples):
+        start = clock_ns()
+        response = request()
+        elapsed = (clock_ns() - start) / 1e6
+        times.append(elapsed)
+        client.append(elapsed - response.elapsed.total_seconds() * 1000)
+    cuts = statistics.quantiles(times, n=20)
+    return {"median_ms": statistics.median(times), "p05_ms": cuts[0], "p95_ms": cuts[-1],
+            "client_ms": statistics.median(client)}
+
+def calibrate(request=None):
+    """Calibração completa; sem `request`, só o relógio (sem piso do harness)"""
+    calibration = {
+        **clock_info(),
+        "observed_resolution_ns": observed_resolution(),
+        "read_cost_ns": read_cost(),
+        "anchors": [anchor()]
+    }
+    if request is not None:
+        calibration["noop"] = noop_floor(request)
+    return calibration
+
+def overhead_ms(calibration, calls=1):
+    """Custo do harness em uma medição: leitura do relógio + custo fixo do cliente × `calls`"""
+    if not calibration or "noop" not in calibration:
+        return 0.0
+    return calibration["read_cost_ns"] / 1e6 + calls * calibration["noop"]["client_ms"]
+
+# ============================================
+# PERSISTÊNCIA
+# ============================================
+
+def finish(calibration):
+    """Acrescenta a âncora final e a deriva entre o início e o fim da execução"""
+    calibration["anchors"].append(anchor())
+    calibration["drift_ppm"] = drift_ppm(calibration["anchors"][0], calibration["anchors"][-1])
+    return calibration
+
+def save_calibration(calibration, filepath):
+    """Salva a calibração em JSON"""
+    directory = os.path.dirname(filepath)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(calibration, f, indent=2)
+
+def load_calibration(filepath):
+    """Calibração salva (ou None se o arquivo não existir)"""
+    if not os.path.exists(filepath):
+        return None
+    with open(filepath, encoding='utf-8') as f:
+        return json.load(f)
+
+def print_calibration(calibration):
+    """Resumo legível da calibração"""
+    print(f"Relógio: {calibration['clock']} ({calibration['implementation']}), "
+          f"resolução declarada {calibration['declared_resolution_ns']:.0f} ns, "
+          f"observada {calibration['observed_resolution_ns']} ns")
+    print(f"Custo de uma leitura do relógio: {calibration['read_cost_ns']:.0f} ns")
+    if "noop" in calibration:
+        noop = calibration["noop"]
+        print(f"Piso do harness (no-op local): {noop['median_ms']:.3f} ms "
+              f"(p05 {noop['p05_ms']:.3f}, p95 {noop['p95_ms']:.3f}), "
+              f"no cliente: {noop['client_ms']:.3f} ms")
+    if calibration.get("drift_ppm") is not None:
+        print(f"Deriva parede x monotônico: {calibration['drift_ppm']:+.1f} ppm")
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    import experimento
+
+    calibration = finish(experimento.run_calibration())
+    print_calibration(calibration)
+    filepath = os.path.join(experimento.OUTPUT_DIR, CALIBRATION_FILE)
+    save_calibration(calibration, filepath)
+    print(f"Calibração salva em: {filepath}")
@@ -0,0 +1,120 @@
+"""
+Linha de Comando Unificada: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Uso:
+    python cli.py run       # Executa o experimento (experimento.py)
+    python cli.py analyse   # Análise estatística (analise.py)
+    python cli.py analyse --summary-only  # Resumo rápido (sem pandas/scipy)
+    python cli.py plot      # Gera o dashboard (dashboard.py)
+    python cli.py all       # Executa as três etapas em sequência
+    python cli.py runs      # Lista as execuções registradas (historico.py)
+    python cli.py compare [BASE NOVA]  # Regressões entre duas execuções
+
+As etapas trocam os dados em memória e reaproveitam o cache em
+results/.cache (use --no-cache para recalcular tudo).
+"""
+
+import argparse
+import os
+
+import pipeline
+
+DEFAULT_INPUT = os.path.join("results", "experiment_results.csv")
+
+# ============================================
+# COMANDOS
+# ============================================
+
+def load_clean(args):
+    """Carrega e limpa os dados do CSV informado"""
+    if not os.path.exists(args.input):
+        print(f"ERRO: Arquivo não encontrado: {args.input}")
+        print("Execute primeiro: python cli.py run")
+        exit(1)
+    return clean(pipeline.stage_load(args.input), args)
+
+def clean(dataset, args):
+    """Etapa de limpeza com a auditoria salva ao lado do CSV"""
+    from limpeza import AUDIT_FILE
+    audit_path = os.path.join(os.path.dirname(dataset.source), AUDIT_FILE)
+    return pipeline.stage_clean(dataset, audit_path=audit_path)
+
+def cmd_run(args):
+    """Executa o experimento"""
+    return pipeline.stage_run()
+
+def cmd_analyse(args, dataset=None):
+    """Executa a análise estatística"""
+    if getattr(args, "summary_only", False):
+        import analise
+        analise.summary_only(args.input)
+        return None
+    dataset = dataset or load_clean(args)
+    pipeline.stage_analyse(dataset)
+    return dataset
+
+def cmd_plot(args, dataset=None):
+    """Gera os gráficos do dashboard"""
+    dataset = dataset or load_clean(args)
+    pipeline.stage_plot(dataset)
+    return dataset
+
+def cmd_runs(args):
+    """Lista as execuções registradas no histórico"""
+    from historico import list_runs
+    for meta in list_runs(args.runs_dir):
+        print(f"{meta['run_id']:<28} {meta['rows']:>8} linhas  {meta['source']}")
+
+def cmd_compare(args):
+    """Compara duas execuções (padrão: as duas últimas) a partir dos agregados"""
+    from historico import compare_runs, list_runs, print_comparison
+    runs = args.runs or [meta["run_id"] for meta in list_runs(args.runs_dir)[-2:]]
+    if len(runs) != 2:
+        print("ERRO: informe duas execuções (ou registre pelo menos duas com analyse)")
+        exit(1)
+    comparison, unmatched = compare_runs(*runs, runs_dir=args.runs_dir)
+    print_comparison(comparison, unmatched, *runs)
+
+def cmd_all(args):
+    """Experimento, análise e dashboard com os dados passados em memória"""
+    dataset = clean(cmd_run(args), args)
+    cmd_analyse(args, dataset)
+    cmd_plot(args, dataset)
+
+# ============================================
+# MAIN
+# ============================================
+
+def build_parser():
+    """Define os subcomandos e opções"""
+    parser = argparse.ArgumentParser(description="Experimento controlado: GraphQL vs REST")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="Ignora e não grava o cache de etapas")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("run", help="Executa o experimento").set_defaults(func=cmd_run)
+    for name, func, help_text in [("analyse", cmd_analyse, "Análise estatística"),
+                                  ("plot", cmd_plot, "Gera o dashboard")]:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--input", default=DEFAULT_INPUT, help="CSV com os resultados")
+        sub.set_defaults(func=func)
+        if name == "analyse":
+            sub.add_argument("--summary-only", action="store_true",
+                             help="Resumo rápido sem scipy nem gráficos")
+    subparsers.add_parser("all", help="run + analyse + plot").set_defaults(func=cmd_all)
+    for name, func, help_text in [("runs", cmd_runs, "Lista as execuções registradas"),
+                                  ("compare", cmd_compare, "Regressões entre duas execuções")]:
+        sub = subparsers.add_parser(name, help=help_text)
+        sub.add_argument("--runs-dir", default=os.path.join("results", "runs"),
+                         help="Diretório do histórico de execuções")
+        sub.set_defaults(func=func)
+        if name == "compare":
+            sub.add_argument("runs", nargs="*", metavar="RUN_ID", help="Execução base e nova")
+    return parser
+
+if __name__ == "__main__":
+    args = build_parser().parse_args()
+    pipeline.USE_CACHE = not args.no_cache
+    args.func(args)
@@ -0,0 +1,137 @@
+"""
+Leitura Tipada dos Resultados: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Carrega experiment_results.csv com tipos categóricos e numéricos estreitos
+e ordena as linhas por (api_type, complexity, repository, timestamp).
+Com essa ordenação cada grupo ocupa um intervalo contíguo de linhas, e
+group_view devolve fatias (views) em vez das cópias criadas por máscaras
+booleanas como df[df['api_type'] == 'REST'].
+"""
+
+import weakref
+
+import numpy as np
+import pandas as pd
+
+# Configuração
+API_ORDER = ['REST', 'GraphQL']
+COMPLEXITY_ORDER = ['simple', 'medium', 'complex']
+SORT_FIELDS = ['api_type', 'complexity', 'repository']
+EXTRA_CATEGORIES = ['protocol', 'json_parser', 'statuses', 'error_class', 'run_id']  # Colunas opcionais de baixa cardinalidade
+# time_ms fica em float64: médias e testes sobre milhões de linhas perdem
+# precisão em float32, e o ganho de memória vem sobretudo dos categóricos
+NUMERIC_DTYPES = {
+    'execution': 'int32',
+    'time_ms': 'float64',
+    'size_bytes': 'int32',
+    'status': 'int16',
+    'attempts': 'int16',
+    'parse_ms': 'float64',
+    'not_modified': 'int8',
+    'bytes_saved': 'int32',
+    'depth': 'int8',
+    'requests': 'int16',
+    'issues': 'int32',
+    'contributors': 'int32',
+    'branches': 'int32',
+    'text_size': 'int32',
+    'page_scale': 'int16',
+    'axis_pages': 'bool',
+    'parallel': 'bool',
+    'multiplexed': 'bool'
+}
+
+# Partições já calculadas, por id do DataFrame (validadas por weakref)
+_PARTITION_CACHE = {}
+
+# ============================================
+# TIPOS E LAYOUT
+# ============================================
+
+def ordered_categories(series, preferred):
+    """Categórico com as categorias conhecidas primeiro (na ordem do experimento)"""
+    series = series.astype('category')
+    extra = sorted(c for c in series.cat.categories if c not in preferred)
+    known = [c for c in preferred if c in set(series.cat.categories)]
+    return series.cat.set_categories(known + extra)
+
+def optimize_frame(df):
+    """Converte tipos e ordena as linhas para o layout particionado por grupo"""
+    df = df.assign(
+        api_type=ordered_categories(df['api_type'], API_ORDER),
+        complexity=ordered_categories(df['complexity'], COMPLEXITY_ORDER),
+        repository=df['repository'].astype('category'),
+        timestamp=pd.to_datetime(df['timestamp'])
+    )
+    df = df.astype({col: dtype for col, dtype in NUMERIC_DTYPES.items() if col in df.columns})
+    df = df.astype({col: 'category' for col in EXTRA_CATEGORIES if col in df.columns})
+    return df.sort_values(SORT_FIELDS + ['timestamp'], kind='stable', ignore_index=True)
+
+def read_results(filepath):
+    """Lê o CSV do experimento já com tipos estreitos e layout particionado"""
+    dtypes = {'api_type': 'category', 'complexity': 'category', 'repository': 'category',
+              **{col: 'category' for col in EXTRA_CATEGORIES}, **NUMERIC_DTYPES}
+    return optimize_frame(pd.read_csv(filepath, dtype=dtypes))
+
+# ============================================
+# PARTIÇÕES E VIEWS POR GRUPO
+# ============================================
+
+def _group_codes(df):
+    """Códigos inteiros combinados de (api_type, complexity, repository), ou None"""
+    if not all(isinstance(df[field].dtype, pd.CategoricalDtype) for field in SORT_FIELDS):
+        return None
+    combined = np.zeros(len(df), dtype=np.int64)
+    for field in SORT_FIELDS:
+        combined = combined * (len(df[field].cat.categories) + 1) + df[field].cat.codes.to_numpy()
+    return combined
+
+def partitions(df):
+    """Intervalos (início, fim) de cada grupo e prefixo de grupo, se o layout for particionado
+
+    As chaves são tuplas de prefixo: (api,), (api, complexity) e
+    (api, complexity, repository). Retorna None se os dados não estiverem
+    ordenados por grupo (ex.: DataFrame montado em memória sem optimize_frame).
+    """
+    cached = _PARTITION_CACHE.get(id(df))
+    if cached is not None and cached[0]() is df:
+        return cached[1]
+
+    codes = _group_codes(df)
+    if codes is None or (len(codes) > 1 and np.any(np.diff(codes) < 0)):
+        return None
+
+    starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]]) if len(codes) else np.array([], int)
+    stops = np.r_[starts[1:], len(df)]
+    columns = [(df[field].cat.categories, df[field].cat.codes.to_numpy()) for field in SORT_FIELDS]
+    parts = {}
+    for start, stop in zip(starts.tolist(), stops.tolist()):
+        key = tuple(categories[codes[start]] for categories, codes in columns)
+        for depth in range(1, len(key) + 1):
+            prefix = key[:depth]
+            first, _ = parts.get(prefix, (start, stop))
+            parts[prefix] = (first, stop)
+
+    key = id(df)
+    _PARTITION_CACHE[key] = (weakref.ref(df, lambda _: _PARTITION_CACHE.pop(key, None)), parts)
+    return parts
+
+def group_view(df, api_type=None, complexity=None, repository=None):
+    """Linhas de um grupo: fatia contígua (view) se possível, senão máscara booleana"""
+    spec = [api_type, complexity, repository]
+    given = [value is not None for value in spec]
+    prefix_ok = given == sorted(given, reverse=True)
+
+    parts = partitions(df) if prefix_ok else None
+    if parts is not None:
+        key = tuple(value for value in spec if value is not None)
+        start, stop = parts.get(key, (0, 0))
+        return df.iloc[start:stop]
+
+    mask = np.ones(len(df), dtype=bool)
+    for field, value in zip(SORT_FIELDS, spec):
+        if value is not None:
+            mask &= (df[field] == value).to_numpy()
+    return df[mask]
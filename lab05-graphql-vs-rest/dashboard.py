@@ -4,36 +4,56 @@ Disciplina: Laboratório de Experimentação de Software
 Curso: Engenharia de Software
 """
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
 import os
 import warnings
 warnings.filterwarnings('ignore')
 
+from quantis import rollup, sketch_quantile, sketches_from_dataframe
+
 # Configurações
 INPUT_DIR = "results"
 INPUT_FILE = "experiment_results.csv"
 OUTPUT_DIR = "results/graficos"
+CHART_FILES = [
+    '01_tempo_boxplot.png',
+    '02_tamanho_boxplot.png',
+    '03_distribuicoes.png',
+    '04_barras_ic95.png',
+    '05_violin.png',
+    '06_heatmap.png',
+    '07_resumo_comparativo.png',
+    '08_tabela_resumo.png',
+    '09_percentis.png',
+    '10_subrequisicoes.png'
+]
 
 # Configurações de estilo
-plt.style.use('seaborn-v0_8-whitegrid')
 COLORS = {'REST': '#3498db', 'GraphQL': '#e74c3c'}
-plt.rcParams['figure.figsize'] = (12, 8)
-plt.rcParams['font.size'] = 11
-plt.rcParams['axes.titlesize'] = 14
-plt.rcParams['axes.labelsize'] = 12
-plt.rcParams['figure.dpi'] = 100
-plt.rcParams['savefig.dpi'] = 300
+_style_ready = False
+
+def setup_style():
+    """Importa matplotlib/seaborn e aplica o estilo na primeira chamada"""
+    global _style_ready
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+    if not _style_ready:
+        plt.style.use('seaborn-v0_8-whitegrid')
+        plt.rcParams['figure.figsize'] = (12, 8)
+        plt.rcParams['font.size'] = 11
+        plt.rcParams['axes.titlesize'] = 14
+        plt.rcParams['axes.labelsize'] = 12
+        plt.rcParams['figure.dpi'] = 100
+        plt.rcParams['savefig.dpi'] = 300
+        _style_ready = True
+    return plt, sns
 
 # ============================================
 # CARREGAR DADOS
 # ============================================
 
 def load_data():
-    """Carrega os dados do experimento"""
+    """Carrega os dados do experimento (tipos estreitos, particionado por grupo)"""
+    from dados import read_results
     filepath = os.path.join(INPUT_DIR, INPUT_FILE)
     
     if not os.path.exists(filepath):
@@ -41,7 +61,7 @@ def load_data():
         print("Execute primeiro: python experimento.py")
         exit(1)
     
-    df = pd.read_csv(filepath)
+    df = read_results(filepath)
     print(f"Dados carregados: {len(df)} registros\n")
     return df
 
@@ -57,6 +77,7 @@ def setup_output_dir():
 
 def plot_time_boxplot(df):
     """Boxplot comparando tempo de resposta"""
+    plt, sns = setup_style()
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
     
     # Boxplot geral
@@ -67,7 +88,7 @@ def plot_time_boxplot(df):
     axes[0].set_ylabel('Tempo (ms)')
     
     # Adicionar médias
-    means = df.groupby('api_type')['time_ms'].mean()
+    means = df.groupby('api_type', observed=True)['time_ms'].mean()
     for i, api in enumerate(['REST', 'GraphQL']):
         axes[0].annotate(f'μ = {means[api]:.1f}ms',
                          xy=(i, means[api]),
@@ -95,6 +116,7 @@ def plot_time_boxplot(df):
 
 def plot_size_boxplot(df):
     """Boxplot comparando tamanho das respostas"""
+    plt, sns = setup_style()
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
     
     # Boxplot geral
@@ -105,7 +127,7 @@ def plot_size_boxplot(df):
     axes[0].set_ylabel('Tamanho (bytes)')
     
     # Adicionar médias
-    means = df.groupby('api_type')['size_bytes'].mean()
+    means = df.groupby('api_type', observed=True)['size_bytes'].mean()
     for i, api in enumerate(['REST', 'GraphQL']):
         axes[0].annotate(f'μ = {means[api]:.0f}B',
                          xy=(i, means[api]),
@@ -133,31 +155,33 @@ def plot_size_boxplot(df):
 
 def plot_distributions(df):
     """Histogramas e KDE das distribuições"""
+    from dados import group_view
+    plt, sns = setup_style()
     fig, axes = plt.subplots(2, 2, figsize=(14, 10))
     
     # Tempo - REST
-    sns.histplot(df[df['api_type'] == 'REST']['time_ms'], kde=True,
+    sns.histplot(group_view(df, 'REST')['time_ms'], kde=True,
                  ax=axes[0, 0], color=COLORS['REST'], bins=30)
     axes[0, 0].set_title('Distribuição Tempo - REST', fontweight='bold')
     axes[0, 0].set_xlabel('Tempo (ms)')
     axes[0, 0].set_ylabel('Frequência')
     
     # Tempo - GraphQL
-    sns.histplot(df[df['api_type'] == 'GraphQL']['time_ms'], kde=True,
+    sns.histplot(group_view(df, 'GraphQL')['time_ms'], kde=True,
                  ax=axes[0, 1], color=COLORS['GraphQL'], bins=30)
     axes[0, 1].set_title('Distribuição Tempo - GraphQL', fontweight='bold')
     axes[0, 1].set_xlabel('Tempo (ms)')
     axes[0, 1].set_ylabel('Frequência')
     
     # Tamanho - REST
-    sns.histplot(df[df['api_type'] == 'REST']['size_bytes'], kde=True,
+    sns.histplot(group_view(df, 'REST')['size_bytes'], kde=True,
                  ax=axes[1, 0], color=COLORS['REST'], bins=30)
     axes[1, 0].set_title('Distribuição Tamanho - REST', fontweight='bold')
     axes[1, 0].set_xlabel('Tamanho (bytes)')
     axes[1, 0].set_ylabel('Frequência')
     
     # Tamanho - GraphQL
-    sns.histplot(df[df['api_type'] == 'GraphQL']['size_bytes'], kde=True,
+    sns.histplot(group_view(df, 'GraphQL')['size_bytes'], kde=True,
                  ax=axes[1, 1], color=COLORS['GraphQL'], bins=30)
     axes[1, 1].set_title('Distribuição Tamanho - GraphQL', fontweight='bold')
     axes[1, 1].set_xlabel('Tamanho (bytes)')
@@ -175,6 +199,7 @@ def plot_distributions(df):
 
 def plot_bar_ci(df):
     """Gráfico de barras com intervalo de confiança 95%"""
+    plt, sns = setup_style()
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
     
     # Tempo por complexidade
@@ -209,6 +234,7 @@ def plot_bar_ci(df):
 
 def plot_violin(df):
     """Violin plots para visualização completa da distribuição"""
+    plt, sns = setup_style()
     fig, axes = plt.subplots(1, 2, figsize=(14, 6))
     
     sns.violinplot(data=df, x='complexity', y='time_ms', hue='api_type',
@@ -241,6 +267,7 @@ def plot_violin(df):
 
 def plot_heatmap(df):
     """Heatmaps das métricas por repositório"""
+    plt, sns = setup_style()
     fig, axes = plt.subplots(1, 2, figsize=(16, 10))
     
     # Preparar dados para tempo
@@ -248,7 +275,8 @@ def plot_heatmap(df):
         values='time_ms',
         index='repository',
         columns=['api_type', 'complexity'],
-        aggfunc='mean'
+        aggfunc='mean',
+        observed=True
     ).round(1)
     
     # Reordenar colunas
@@ -268,7 +296,8 @@ def plot_heatmap(df):
         values='size_bytes',
         index='repository',
         columns=['api_type', 'complexity'],
-        aggfunc='mean'
+        aggfunc='mean',
+        observed=True
     ).round(0)
     
     pivot_size = pivot_size[[c for c in cols_order if c in pivot_size.columns]]
@@ -291,10 +320,12 @@ def plot_heatmap(df):
 
 def plot_summary(df):
     """Gráfico resumo com comparativo geral"""
+    from dados import group_view
+    plt, sns = setup_style()
     fig, axes = plt.subplots(2, 2, figsize=(14, 12))
     
     # 1. Média geral - Tempo
-    time_means = df.groupby('api_type')['time_ms'].mean()
+    time_means = df.groupby('api_type', observed=True)['time_ms'].mean()
     bars1 = axes[0, 0].bar(['REST', 'GraphQL'], 
                            [time_means['REST'], time_means['GraphQL']],
                            color=[COLORS['REST'], COLORS['GraphQL']])
@@ -303,7 +334,7 @@ def plot_summary(df):
     axes[0, 0].bar_label(bars1, fmt='%.1f ms')
     
     # 2. Média geral - Tamanho
-    size_means = df.groupby('api_type')['size_bytes'].mean()
+    size_means = df.groupby('api_type', observed=True)['size_bytes'].mean()
     bars2 = axes[0, 1].bar(['REST', 'GraphQL'],
                            [size_means['REST'], size_means['GraphQL']],
                            color=[COLORS['REST'], COLORS['GraphQL']])
@@ -315,8 +346,8 @@ def plot_summary(df):
     complexities = ['simple', 'medium', 'complex']
     diff_time = []
     for c in complexities:
-        rest = df[(df['api_type'] == 'REST') & (df['complexity'] == c)]['time_ms'].mean()
-        gql = df[(df['api_type'] == 'GraphQL') & (df['complexity'] == c)]['time_ms'].mean()
+        rest = group_view(df, 'REST', c)['time_ms'].mean()
+        gql = group_view(df, 'GraphQL', c)['time_ms'].mean()
         diff_time.append(((rest - gql) / rest) * 100)
     
     colors_diff = ['green' if d > 0 else 'red' for d in diff_time]
@@ -330,8 +361,8 @@ def plot_summary(df):
     # 4. Diferença percentual por complexidade - Tamanho
     diff_size = []
     for c in complexities:
-        rest = df[(df['api_type'] == 'REST') & (df['complexity'] == c)]['size_bytes'].mean()
-        gql = df[(df['api_type'] == 'GraphQL') & (df['complexity'] == c)]['size_bytes'].mean()
+        rest = group_view(df, 'REST', c)['size_bytes'].mean()
+        gql = group_view(df, 'GraphQL', c)['size_bytes'].mean()
         diff_size.append(((rest - gql) / rest) * 100)
     
     colors_diff2 = ['green' if d > 0 else 'red' for d in diff_size]
@@ -355,6 +386,8 @@ def plot_summary(df):
 
 def create_summary_table(df):
     """Cria tabela resumo visual"""
+    from dados import group_view
+    plt, sns = setup_style()
     fig, ax = plt.subplots(figsize=(14, 8))
     ax.axis('off')
     
@@ -362,7 +395,7 @@ def create_summary_table(df):
     summary_data = []
     for api in ['REST', 'GraphQL']:
         for comp in ['simple', 'medium', 'complex']:
-            subset = df[(df['api_type'] == api) & (df['complexity'] == comp)]
+            subset = group_view(df, api, comp)
             summary_data.append([
                 api,
                 comp.capitalize(),
@@ -404,6 +437,115 @@ def create_summary_table(df):
     plt.close()
     print(f"Salvo: {filepath}")
 
+# ============================================
+# GRÁFICO 9: CURVAS DE PERCENTIS (SKETCHES)
+# ============================================
+
+def plot_percentiles(df):
+    """Curvas de percentis por complexidade a partir dos sketches de quantis dos dados limpos"""
+    import numpy as np
+    plt, sns = setup_style()
+    sketches = sketches_from_dataframe(df)
+    quantiles = np.linspace(0.01, 0.99, 99)
+    
+    fig, axes = plt.subplots(2, 3, figsize=(18, 10))
+    for row, (metric, label) in enumerate([('time_ms', 'Tempo (ms)'), ('size_bytes', 'Tamanho (bytes)')]):
+        rolled = rollup(sketches, metric, by=('complexity', 'api_type'))
+        for col, comp in enumerate(['simple', 'medium', 'complex']):
+            ax = axes[row, col]
+            for api in ['REST', 'GraphQL']:
+                sketch = rolled.get((comp, api))
+                if sketch is None:
+                    continue
+                values = [sketch_quantile(sketch, q) for q in quantiles]
+                ax.plot(quantiles * 100, values, color=COLORS[api], label=api, linewidth=2)
+            ax.set_title(f'{label.split(" ")[0]} - {comp.capitalize()}', fontweight='bold')
+            ax.set_xlabel('Percentil')
+            ax.set_ylabel(label)
+            ax.legend(title='API')
+    
+    plt.suptitle('Curvas de Percentis por Complexidade', fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    filepath = os.path.join(OUTPUT_DIR, '09_percentis.png')
+    plt.savefig(filepath, bbox_inches='tight')
+    plt.close()
+    print(f"Salvo: {filepath}")
+
+# ============================================
+# GRÁFICO 10: CASCATA E COMPOSIÇÃO DA LATÊNCIA (SUB-REQUISIÇÕES)
+# ============================================
+
+def plot_subrequests(df):
+    """Cascata da medição mediana e composição média da latência por complexidade"""
+    from subrequisicoes import (SUBREQUEST_FILE, latency_composition, load_subrequests, matching_runs,
+                                median_requests)
+    filepath = os.path.join(INPUT_DIR, SUBREQUEST_FILE)
+    if not os.path.exists(filepath):
+        print(f"Tabela de sub-requisições não encontrada ({filepath}); gráfico 10 ignorado.")
+        return
+    timings = load_subrequests(filepath)
+    if not matching_runs(timings, df):
+        print(f"Tabela de sub-requisições de outra execução ({filepath}); gráfico 10 ignorado.")
+        return
+    plt, sns = setup_style()
+    calls = timings[timings['kind'] == 'call']
+    composition = latency_composition(timings, df)
+    medians = median_requests(df)
+    palette = dict(zip(composition.columns, sns.color_palette('tab20', len(composition.columns))))
+    complexities = list(df['complexity'].unique())
+    
+    fig, axes = plt.subplots(2, len(complexities), figsize=(6 * len(complexities), 11), squeeze=False)
+    for col, comp in enumerate(complexities):
+        # Cascata (Gantt): cada sub-requisição da medição mais próxima da mediana
+        ax = axes[0, col]
+        ticks = []
+        for api in ['REST', 'GraphQL']:
+            key = medians.get((comp, api))
+            if key is None:
+                continue
+            run_id, request_id = key
+            for _, call in calls[(calls['run_id'] == run_id) & (calls['request_id'] == request_id)].iterrows():
+                ax.barh(len(ticks), call['duration_ms'], left=call['start_ms'], color=COLORS[api],
+                        edgecolor='white')
+                ticks.append(f"{api}: {call['label']}")
+        ax.set_yticks(range(len(ticks)))
+        ax.set_yticklabels(ticks, fontsize=9)
+        ax.invert_yaxis()
+        ax.set_title(f'Cascata da Medição Mediana - {comp}', fontweight='bold')
+        ax.set_xlabel('Tempo desde o início da medição (ms)')
+        
+        # Composição média: endpoints (REST) e fases/resolvedores (GraphQL)
+        ax = axes[1, col]
+        apis = [api for api in ['REST', 'GraphQL'] if (comp, api) in composition.index]
+        for i, api in enumerate(apis):
+            values = composition.loc[(comp, api)]
+            bottom = 0.0
+            for component, value in values[values > 0].items():
+                ax.bar(i, value, bottom=bottom, color=palette[component], label=component,
+                       edgecolor='white', width=0.6)
+                bottom += value
+        handles, labels = ax.get_legend_handles_labels()
+        unique = dict(zip(labels, handles))
+        ax.legend(unique.values(), unique.keys(), fontsize=8, title='Componente')
+        ax.set_xticks(range(len(apis)))
+        ax.set_xticklabels(apis)
+        ax.set_title(f'Composição da Latência - {comp}', fontweight='bold')
+        ax.set_ylabel('Tempo médio (ms)')
+    
+    plt.suptitle('Sub-requisições: Cascata e Composição da Latência', fontsize=16, fontweight='bold', y=1.02)
+    plt.tight_layout()
+    filepath = os.path.join(OUTPUT_DIR, '10_subrequisicoes.png')
+    plt.savefig(filepath, bbox_inches='tight')
+    plt.close()
+    print(f"Salvo: {filepath}")
+
+def expected_charts():
+    """Gráficos que generate_dashboard produz com as tabelas disponíveis"""
+    from subrequisicoes import SUBREQUEST_FILE
+    if os.path.exists(os.path.join(INPUT_DIR, SUBREQUEST_FILE)):
+        return CHART_FILES
+    return [name for name in CHART_FILES if name != '10_subrequisicoes.png']
+
 # ============================================
 # GERAR DASHBOARD COMPLETO
 # ============================================
@@ -422,19 +564,15 @@ def generate_dashboard(df):
     plot_heatmap(df)
     plot_summary(df)
     create_summary_table(df)
+    plot_percentiles(df)
+    plot_subrequests(df)
     
     print("\n" + "=" * 60)
     print("DASHBOARD GERADO COM SUCESSO!")
     print("=" * 60)
     print(f"\nArquivos salvos em: {OUTPUT_DIR}/")
-    print("  - 01_tempo_boxplot.png")
-    print("  - 02_tamanho_boxplot.png")
-    print("  - 03_distribuicoes.png")
-    print("  - 04_barras_ic95.png")
-    print("  - 05_violin.png")
-    print("  - 06_heatmap.png")
-    print("  - 07_resumo_comparativo.png")
-    print("  - 08_tabela_resumo.png")
+    for name in expected_charts():
+        print(f"  - {name}")
 
 # ============================================
 # MAIN
@@ -447,5 +585,7 @@ if __name__ == "__main__":
     print("=" * 60 + "\n")
     
     setup_output_dir()
+    from limpeza import clean_data
     df = load_data()
+    df, _ = clean_data(df)
     generate_dashboard(df)
\ No newline at end of file
@@ -10,98 +10,445 @@ import json
 import csv
 import random
 import os
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from functools import lru_cache, partial
+from itertools import count as id_counter
 
+from quantis import SKETCH_FILE, save_sketches, update_group_sketches
+from instrumentacao import (REPORT_FILE, count, harness_report, phase, record,
+                             save_report, start_profiling, stop_profiling)
+from sequencial import cell_decision, obrien_fleming_constant, z_to_p
+from aproveitamento import BODY_FILE_PATTERN, CONSUMED_FIELDS, extract_fields
+from aninhadas import (NESTED_DEPTHS, NESTED_WIDTH, graphql_nested_query, rest_children, rest_level_urls,
+                       rest_request_count)
+from recursos import RESOURCES_FILE, SAMPLE_INTERVAL, save_samples, start_sampler, stop_sampler
+from backends import auth_headers, load_backend
+import volume
+from volume import parse_volume, scale_page, scale_query, volume_repos
+from calibracao import (CALIBRATION_FILE, calibrate, clock_ns, finish, overhead_ms, print_calibration,
+                        save_calibration)
+from subrequisicoes import SUBREQUEST_FILE, record_calls, save_subrequests
+import servidor_local
+
+
+# Backend das APIs (backends.py): "github", "local" (servidor_local.py, sobe
+# automaticamente) ou o nome de um módulo-plugin que define um dicionário BACKEND
+BACKEND = "github"
+API = load_backend(BACKEND)
+BACKEND_HANDLE = None  # Devolvido por API["start"], repassado a API["stop"]
 
 # Gere seu token em: https://github.com/settings/tokens
 GITHUB_TOKEN = "TOKEN"
 
 # Headers para as requisições
-HEADERS_REST = {
-    "Authorization": f"token {GITHUB_TOKEN}",
-    "Accept": "application/vnd.github.v3+json",
-    "Cache-Control": "no-cache"
-}
-
-HEADERS_GRAPHQL = {
-    "Authorization": f"bearer {GITHUB_TOKEN}",
-    "Content-Type": "application/json",
-    "Cache-Control": "no-cache"
-}
+HEADERS_REST = auth_headers(API["headers_rest"], GITHUB_TOKEN)
+HEADERS_GRAPHQL = auth_headers(API["headers_graphql"], GITHUB_TOKEN)
 
 # URLs das APIs
-REST_URL = "https://api.github.com"
-GRAPHQL_URL = "https://api.github.com/graphql"
+REST_URL = API["rest_url"]
+GRAPHQL_URL = API["graphql_url"]
 
 # Repositórios para teste (owner/repo)
-REPOS = [
-    ("facebook", "react"),
-    ("microsoft", "vscode"),
-    ("tensorflow", "tensorflow"),
-    ("torvalds", "linux"),
-    ("django", "django"),
-    ("python", "cpython"),
-    ("nodejs", "node"),
-    ("kubernetes", "kubernetes"),
-    ("angular", "angular"),
-    ("vuejs", "vue")
-]
+REPOS = API["repos"]
+
+# Protocolo de transporte
+# "HTTP/1.1": requests.Session (conexões mantidas no pool), sub-requisições em sequência
+# "HTTP/2": httpx (opcional: pip install "httpx[http2]"), uma conexão reutilizada
+#           em que as sub-requisições REST são multiplexadas em paralelo
+PROTOCOL = "HTTP/1.1"
+HTTP2_MULTIPLEX = True   # False = sub-requisições REST em sequência mesmo em HTTP/2
+MULTIPLEX_WORKERS = 128  # Threads do pool de multiplexação (acima do maior lote aninhado)
 
 # Configurações do experimento
 NUM_EXECUTIONS = 100  # Número de repetições por tratamento
 WARMUP_RUNS = 5       # Requisições de aquecimento (descartadas)
 OUTPUT_DIR = "results"  # Pasta para salvar resultados
 
+# Modo adaptativo (teste sequencial por célula complexity x repository)
+ADAPTIVE = False       # True = parar células cuja diferença já é decisiva
+SEQ_BATCH = 10         # Medições por API em cada rodada de uma célula
+SEQ_MAX_PER_CELL = 300  # Teto de medições por API em uma célula
+SEQ_ALPHA = 0.05       # Nível de significância global de cada célula
+SEQUENTIAL_FILE = "sequential_decisions.csv"
+
+# Sondas de linha de base (RTT) intercaladas com o plano aleatorizado
+BASELINE_URL = API["baseline_url"]  # Raiz da API: resposta mínima do mesmo host
+BASELINE_EVERY = 20            # Uma sonda a cada N medições (0 = desativado)
+BASELINE_FILE = "baseline_rtt.csv"
+BASELINE_FIELDS = ["timestamp", "rtt_ms", "status", "source"]
+BASELINE_SAMPLES = []
+
+# Captura dos corpos das respostas (para aproveitamento.py)
+CAPTURE_BODIES = False         # True = salvar cada corpo em BODIES_DIR
+BODIES_DIR = "results/bodies"  # Arquivos {request_id}_{índice}_{rótulo}.json
+REQUEST_IDS = id_counter(1)    # Identificador sequencial de cada medição
+RUN_ID = datetime.now().strftime("%Y%m%d-%H%M%S")  # Execução: liga as linhas às tabelas laterais
+
+# Custo de desserialização no cliente (coluna parse_ms)
+PARSE_BODIES = False  # True = decodificar o JSON e extrair os campos usados
+JSON_PARSER = "json"  # "json" (biblioteca padrão) ou "orjson" (opcional, mais rápido)
+
+# Consultas aninhadas (aninhadas.py): substitui os tratamentos simple/medium/complex
+# por níveis de profundidade "depth-N" (GraphQL aninhado vs REST com expansão N+1)
+NESTED_MODE = False
+
+# Requisições condicionais REST (ETag / If-None-Match): o ETag de cada URL é
+# guardado e as repetições recebem 304 sem corpo enquanto o recurso não mudar.
+# GraphQL (POST) não tem equivalente e segue sempre sem cache.
+CONDITIONAL_REQUESTS = False
+ETAG_CACHE = {}  # URL -> (ETag, corpo)
+
+# Varredura de volume de dados (volume.py, só backends com "volume", ex.: "local"):
+# os repositórios passam a ser os pontos de volume (issues, contribuidores,
+# branches, tamanho do texto) e cada linha registra o ponto, o PAGE_SCALE e se
+# as páginas das listas seguem os eixos (AXIS_PAGES em volume.py)
+VOLUME_MODE = False
+
+# Timeouts e novas tentativas de cada sub-requisição. As esperas entre
+# tentativas (backoff exponencial com jitter) ficam dentro do tempo medido:
+# é o custo que um cliente real paga, e aparece na cauda da latência (a soma
+# das esperas de cada medição vai para a coluna backoff_ms).
+REQUEST_TIMEOUT = 30.0                    # Segundos por tentativa (conexão e leitura)
+MAX_RETRIES = 2                           # Novas tentativas após a primeira (0 = desativado)
+RETRY_BACKOFF = 0.5                       # Espera base (s), dobrada a cada tentativa
+RETRY_MAX_BACKOFF = 8.0                   # Teto da espera (s)
+RETRY_STATUS = [429, 500, 502, 503, 504]  # Status repetidos
+RETRY_ERRORS = ["timeout", "connection"]  # Classes de erro de transporte repetidas
+
+# Calibração (calibracao.py): resolução e custo do relógio são sempre medidos;
+# com CALIBRATE, também o piso do harness (requisição no-op no servidor local,
+# que sobe se preciso), subtraído de time_ms na coluna time_net_ms
+CALIBRATE = False
+CALIBRATION = None
+
+# Tempos de cada sub-requisição (subrequisicoes.py): tabela lateral em formato
+# longo ligada às medições por (run_id, request_id), com as fases do Server-Timing
+SUBREQUEST_TIMINGS = True
+
+# Amostragem de recursos do cliente (CPU, RSS, sockets, rede) em segundo plano
+SAMPLE_RESOURCES = False
+
+# Profiling opcional do harness
+PROFILE_CPU = False     # cProfile durante a execução
+PROFILE_MEMORY = False  # tracemalloc durante a execução
+
+# Configuração registrada ao lado dos resultados (lida pelo relatório e pelo histórico)
+RUN_CONFIG_FILE = "run_config.json"
+RUN_CONFIG_FIELDS = ["RUN_ID", "BACKEND", "NUM_EXECUTIONS", "WARMUP_RUNS", "ADAPTIVE", "PROTOCOL", "HTTP2_MULTIPLEX",
+                     "NESTED_MODE", "VOLUME_MODE", "CONDITIONAL_REQUESTS", "PARSE_BODIES", "JSON_PARSER",
+                     "REQUEST_TIMEOUT", "MAX_RETRIES", "CALIBRATE", "BASELINE_EVERY", "SAMPLE_RESOURCES"]
+VOLUME_CONFIG_FIELDS = ["PAGE_SCALE", "AXIS_PAGES"]  # Lidos de volume.py no momento do registro
+
+# ============================================
+# TRANSPORTE (HTTP/1.1 OU HTTP/2)
+# ============================================
+
+@lru_cache(maxsize=None)
+def http_client(protocol):
+    """Cliente com get/post/head: requests.Session (HTTP/1.1) ou httpx.Client HTTP/2"""
+    if protocol == "HTTP/2":
+        try:
+            import httpx
+            return httpx.Client(http2=True, timeout=REQUEST_TIMEOUT)
+        except ImportError:
+            print("ERRO: HTTP/2 requer httpx com suporte a h2: pip install \"httpx[http2]\"")
+            exit(1)
+    return requests.Session()
+
+@lru_cache(maxsize=None)
+def multiplex_pool():
+    """Pool de threads das sub-requisições multiplexadas, criado uma vez (fora do tempo medido)"""
+    return ThreadPoolExecutor(max_workers=MULTIPLEX_WORKERS)
+
+def parallel(n):
+    """True se get_all envia n URLs em paralelo (PROTOCOL HTTP/2 com HTTP2_MULTIPLEX)"""
+    return PROTOCOL == "HTTP/2" and HTTP2_MULTIPLEX and n > 1
+
+def multiplexed(responses):
+    """True se as respostas vieram em paralelo e todas em HTTP/2 negociado
+
+    Um servidor só HTTP/1.1 (ex.: servidor_local) faz o httpx abrir conexões
+    HTTP/1.1 paralelas: o lote é paralelo, mas não multiplexado.
+    """
+    return parallel(len(responses)) and all(http_version(r) == "HTTP/2" for r in responses)
+
+def http_version(response):
+    """Protocolo efetivamente negociado na resposta"""
+    if hasattr(response, "http_version"):
+        return response.http_version
+    return {10: "HTTP/1.0", 11: "HTTP/1.1"}.get(getattr(response.raw, "version", 11), "HTTP/1.1")
+
+def get_all(urls, headers):
+    """GET de várias URLs (headers por URL): multiplexadas em HTTP/2, senão em sequência"""
+    if parallel(len(urls)):
+        return list(multiplex_pool().map(lambda pair: send("get", *pair), zip(urls, headers)))
+    return [send("get", url, h) for url, h in zip(urls, headers)]
+
+def sequential_rounds(n):
+    """Rodadas de requisição em sequência que get_all faz para n URLs"""
+    return 1 if parallel(n) else n
+
+# ============================================
+# ERROS E NOVAS TENTATIVAS
+# ============================================
+
+def error_class(response=None, exception=None):
+    """Classe do erro de uma resposta ou exceção ("" se não houve erro)"""
+    if exception is not None:
+        name = type(exception).__name__
+        if "Timeout" in name:
+            return "timeout"
+        if "Connect" in name or isinstance(exception, ConnectionError):
+            return "connection"
+        return "exception"
+    status = response.status_code
+    if status == 429 or (status == 403 and response.headers.get("X-RateLimit-Remaining") == "0"):
+        return "rate_limited"
+    if status >= 500:
+        return "http_5xx"
+    if status >= 400:
+        return "http_4xx"
+    return ""
+
+def retry_delay(attempt):
+    """Espera antes da tentativa seguinte: backoff exponencial com jitter completo"""
+    return random.uniform(0, min(RETRY_MAX_BACKOFF, RETRY_BACKOFF * 2 ** (attempt - 1)))
+
+def send(method, url, headers, **kwargs):
+    """Requisição com até MAX_RETRIES novas tentativas em RETRY_STATUS e RETRY_ERRORS
+
+    A resposta final (ou a exceção da última tentativa) leva o número de
+    tentativas no atributo `attempts` e o tempo de espera entre elas em
+    `backoff_ns`; a resposta, também os instantes start_ns / end_ns da
+    primeira e da última tentativa.
+    """
+    client = http_client(PROTOCOL)
+    start = clock_ns()
+    waited = 0
+    for attempt in range(1, MAX_RETRIES + 2):
+        try:
+            response = getattr(client, method)(url, headers=headers, timeout=REQUEST_TIMEOUT, **kwargs)
+        except Exception as e:
+            if attempt > MAX_RETRIES or error_class(exception=e) not in RETRY_ERRORS:
+                e.attempts, e.backoff_ns = attempt, waited
+                raise
+        else:
+            if attempt > MAX_RETRIES or response.status_code not in RETRY_STATUS:
+                response.attempts, response.backoff_ns = attempt, waited
+                response.start_ns, response.end_ns = start, clock_ns()
+                return response
+        count("retries")
+        pause = clock_ns()
+        time.sleep(retry_delay(attempt))
+        waited += clock_ns() - pause
+
+def graphql_errors(response):
+    """True se o corpo GraphQL traz `errors` (o GraphQL responde 200 mesmo com erros)"""
+    if b'"errors"' not in response.content:
+        return False
+    try:
+        body = response.json()
+    except ValueError:
+        return False
+    return isinstance(body, dict) and bool(body.get("errors"))
+
+def span_ms(responses):
+    """Tempo (ms) com alguma sub-requisição em andamento: união dos intervalos start_ns/end_ns
+
+    Em get_all multiplexado as chamadas se sobrepõem; a soma das durações
+    passaria do tempo de parede e o custo do cliente ficaria negativo.
+    """
+    total, reach = 0, None
+    for start, end in sorted((r.start_ns, r.end_ns) for r in responses):
+        if reach is None or start > reach:
+            total += end - start
+        elif end > reach:
+            total += end - reach
+        reach = end if reach is None else max(reach, end)
+    return total / 1e6
+
+def response_summary(responses, graphql=False):
+    """Status de todas as sub-requisições, tentativas, classe do primeiro erro e tempos
+
+    `status` é o da primeira sub-requisição com erro ou, sem erros, o da
+    primeira. Com `graphql`, um corpo com `errors` conta como erro "graphql".
+    `span_ms` é a união dos intervalos das sub-requisições (span_ms()) e
+    `backoff_ms`, a soma das esperas entre novas tentativas.
+    """
+    classes = [error_class(r) or ("graphql" if graphql and graphql_errors(r) else "") for r in responses]
+    index = next((i for i, name in enumerate(classes) if name), 0)
+    return {
+        "status": responses[index].status_code,
+        "statuses": [r.status_code for r in responses],
+        "attempts": sum(getattr(r, "attempts", 1) for r in responses),
+        "error_class": classes[index],
+        "span_ms": span_ms(responses),
+        "backoff_ms": sum(getattr(r, "backoff_ns", 0) for r in responses) / 1e6
+    }
+
+def call_timings(labels, responses):
+    """(rótulo, início, fim, status, bytes, tentativas, Server-Timing) de cada sub-requisição"""
+    return [(label, r.start_ns, r.end_ns, r.status_code, len(r.content), r.attempts,
+             r.headers.get("Server-Timing", "")) for label, r in zip(labels, responses)]
+
+def failure_result(exception, start, end, depth=0):
+    """Resultado de uma medição interrompida por exceção: tempo até a falha, sem corpo"""
+    return {
+        "time_ms": (end - start) / 1e6,
+        "start_ns": start,
+        "end_ns": end,
+        "rounds": 1,
+        "size_bytes": 0,
+        "status": 0,
+        "statuses": [],
+        "attempts": getattr(exception, "attempts", 1),
+        "error_class": error_class(exception=exception),
+        "span_ms": (end - start) / 1e6,
+        "backoff_ms": getattr(exception, "backoff_ns", 0) / 1e6,
+        "bodies": [],
+        "calls": [],
+        "protocol": PROTOCOL,
+        "depth": depth,
+        "requests": 0
+    }
+
+# ============================================
+# BACKEND (URLS E CONSULTAS)
+# ============================================
+
+def rest_url(label, owner, repo, per_page=None):
+    """URL REST do rótulo (repo, issues, contributors, branches) no backend ativo"""
+    return REST_URL + API["rest_paths"][label].format(owner=owner, repo=repo, per_page=per_page)
+
+def start_backend():
+    """Sobe o serviço do backend, se ele tiver um (ex.: servidor local)"""
+    global BACKEND_HANDLE
+    if "start" in API:
+        BACKEND_HANDLE = API["start"]()
+
+def stop_backend():
+    """Encerra o serviço iniciado por start_backend"""
+    global BACKEND_HANDLE
+    if "stop" in API:
+        API["stop"](BACKEND_HANDLE)
+        BACKEND_HANDLE = None
+
+# ============================================
+# REQUISIÇÕES CONDICIONAIS (ETag / If-None-Match)
+# ============================================
+
+def conditional_headers(urls):
+    """Headers REST de cada URL, com If-None-Match quando já há ETag guardado"""
+    if not CONDITIONAL_REQUESTS:
+        return [HEADERS_REST] * len(urls)
+    return [{**HEADERS_REST, "If-None-Match": ETAG_CACHE[url][0]} if url in ETAG_CACHE else HEADERS_REST
+            for url in urls]
+
+def revalidate(urls, responses):
+    """Corpos efetivos (o guardado em caso de 304), bytes economizados e número de 304
+
+    Fica fora do trecho cronometrado: guardar ETags é contabilidade do cliente.
+    """
+    contents, saved, not_modified = [], 0, 0
+    for url, response in zip(urls, responses):
+        if response.status_code == 304 and url in ETAG_CACHE:
+            content = ETAG_CACHE[url][1]
+            saved += len(content)
+            not_modified += 1
+        else:
+            content = response.content
+            etag = response.headers.get("ETag")
+            if CONDITIONAL_REQUESTS and etag and response.status_code == 200:
+                ETAG_CACHE[url] = (etag, content)
+        contents.append(content)
+    return contents, saved, not_modified
+
 # ============================================
 # FUNÇÕES DE CONSULTA REST
 # ============================================
 
 def rest_simple(owner, repo):
     """Consulta simples: dados básicos do repositório"""
-    url = f"{REST_URL}/repos/{owner}/{repo}"
-    start = time.perf_counter()
-    response = requests.get(url, headers=HEADERS_REST)
-    end = time.perf_counter()
+    urls = [rest_url("repo", owner, repo)]
+    headers = conditional_headers(urls)
+    start = clock_ns()
+    response, = get_all(urls, headers)
+    end = clock_ns()
+    contents, saved, not_modified = revalidate(urls, [response])
     return {
-        "time_ms": (end - start) * 1000,
+        "time_ms": (end - start) / 1e6,
+        "start_ns": start,
+        "end_ns": end,
+        "rounds": 1,
         "size_bytes": len(response.content),
-        "status": response.status_code
+        **response_summary([response]),
+        "bodies": [("repo", contents[0])],
+        "calls": call_timings(["repo"], [response]),
+        "protocol": http_version(response),
+        "bytes_saved": saved,
+        "not_modified": not_modified
     }
 
 def rest_medium(owner, repo):
     """Consulta média: repositório + últimos 10 issues"""
-    url_repo = f"{REST_URL}/repos/{owner}/{repo}"
-    url_issues = f"{REST_URL}/repos/{owner}/{repo}/issues?per_page=10&state=all"
+    url_repo = rest_url("repo", owner, repo)
+    url_issues = rest_url("issues", owner, repo, per_page=scale_page(10, "issues", repo))
+    headers = conditional_headers([url_repo, url_issues])
     
-    start = time.perf_counter()
-    r1 = requests.get(url_repo, headers=HEADERS_REST)
-    r2 = requests.get(url_issues, headers=HEADERS_REST)
-    end = time.perf_counter()
+    start = clock_ns()
+    r1, r2 = get_all([url_repo, url_issues], headers)
+    end = clock_ns()
     
+    contents, saved, not_modified = revalidate([url_repo, url_issues], [r1, r2])
     return {
-        "time_ms": (end - start) * 1000,
+        "time_ms": (end - start) / 1e6,
+        "start_ns": start,
+        "end_ns": end,
+        "rounds": sequential_rounds(2),
+        "parallel": parallel(2),
+        "multiplexed": multiplexed([r1, r2]),
         "size_bytes": len(r1.content) + len(r2.content),
-        "status": r1.status_code
+        **response_summary([r1, r2]),
+        "bodies": list(zip(["repo", "issues"], contents)),
+        "calls": call_timings(["repo", "issues"], [r1, r2]),
+        "protocol": http_version(r1),
+        "bytes_saved": saved,
+        "not_modified": not_modified
     }
 
 def rest_complex(owner, repo):
     """Consulta complexa: repo + issues + contributors + branches"""
+    labels = ["repo", "issues", "contributors", "branches"]
     urls = [
-        f"{REST_URL}/repos/{owner}/{repo}",
-        f"{REST_URL}/repos/{owner}/{repo}/issues?per_page=5&state=all",
-        f"{REST_URL}/repos/{owner}/{repo}/contributors?per_page=5",
-        f"{REST_URL}/repos/{owner}/{repo}/branches?per_page=5"
+        rest_url("repo", owner, repo),
+        rest_url("issues", owner, repo, per_page=scale_page(5, "issues", repo)),
+        rest_url("contributors", owner, repo, per_page=scale_page(5, "contributors", repo)),
+        rest_url("branches", owner, repo, per_page=scale_page(5, "branches", repo))
     ]
     
-    start = time.perf_counter()
-    responses = [requests.get(url, headers=HEADERS_REST) for url in urls]
-    end = time.perf_counter()
+    headers = conditional_headers(urls)
+    
+    start = clock_ns()
+    responses = get_all(urls, headers)
+    end = clock_ns()
     
+    contents, saved, not_modified = revalidate(urls, responses)
     total_size = sum(len(r.content) for r in responses)
     return {
-        "time_ms": (end - start) * 1000,
+        "time_ms": (end - start) / 1e6,
+        "start_ns": start,
+        "end_ns": end,
+        "rounds": sequential_rounds(len(urls)),
+        "parallel": parallel(len(urls)),
+        "multiplexed": multiplexed(responses),
         "size_bytes": total_size,
-        "status": responses[0].status_code
+        **response_summary(responses),
+        "bodies": list(zip(labels, contents)),
+        "calls": call_timings(labels, responses),
+        "protocol": http_version(responses[0]),
+        "bytes_saved": saved,
+        "not_modified": not_modified
     }
 
 # ============================================
@@ -110,135 +457,386 @@ def rest_complex(owner, repo):
 
 def graphql_simple(owner, repo):
     """Consulta simples: dados básicos do repositório"""
-    query = """
-    query($owner: String!, $repo: String!) {
-        repository(owner: $owner, name: $repo) {
-            name
-            description
-            stargazerCount
-            forkCount
-            createdAt
-            updatedAt
-            primaryLanguage { name }
-        }
-    }
-    """
+    query = scale_query(API["graphql_queries"]["simple"], repo)
     variables = {"owner": owner, "repo": repo}
     
-    start = time.perf_counter()
-    response = requests.post(
-        GRAPHQL_URL,
-        headers=HEADERS_GRAPHQL,
-        json={"query": query, "variables": variables}
-    )
-    end = time.perf_counter()
+    start = clock_ns()
+    response = send("post", GRAPHQL_URL, HEADERS_GRAPHQL, json={"query": query, "variables": variables})
+    end = clock_ns()
     
     return {
-        "time_ms": (end - start) * 1000,
+        "time_ms": (end - start) / 1e6,
+        "start_ns": start,
+        "end_ns": end,
+        "rounds": 1,
         "size_bytes": len(response.content),
-        "status": response.status_code
+        **response_summary([response], graphql=True),
+        "bodies": [("graphql", response.content)],
+        "calls": call_timings(["graphql"], [response]),
+        "protocol": http_version(response)
     }
 
 def graphql_medium(owner, repo):
     """Consulta média: repositório + últimos 10 issues"""
-    query = """
-    query($owner: String!, $repo: String!) {
-        repository(owner: $owner, name: $repo) {
-            name
-            description
-            stargazerCount
-            forkCount
-            issues(first: 10, orderBy: {field: CREATED_AT, direction: DESC}) {
-                nodes {
-                    title
-                    state
-                    createdAt
-                    author { login }
-                }
-            }
-        }
-    }
-    """
+    query = scale_query(API["graphql_queries"]["medium"], repo)
     variables = {"owner": owner, "repo": repo}
     
-    start = time.perf_counter()
-    response = requests.post(
-        GRAPHQL_URL,
-        headers=HEADERS_GRAPHQL,
-        json={"query": query, "variables": variables}
-    )
-    end = time.perf_counter()
+    start = clock_ns()
+    response = send("post", GRAPHQL_URL, HEADERS_GRAPHQL, json={"query": query, "variables": variables})
+    end = clock_ns()
     
     return {
-        "time_ms": (end - start) * 1000,
+        "time_ms": (end - start) / 1e6,
+        "start_ns": start,
+        "end_ns": end,
+        "rounds": 1,
         "size_bytes": len(response.content),
-        "status": response.status_code
+        **response_summary([response], graphql=True),
+        "bodies": [("graphql", response.content)],
+        "calls": call_timings(["graphql"], [response]),
+        "protocol": http_version(response)
     }
 
 def graphql_complex(owner, repo):
     """Consulta complexa: repo + issues + contributors + branches"""
-    query = """
-    query($owner: String!, $repo: String!) {
-        repository(owner: $owner, name: $repo) {
-            name
-            description
-            stargazerCount
-            forkCount
-            issues(first: 5, orderBy: {field: CREATED_AT, direction: DESC}) {
-                nodes { title state createdAt }
-            }
-            mentionableUsers(first: 5) {
-                nodes { login name }
-            }
-            refs(refPrefix: "refs/heads/", first: 5) {
-                nodes { name }
-            }
-        }
+    query = scale_query(API["graphql_queries"]["complex"], repo)
+    variables = {"owner": owner, "repo": repo}
+    
+    start = clock_ns()
+    response = send("post", GRAPHQL_URL, HEADERS_GRAPHQL, json={"query": query, "variables": variables})
+    end = clock_ns()
+    
+    return {
+        "time_ms": (end - start) / 1e6,
+        "start_ns": start,
+        "end_ns": end,
+        "rounds": 1,
+        "size_bytes": len(response.content),
+        **response_summary([response], graphql=True),
+        "bodies": [("graphql", response.content)],
+        "calls": call_timings(["graphql"], [response]),
+        "protocol": http_version(response)
     }
-    """
+
+# ============================================
+# CONSULTAS ANINHADAS (PROFUNDIDADE x LARGURA)
+# ============================================
+
+def rest_nested(owner, repo, depth, width=NESTED_WIDTH):
+    """Equivalente REST da consulta aninhada: um lote de chamadas por nível (N+1)"""
+    responses, labels = [], []
+    
+    start = clock_ns()
+    # Repositório e primeiro nível só dependem de owner/repo: mesmo lote
+    levels = API["nesting_levels"]
+    urls = [rest_url("repo", owner, repo)] + rest_level_urls(0, [], owner, repo, REST_URL, width, levels)
+    batch = get_all(urls, [HEADERS_REST] * len(urls))
+    rounds = sequential_rounds(len(urls))
+    concurrent, muxed = parallel(len(urls)), multiplexed(batch)
+    parents = [item for r in batch[1:] if r.status_code < 400 for item in rest_children(r.json(), width)]
+    responses += batch
+    labels += ["repo"] + [levels[0]["name"]] * (len(urls) - 1)
+    for level in range(1, depth):
+        urls = rest_level_urls(level, parents, owner, repo, REST_URL, width, levels)
+        if not urls:
+            break
+        batch = get_all(urls, [HEADERS_REST] * len(urls))
+        rounds += sequential_rounds(len(urls))
+        concurrent, muxed = concurrent or parallel(len(urls)), muxed or multiplexed(batch)
+        parents = [item for r in batch if r.status_code < 400 for item in rest_children(r.json(), width)]
+        responses += batch
+        labels += [levels[level]["name"]] * len(urls)
+    end = clock_ns()
+    
+    return {
+        "time_ms": (end - start) / 1e6,
+        "start_ns": start,
+        "end_ns": end,
+        "rounds": rounds,
+        "parallel": concurrent,
+        "multiplexed": muxed,
+        "size_bytes": sum(len(r.content) for r in responses),
+        **response_summary(responses),
+        "bodies": [],
+        "calls": call_timings(labels, responses),
+        "protocol": http_version(responses[0]),
+        "depth": depth,
+        "requests": len(responses)
+    }
+
+def graphql_nested(owner, repo, depth, width=NESTED_WIDTH):
+    """Consulta GraphQL aninhada com `depth` níveis em uma única requisição"""
+    query = graphql_nested_query(depth, width, API["nesting_levels"], API["nested_query"])
     variables = {"owner": owner, "repo": repo}
     
-    start = time.perf_counter()
-    response = requests.post(
-        GRAPHQL_URL,
-        headers=HEADERS_GRAPHQL,
-        json={"query": query, "variables": variables}
-    )
-    end = time.perf_counter()
+    start = clock_ns()
+    response = send("post", GRAPHQL_URL, HEADERS_GRAPHQL, json={"query": query, "variables": variables})
+    end = clock_ns()
     
     return {
-        "time_ms": (end - start) * 1000,
+        "time_ms": (end - start) / 1e6,
+        "start_ns": start,
+        "end_ns": end,
+        "rounds": 1,
         "size_bytes": len(response.content),
-        "status": response.status_code
+        **response_summary([response], graphql=True),
+        "bodies": [],
+        "calls": call_timings(["graphql"], [response]),
+        "protocol": http_version(response),
+        "depth": depth,
+        "requests": 1
     }
 
+def nested_treatments(depths=NESTED_DEPTHS, width=NESTED_WIDTH):
+    """Tratamentos (api_type, "depth-N", função) para cada profundidade"""
+    treatments = []
+    for depth in depths:
+        treatments.append(("REST", f"depth-{depth}", partial(rest_nested, depth=depth, width=width)))
+        treatments.append(("GraphQL", f"depth-{depth}", partial(graphql_nested, depth=depth, width=width)))
+    return treatments
+
+# ============================================
+# SONDAS DE LINHA DE BASE (RTT)
+# ============================================
+
+def baseline_probe(source="probe"):
+    """Requisição mínima (HEAD na raiz da API) para estimar o RTT da rede"""
+    try:
+        with phase("baseline_probe"):
+            start = time.perf_counter()
+            response = http_client(PROTOCOL).head(BASELINE_URL, headers=HEADERS_REST,
+                                                  timeout=REQUEST_TIMEOUT)
+            end = time.perf_counter()
+        BASELINE_SAMPLES.append({
+            "timestamp": datetime.now().isoformat(),
+            "rtt_ms": round((end - start) * 1000, 2),
+            "status": response.status_code,
+            "source": source
+        })
+    except Exception as e:
+        print(f"Erro na sonda de linha de base: {e}")
+
+def maybe_probe(current):
+    """Intercala uma sonda a cada BASELINE_EVERY medições"""
+    if BASELINE_EVERY and current % BASELINE_EVERY == 0:
+        baseline_probe()
+
+# ============================================
+# CALIBRAÇÃO DO RELÓGIO E DO HARNESS
+# ============================================
+
+def run_calibration():
+    """Calibração com o piso do harness: GET /noop no servidor local pelo caminho das medições"""
+    process = servidor_local.start_process()
+    url = f"http://{servidor_local.HOST}:{servidor_local.PORT}/noop"
+    try:
+        return calibrate(lambda: get_all([url], [{}])[0])
+    finally:
+        servidor_local.stop_process(process)
+
+def start_calibration():
+    """Calibra antes das medições (só o relógio, se CALIBRATE for False)"""
+    global CALIBRATION
+    print("Calibrando relógio" + (" e harness..." if CALIBRATE else "..."))
+    CALIBRATION = run_calibration() if CALIBRATE else calibrate()
+    print_calibration(CALIBRATION)
+    print()
+
 # ============================================
 # EXECUÇÃO DO EXPERIMENTO
 # ============================================
 
+# Tratamentos
+TREATMENTS = [
+    ("REST", "simple", rest_simple),
+    ("GraphQL", "simple", graphql_simple),
+    ("REST", "medium", rest_medium),
+    ("GraphQL", "medium", graphql_medium),
+    ("REST", "complex", rest_complex),
+    ("GraphQL", "complex", graphql_complex)
+]
+
+def active_treatments():
+    """Tratamentos da execução atual (padrão ou consultas aninhadas)"""
+    return nested_treatments() if NESTED_MODE else TREATMENTS
+
+def active_repos():
+    """Objetos experimentais da execução atual (repositórios ou pontos de volume)"""
+    return volume_repos() if VOLUME_MODE else REPOS
+
 def run_warmup():
-    """Executa requisições de aquecimento"""
+    """Executa requisições de aquecimento (que também semeiam a linha de base de RTT)"""
     print("Executando warm-up...")
+    if parallel(2):
+        # Sobe as threads do pool antes das medições
+        list(multiplex_pool().map(time.sleep, [0.01] * MULTIPLEX_WORKERS))
     for _ in range(WARMUP_RUNS):
-        rest_simple("octocat", "Hello-World")
-        graphql_simple("octocat", "Hello-World")
+        rest_simple(*API["warmup_repo"])
+        graphql_simple(*API["warmup_repo"])
+        baseline_probe(source="warmup")
+    if VOLUME_MODE:
+        # Os repositórios de volume são gerados na primeira consulta: fora das medições
+        for owner, repo in active_repos():
+            rest_simple(owner, repo)
     print("Warm-up concluído!\n")
 
-def run_experiment():
-    """Executa o experimento completo"""
-    results = []
+def measure(api_type, complexity, func, owner, repo, run, results, sketches=None):
+    """Executa uma medição e a registra em `results` (e nos sketches, se houver)
+
+    Uma medição que termina em exceção também vira uma linha (status 0, com
+    o tempo até a falha e a classe do erro). Medições com erro (exceção,
+    status >= 400 ou `errors` no GraphQL) ficam fora dos sketches e devolvem None.
+    """
+    request_id = next(REQUEST_IDS)
+    start = clock_ns()
+    try:
+        with phase("request"):
+            result = func(owner, repo)
+    except Exception as e:
+        count("errors")
+        print(f"Erro em {api_type} {complexity} {owner}/{repo}: {e}")
+        result = failure_result(e, start, clock_ns(),
+                                depth=getattr(func, "keywords", {}).get("depth", 0))
+    failed = bool(result["error_class"])
+    count("measurements")
+    if CAPTURE_BODIES:
+        with phase("body_capture"):
+            try:
+                save_bodies(request_id, result["bodies"])
+            except OSError as e:
+                count("body_capture_errors")
+                print(f"Erro ao salvar os corpos da medição {request_id}: {e}")
+    if PARSE_BODIES:
+        with phase("parse"):
+            result["parse_ms"] = parse_bodies(api_type, complexity, result["bodies"])
+    # Parte de time_ms gasta no cliente fora das sub-requisições (as esperas
+    # de backoff ficam dentro delas e vão para backoff_ms)
+    client_ms = result["time_ms"] - result["span_ms"]
+    record("leak:client_overhead", client_ms / 1000)
     
-    # Tratamentos
-    treatments = [
-        ("REST", "simple", rest_simple),
-        ("GraphQL", "simple", graphql_simple),
-        ("REST", "medium", rest_medium),
-        ("GraphQL", "medium", graphql_medium),
-        ("REST", "complex", rest_complex),
-        ("GraphQL", "complex", graphql_complex)
-    ]
+    with phase("timestamp"):
+        timestamp = datetime.now().isoformat()
+    with phase("record"):
+        row = {
+            "timestamp": timestamp,
+            "api_type": api_type,
+            "complexity": complexity,
+            "repository": f"{owner}/{repo}",
+            "execution": run + 1,
+            "time_ms": round(result["time_ms"], 3),
+            "size_bytes": result["size_bytes"],
+            "status": result["status"],
+            "statuses": ";".join(map(str, result["statuses"])),
+            "attempts": result["attempts"],
+            "error_class": result["error_class"],
+            "request_id": request_id,
+            "run_id": RUN_ID,
+            "protocol": result["protocol"],
+            "parallel": result.get("parallel", False),
+            "multiplexed": result.get("multiplexed", False),
+            "client_overhead_ms": round(client_ms, 3),
+            "backoff_ms": round(result["backoff_ms"], 3),
+            "start_ns": result["start_ns"],
+            "end_ns": result["end_ns"]
+        }
+        if CALIBRATION and "noop" in CALIBRATION:
+            # O custo do cliente é pago por sub-requisição (REST faz até 4, aninhadas mais)
+            row["overhead_ms"] = round(overhead_ms(CALIBRATION, max(len(result["calls"]), 1)), 3)
+            row["time_net_ms"] = round(result["time_ms"] - row["overhead_ms"], 3)  # Sem truncar: < 0 é sinal
+        if VOLUME_MODE:
+            row.update(parse_volume(repo))
+            # Lidos de volume.py, onde scale_page os aplica
+            row["page_scale"] = volume.PAGE_SCALE
+            row["axis_pages"] = volume.AXIS_PAGES
+        if NESTED_MODE:
+            row["depth"] = result["depth"]
+            row["requests"] = result["requests"]
+        if CONDITIONAL_REQUESTS:
+            row["not_modified"] = result.get("not_modified", 0)
+            row["bytes_saved"] = result.get("bytes_saved", 0)
+        if PARSE_BODIES:
+            row["parse_ms"] = round(result["parse_ms"], 3)
+            row["json_parser"] = json_loader(JSON_PARSER)[0]
+        results.append(row)
+        if SUBREQUEST_TIMINGS:
+            record_calls(RUN_ID, request_id, result["start_ns"], result["calls"])
+        if sketches is not None and not failed:
+            update_group_sketches(sketches, api_type, complexity, f"{owner}/{repo}",
+                                  result["time_ms"], result["size_bytes"])
+    
+    # Pequena pausa para evitar rate limiting
+    with phase("sleep"):
+        time.sleep(0.1)
+    return None if failed else result
+
+@lru_cache(maxsize=None)
+def json_loader(name):
+    """(nome do parser usado, função de decodificação); json se orjson não estiver instalado"""
+    if name == "orjson":
+        try:
+            import orjson
+            return "orjson", orjson.loads
+        except ImportError:
+            print("AVISO: orjson não instalado; usando o módulo json")
+    return "json", json.loads
+
+def parse_bodies(api_type, complexity, bodies):
+    """Tempo (ms) para decodificar os corpos e extrair os campos consumidos
+
+    Um corpo vazio ou que não é JSON (ex.: página de erro de um proxy) dá
+    NaN, sem descartar a medição.
+    """
+    _, loads = json_loader(JSON_PARSER)
+    start = time.perf_counter()
+    try:
+        for label, content in bodies:
+            extract_fields(loads(content), CONSUMED_FIELDS.get((api_type, complexity, label), []))
+    except ValueError:
+        count("parse_errors")
+        return float("nan")
+    return (time.perf_counter() - start) * 1000
+
+def reset_bodies():
+    """Remove de BODIES_DIR os corpos de execuções anteriores
+
+    REQUEST_IDS recomeça em 1 a cada execução; sem a limpeza, corpos antigos
+    seriam atribuídos às medições novas de mesmo request_id. Só arquivos no
+    formato {request_id}_{índice}_{rótulo}.json são apagados.
+    """
+    if not os.path.isdir(BODIES_DIR):
+        return
+    removed = 0
+    for name in os.listdir(BODIES_DIR):
+        if BODY_FILE_PATTERN.fullmatch(name):
+            os.remove(os.path.join(BODIES_DIR, name))
+            removed += 1
+    if removed:
+        print(f"Corpos de execuções anteriores removidos: {removed} arquivos em {BODIES_DIR}")
+
+def save_bodies(request_id, bodies):
+    """Salva os corpos de uma medição para a análise de over-fetching"""
+    if not os.path.exists(BODIES_DIR):
+        os.makedirs(BODIES_DIR)
+    for index, (label, content) in enumerate(bodies):
+        filepath = os.path.join(BODIES_DIR, f"{request_id}_{index}_{label}.json")
+        with open(filepath, 'wb') as f:
+            f.write(content)
+
+def run_experiment(sketches=None):
+    """Executa o experimento completo
+
+    Se `sketches` for um dicionário, os sketches de quantis de cada grupo
+    (api_type, complexity, repository) são atualizados a cada medição.
+    """
+    if CAPTURE_BODIES:
+        reset_bodies()
+    if ADAPTIVE:
+        return run_adaptive_experiment(sketches)
     
-    total = len(treatments) * len(REPOS) * NUM_EXECUTIONS
+    results = []
+    treatments = active_treatments()
+    repos = active_repos()
+    total = len(treatments) * len(repos) * NUM_EXECUTIONS
     current = 0
     
     print(f"Iniciando experimento: {total} medições no total\n")
@@ -246,7 +844,7 @@ def run_experiment():
     # Aleatorizar ordem para reduzir viés
     experiment_runs = []
     for api_type, complexity, func in treatments:
-        for owner, repo in REPOS:
+        for owner, repo in repos:
             for run in range(NUM_EXECUTIONS):
                 experiment_runs.append((api_type, complexity, func, owner, repo, run))
     
@@ -254,30 +852,100 @@ def run_experiment():
     
     for api_type, complexity, func, owner, repo, run in experiment_runs:
         current += 1
-        try:
-            result = func(owner, repo)
-            results.append({
-                "timestamp": datetime.now().isoformat(),
-                "api_type": api_type,
-                "complexity": complexity,
-                "repository": f"{owner}/{repo}",
-                "execution": run + 1,
-                "time_ms": round(result["time_ms"], 2),
-                "size_bytes": result["size_bytes"],
-                "status": result["status"]
-            })
+        measure(api_type, complexity, func, owner, repo, run, results, sketches)
+        maybe_probe(current)
+        
+        if current % 100 == 0:
+            print(f"Progresso: {current}/{total} ({100*current/total:.1f}%)")
+    
+    return results
+
+def run_adaptive_experiment(sketches=None):
+    """Executa o experimento com parada antecipada por célula (complexity, repository)
+
+    O orçamento total é o mesmo do modo fixo. A cada rodada, cada célula
+    ainda indecisa recebe SEQ_BATCH medições por API (em ordem aleatória);
+    ao fim da rodada um teste sequencial de O'Brien-Fleming decide se a
+    célula já convergiu. Células encerradas liberam orçamento para as demais.
+    """
+    results = []
+    treatments = active_treatments()
+    repos = active_repos()
+    budget = len(treatments) * len(repos) * NUM_EXECUTIONS
+    max_looks = SEQ_MAX_PER_CELL // SEQ_BATCH
+    constant = obrien_fleming_constant(max_looks, SEQ_ALPHA)
+    current = 0
+    
+    print(f"Iniciando experimento adaptativo: orçamento de {budget} medições")
+    print(f"Fronteira O'Brien-Fleming: C = {constant:.3f} ({max_looks} análises por célula)\n")
+    
+    funcs = {(api_type, complexity): func for api_type, complexity, func in treatments}
+    cells = {}
+    for complexity in dict.fromkeys(complexity for _, complexity, _ in treatments):
+        for owner, repo in repos:
+            cells[(complexity, owner, repo)] = {
+                "times": {"REST": [], "GraphQL": []},
+                "looks": 0,
+                "measured": 0,  # Medições já consideradas na última análise
+                "decision": None,
+                "z": 0.0,
+                "boundary": float('inf'),
+                "active": True
+            }
+    
+    while current < budget and any(cell["active"] for cell in cells.values()):
+        # Plano da rodada: SEQ_BATCH medições por API em cada célula ativa
+        round_runs = []
+        for (complexity, owner, repo), cell in cells.items():
+            if not cell["active"]:
+                continue
+            for api_type in ['REST', 'GraphQL']:
+                done = len(cell["times"][api_type])
+                for run in range(done, done + SEQ_BATCH):
+                    round_runs.append((api_type, complexity, owner, repo, run))
+        random.shuffle(round_runs)
+        
+        for api_type, complexity, owner, repo, run in round_runs:
+            if current >= budget:
+                break
+            current += 1
+            func = funcs[(api_type, complexity)]
+            result = measure(api_type, complexity, func, owner, repo, run, results, sketches)
+            if result is not None:
+                cells[(complexity, owner, repo)]["times"][api_type].append(result["time_ms"])
+            maybe_probe(current)
             
             if current % 100 == 0:
-                print(f"Progresso: {current}/{total} ({100*current/total:.1f}%)")
-                
-        except Exception as e:
-            print(f"Erro em {api_type} {complexity} {owner}/{repo}: {e}")
-            
-        # Pequena pausa para evitar rate limiting
-        time.sleep(0.1)
+                print(f"Progresso: {current}/{budget} ({100*current/budget:.1f}%)")
+        
+        # Análise interina de cada célula ativa
+        with phase("sequential_test"):
+            decide_cells(cells, max_looks, constant)
     
+    save_sequential_log(cells)
     return results
 
+def decide_cells(cells, max_looks, constant):
+    """Análise interina das células ativas; encerra as que convergiram
+
+    Só células com medições novas desde a análise anterior gastam uma
+    análise (ex.: o orçamento pode acabar no meio de uma rodada).
+    """
+    for (complexity, owner, repo), cell in cells.items():
+        measured = len(cell["times"]["REST"]) + len(cell["times"]["GraphQL"])
+        if not cell["active"] or measured == cell["measured"]:
+            continue
+        cell["measured"] = measured
+        cell["looks"] += 1
+        decision, z, critical = cell_decision(cell["times"]["REST"], cell["times"]["GraphQL"],
+                                              min(cell["looks"], max_looks), max_looks, constant)
+        cell["decision"], cell["z"], cell["boundary"] = decision, z, critical
+        if decision is not None or cell["looks"] >= max_looks:
+            cell["active"] = False
+            status = f"{decision} mais rápido" if decision else "sem decisão (teto atingido)"
+            print(f"Célula {complexity} {owner}/{repo} encerrada após "
+                  f"{cell['looks']} análises: {status} (z = {z:+.2f})")
+
 # ============================================
 # SALVAR RESULTADOS
 # ============================================
@@ -294,15 +962,78 @@ def save_results(results, filename="experiment_results.csv"):
     
     filepath = os.path.join(OUTPUT_DIR, filename)
     keys = results[0].keys()
-    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+    with phase("csv_write"), open(filepath, 'w', newline='', encoding='utf-8') as f:
         writer = csv.DictWriter(f, fieldnames=keys)
         writer.writeheader()
         writer.writerows(results)
     
     print(f"\nResultados salvos em: {filepath}")
     
-    # Salvar também resumos estatísticos
+    # Salvar também resumos estatísticos, as sondas de RTT e o uso de recursos
     save_summary(results)
+    save_baseline()
+    save_samples(os.path.join(OUTPUT_DIR, RESOURCES_FILE))
+    save_clock_calibration()
+    save_subrequests(os.path.join(OUTPUT_DIR, SUBREQUEST_FILE))
+    save_run_config()
+
+def run_config():
+    """Configuração desta execução (RUN_CONFIG_FIELDS e repositórios medidos)"""
+    config = {name: globals()[name] for name in RUN_CONFIG_FIELDS}
+    config.update({name: getattr(volume, name) for name in VOLUME_CONFIG_FIELDS})
+    config["REPOS"] = [f"{owner}/{repo}" for owner, repo in active_repos()]
+    return config
+
+def save_run_config(filename=RUN_CONFIG_FILE):
+    """Salva a configuração ao lado do CSV, para o relatório e o histórico"""
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(run_config(), f, ensure_ascii=False, indent=2, default=str)
+    print(f"Configuração da execução salva em: {filepath}")
+
+def save_baseline(filename=BASELINE_FILE):
+    """Salva as sondas de linha de base (RTT) em uma tabela lateral
+
+    Sem sondas nesta execução, remove a tabela de uma execução anterior
+    para que a análise não corrija os dados novos com RTTs antigos.
+    """
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    if not BASELINE_SAMPLES:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+            print(f"Sondas de RTT antigas removidas: {filepath}")
+        return
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=BASELINE_FIELDS)
+        writer.writeheader()
+        writer.writerows(BASELINE_SAMPLES)
+    print(f"Sondas de RTT salvas em: {filepath} ({len(BASELINE_SAMPLES)} amostras)")
+
+def save_clock_calibration(filename=CALIBRATION_FILE):
+    """Salva a calibração, com a âncora final e a deriva do relógio na execução"""
+    if CALIBRATION is None:
+        return
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    save_calibration({**finish(CALIBRATION), "run_id": RUN_ID}, filepath)
+    print(f"Calibração do relógio salva em: {filepath}")
+
+def save_sequential_log(cells, filename=SEQUENTIAL_FILE):
+    """Salva a decisão final de cada célula do modo adaptativo"""
+    if not os.path.exists(OUTPUT_DIR):
+        os.makedirs(OUTPUT_DIR)
+    
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["complexity", "repository", "n_rest", "n_graphql", "looks",
+                         "z", "boundary", "nominal_p_value", "decision"])
+        for (complexity, owner, repo), cell in cells.items():
+            writer.writerow([complexity, f"{owner}/{repo}",
+                             len(cell["times"]["REST"]), len(cell["times"]["GraphQL"]),
+                             cell["looks"], round(cell["z"], 4), round(cell["boundary"], 4),
+                             z_to_p(cell["z"]), cell["decision"] or "undecided"])
+    
+    print(f"\nDecisões sequenciais salvas em: {filepath}")
 
 def save_summary(results):
     """Salva resumos estatísticos em CSVs separados"""
@@ -336,22 +1067,42 @@ def save_summary(results):
     print(f"  - {OUTPUT_DIR}/summary_by_repository.csv")
 
 # ============================================
-# MAIN
+# SESSÃO COMPLETA
 # ============================================
 
-if __name__ == "__main__":
+def print_header():
+    """Cabeçalho com a configuração da execução"""
     print("=" * 60)
     print("EXPERIMENTO CONTROLADO: GraphQL vs REST")
     print("Laboratório de Experimentação de Software")
     print("=" * 60)
     print(f"Data/Hora de Início: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-    print(f"Repositórios: {len(REPOS)}")
+    print(f"Backend: {API['name']} ({REST_URL})")
+    print(f"Repositórios: {len(active_repos())}" + (" (pontos de volume)" if VOLUME_MODE else ""))
     print(f"Execuções por tratamento: {NUM_EXECUTIONS}")
-    print(f"Total de medições: {len(REPOS) * NUM_EXECUTIONS * 6}")
+    print(f"Modo adaptativo (parada antecipada): {'Sim' if ADAPTIVE else 'Não'}")
+    print(f"Protocolo: {PROTOCOL}" + (" (REST multiplexado)" if PROTOCOL == "HTTP/2" and HTTP2_MULTIPLEX else ""))
+    if NESTED_MODE:
+        print(f"Consultas aninhadas: profundidades {NESTED_DEPTHS}, largura {NESTED_WIDTH} "
+              f"(até {[rest_request_count(d, NESTED_WIDTH, API['nesting_levels']) for d in NESTED_DEPTHS]} "
+              "requisições REST)")
+    print(f"Requisições condicionais (ETag): {'Sim' if CONDITIONAL_REQUESTS else 'Não'}")
+    print(f"Calibração do harness (no-op local): {'Sim' if CALIBRATE else 'Não'}")
+    print(f"Timeout: {REQUEST_TIMEOUT:g} s, até {MAX_RETRIES} novas tentativas (status {RETRY_STATUS})")
+    print(f"Desserialização medida (parse_ms): {json_loader(JSON_PARSER)[0] if PARSE_BODIES else 'Não'}")
+    if VOLUME_MODE:
+        print(f"Varredura de volume: PAGE_SCALE = {volume.PAGE_SCALE}, páginas pelos eixos: {'Sim' if volume.AXIS_PAGES else 'Não'}")
+    print(f"Total de medições: {len(active_repos()) * NUM_EXECUTIONS * len(active_treatments())}")
     print("=" * 60 + "\n")
+
+def check_setup():
+    """Encerra se a configuração não permite executar (backend sem volume, token ausente)"""
+    if VOLUME_MODE and not API.get("volume"):
+        print(f"ERRO: o backend {API['name']} não gera repositórios de volume (use BACKEND = \"local\")")
+        exit(1)
     
     # Verificar token
-    if GITHUB_TOKEN == "SEU_TOKEN_AQUI":
+    if API["requires_token"] and GITHUB_TOKEN == "SEU_TOKEN_AQUI":
         print("=" * 60)
         print("ERRO: Configure seu token do GitHub!")
         print("=" * 60)
@@ -362,24 +1113,67 @@ if __name__ == "__main__":
         print("\nExemplo:")
         print('GITHUB_TOKEN = "ghp_xxxxxxxxxxxxxxxxxxxx"')
         exit(1)
-    
-    # Testar conexão
-    print("Testando conexão com GitHub API...")
+
+def check_connection():
+    """Testa a conexão e a autenticação com o backend (encerra em caso de falha)"""
+    print(f"Testando conexão com {API['name']}...")
     try:
-        test = requests.get(f"{REST_URL}/user", headers=HEADERS_REST)
-        if test.status_code == 200:
-            print(f"Conectado como: {test.json().get('login', 'N/A')}\n")
-        else:
-            print(f"Erro de autenticação: {test.status_code}")
-            exit(1)
+        test = requests.get(f"{REST_URL}{API['auth_check']}", headers=HEADERS_REST, timeout=REQUEST_TIMEOUT)
     except Exception as e:
         print(f"Erro de conexão: {e}")
         exit(1)
+    if test.status_code != 200:
+        print(f"Erro de autenticação: {test.status_code}")
+        exit(1)
+    print(f"Conectado como: {test.json().get('login', 'N/A')}\n")
+
+def run_session():
+    """Execução completa: verificações, aquecimento, calibração, medições e arquivos
+
+    Usada pelo MAIN e pela etapa `run` do pipeline. Devolve as linhas
+    medidas (lista vazia se nenhuma medição foi registrada).
+    """
+    print_header()
+    check_setup()
     
-    # Executar experimento
-    run_warmup()
-    results = run_experiment()
-    save_results(results)
+    # Subir o serviço do backend (se houver). Serviço, amostragem e profiling
+    # são encerrados, e os relatórios do harness salvos, mesmo se a execução
+    # falhar ou for interrompida (Ctrl-C)
+    start_backend()
+    wall_start = None
+    try:
+        check_connection()
+        run_warmup()
+        start_calibration()
+        start_profiling(cpu=PROFILE_CPU, memory=PROFILE_MEMORY)
+        wall_start = time.perf_counter()
+        sketches = {}
+        if SAMPLE_RESOURCES:
+            # Backend local: o tráfego medido passa pelo loopback
+            start_sampler(SAMPLE_INTERVAL, loopback=BACKEND == "local")
+        results = run_experiment(sketches)
+        stop_sampler()
+        save_results(results)
+        save_sketches(sketches, os.path.join(OUTPUT_DIR, SKETCH_FILE))
+        print(f"Sketches de quantis salvos em: {OUTPUT_DIR}/{SKETCH_FILE}")
+    finally:
+        stop_sampler()
+        stop_backend()
+        if wall_start is not None:
+            wall_time = time.perf_counter() - wall_start
+            if not os.path.exists(OUTPUT_DIR):
+                os.makedirs(OUTPUT_DIR)
+            stop_profiling(OUTPUT_DIR)
+            harness_report(wall_time)
+            save_report(os.path.join(OUTPUT_DIR, REPORT_FILE))
+    return results
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    run_session()
     
     print("\n" + "=" * 60)
     print("EXPERIMENTO CONCLUÍDO COM SUCESSO!")
@@ -387,4 +1181,4 @@ if __name__ == "__main__":
     print("=" * 60)
     print(f"\nPróximos passos:")
     print(f"1. Execute 'python analise.py' para análise estatística")
-    print(f"2. Execute 'python dashboard.py' para gerar gráficos")
\ No newline at end of file
+    print(f"2. Execute 'python dashboard.py' para gerar gráficos")
@@ -0,0 +1,220 @@
+"""
+Histórico de Execuções e Detecção de Regressões: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Cada execução registrada ganha um diretório results/runs/<run_id>/ com:
+  - aggregates.csv: n, média e variância (escala original e log) de
+    time_ms e size_bytes por (api_type, complexity, repository);
+  - sketches.json: sketches de quantis dos mesmos grupos (quantis.py);
+  - run.json: configuração do experimento, parâmetros da limpeza e origem.
+
+A comparação entre duas execuções usa apenas esses agregados: teste t de
+Welch sobre o log da métrica (razão das médias geométricas), p-valores
+corrigidos por Holm sobre todos os grupos e um limiar mínimo de variação
+relativa. Uma regressão exige significância E variação acima do limiar.
+
+Uso:
+    python historico.py register [--input results/experiment_results.csv]
+    python historico.py list
+    python historico.py compare [BASE NOVA]   # padrão: as duas últimas
+"""
+
+import argparse
+import json
+import os
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+from quantis import GROUP_FIELDS, METRICS, load_sketches, save_sketches, sketch_quantile, sketches_from_dataframe
+
+# Configuração
+RUNS_DIR = "results/runs"
+ALPHA = 0.05
+MIN_CHANGE = 0.10   # Variação relativa mínima para sinalizar (10%)
+QUANTILE = 0.95     # Percentil comparado a partir dos sketches
+
+# ============================================
+# AGREGADOS DE UMA EXECUÇÃO
+# ============================================
+
+def run_aggregates(df):
+    """n, média e variância (original e log) de cada métrica por grupo"""
+    frame = pd.DataFrame({field: df[field].astype(str) for field in GROUP_FIELDS})
+    for metric in METRICS:
+        frame[metric] = df[metric].astype(float)
+        frame[f'{metric}_log'] = np.log(frame[metric].clip(lower=1e-6))
+    grouped = frame.groupby(GROUP_FIELDS)
+    aggregates = grouped[[c for c in frame.columns if c not in GROUP_FIELDS]].agg(['mean', 'var'])
+    aggregates.columns = [f"{column}_{stat}" for column, stat in aggregates.columns]
+    aggregates.insert(0, 'n', grouped.size())
+    return aggregates.fillna(0.0)  # Variância de grupos com uma só medição
+
+# ============================================
+# REGISTRO
+# ============================================
+
+def new_run_id(key=None):
+    """Identificador ordenável pela data (com o início da chave dos dados, se houver)"""
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return f"{run_id}-{key[:8]}" if key else run_id
+
+def find_run(key, runs_dir=RUNS_DIR):
+    """Execução já registrada com a mesma chave de dados (ou None)"""
+    for meta in list_runs(runs_dir):
+        if key and meta.get("key") == key:
+            return meta["run_id"]
+    return None
+
+def register_run(df, cleaning=None, source=None, key=None, sketches=None, runs_dir=RUNS_DIR):
+    """Salva agregados, sketches e configuração da execução; devolve o run_id"""
+    from relatorio import load_run_config
+
+    existing = find_run(key, runs_dir)
+    if existing:
+        print(f"Execução já registrada: {existing}")
+        return existing
+    run_id = new_run_id(key)
+    directory = os.path.join(runs_dir, run_id)
+    os.makedirs(directory, exist_ok=True)
+    run_aggregates(df).to_csv(os.path.join(directory, "aggregates.csv"))
+    save_sketches(sketches or sketches_from_dataframe(df), os.path.join(directory, "sketches.json"))
+    meta = {
+        "run_id": run_id,
+        "registered_at": datetime.now().isoformat(timespec="seconds"),
+        "source": source,
+        "key": key,
+        "rows": len(df),
+        "config": load_run_config(source),
+        "cleaning": cleaning or {}
+    }
+    with open(os.path.join(directory, "run.json"), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, ensure_ascii=False, indent=2, default=str)
+    print(f"Execução registrada: {run_id} ({directory})")
+    return run_id
+
+def list_runs(runs_dir=RUNS_DIR):
+    """Metadados das execuções registradas, da mais antiga para a mais recente"""
+    if not os.path.isdir(runs_dir):
+        return []
+    runs = []
+    for run_id in sorted(os.listdir(runs_dir)):
+        filepath = os.path.join(runs_dir, run_id, "run.json")
+        if os.path.exists(filepath):
+            with open(filepath, encoding='utf-8') as f:
+                runs.append(json.load(f))
+    return runs
+
+def load_run(run_id, runs_dir=RUNS_DIR):
+    """(metadados, agregados, sketches) de uma execução registrada"""
+    directory = os.path.join(runs_dir, run_id)
+    if not os.path.isdir(directory):
+        raise FileNotFoundError(f"Execução não encontrada: {directory}")
+    with open(os.path.join(directory, "run.json"), encoding='utf-8') as f:
+        meta = json.load(f)
+    aggregates = pd.read_csv(os.path.join(directory, "aggregates.csv"), index_col=list(range(len(GROUP_FIELDS))),
+                             dtype={field: str for field in GROUP_FIELDS})
+    return meta, aggregates, load_sketches(os.path.join(directory, "sketches.json"))
+
+# ============================================
+# COMPARAÇÃO
+# ============================================
+
+def holm(p_values):
+    """p-valores ajustados por Holm-Bonferroni (NaN preservado)"""
+    p = np.asarray(p_values, dtype=float)
+    valid = np.flatnonzero(~np.isnan(p))
+    adjusted = np.full_like(p, np.nan)
+    order = valid[np.argsort(p[valid])]
+    steps = (len(order) - np.arange(len(order))) * p[order]
+    adjusted[order] = np.minimum(np.maximum.accumulate(steps), 1.0)
+    return adjusted
+
+def welch_from_stats(base, new, metric):
+    """p-valor do teste t de Welch sobre o log da métrica, a partir dos agregados"""
+    mean_a, var_a, n_a = (base[c].to_numpy(dtype=float) for c in [f'{metric}_log_mean', f'{metric}_log_var', 'n'])
+    mean_b, var_b, n_b = (new[c].to_numpy(dtype=float) for c in [f'{metric}_log_mean', f'{metric}_log_var', 'n'])
+    with np.errstate(divide='ignore', invalid='ignore'):
+        _, p = stats.ttest_ind_from_stats(mean_a, np.sqrt(var_a), n_a, mean_b, np.sqrt(var_b), n_b,
+                                          equal_var=False)
+    p = np.asarray(p, dtype=float)
+    # Sem variância nos dois grupos (ex.: tamanho fixo), qualquer diferença é real
+    constant = (var_a == 0) & (var_b == 0) & (n_a > 1) & (n_b > 1)
+    p[constant] = np.where(mean_a[constant] != mean_b[constant], 0.0, 1.0)
+    return p
+
+def compare_runs(base_id, new_id, alpha=ALPHA, min_change=MIN_CHANGE, runs_dir=RUNS_DIR):
+    """Diferenças por grupo entre duas execuções, com status por métrica"""
+    _, base, base_sketches = load_run(base_id, runs_dir)
+    _, new, new_sketches = load_run(new_id, runs_dir)
+    common = base.index.intersection(new.index)
+    unmatched = len(base.index.union(new.index)) - len(common)
+    base, new = base.loc[common], new.loc[common]
+    comparison = pd.DataFrame({'n_base': base['n'], 'n_new': new['n']}, index=common)
+    for metric in METRICS:
+        ratio = np.exp(new[f'{metric}_log_mean'] - base[f'{metric}_log_mean'])
+        p_adjusted = holm(welch_from_stats(base, new, metric))
+        significant = p_adjusted < alpha
+        comparison[f'{metric}_ratio'] = ratio
+        comparison[f'{metric}_p_adj'] = p_adjusted
+        comparison[f'{metric}_q_base'] = [sketch_quantile(base_sketches["|".join(key)][metric], QUANTILE)
+                                          for key in common]
+        comparison[f'{metric}_q_new'] = [sketch_quantile(new_sketches["|".join(key)][metric], QUANTILE)
+                                         for key in common]
+        comparison[f'{metric}_status'] = np.select(
+            [significant & (ratio > 1 + min_change), significant & (ratio < 1 / (1 + min_change))],
+            ['regression', 'improvement'], default='unchanged')
+    return comparison, unmatched
+
+def print_comparison(comparison, unmatched, base_id, new_id):
+    """Tabela dos grupos com regressão ou melhora"""
+    print("\n" + "=" * 90)
+    print(f"COMPARAÇÃO DE EXECUÇÕES: {base_id} -> {new_id}")
+    print("=" * 90)
+    print(f"Welch (log) + Holm, α = {ALPHA}, variação mínima = {MIN_CHANGE:.0%}; "
+          f"{len(comparison)} grupos em comum, {unmatched} sem par")
+    for metric in METRICS:
+        changed = comparison[comparison[f'{metric}_status'] != 'unchanged']
+        counts = comparison[f'{metric}_status'].value_counts()
+        print(f"\n{metric}: {counts.get('regression', 0)} regressões, {counts.get('improvement', 0)} melhoras")
+        if changed.empty:
+            continue
+        q = f"p{int(QUANTILE * 100)}"
+        print(f"{'Grupo':<44} {'Razão':>7} {'p ajust.':>10} {q + ' base':>11} {q + ' nova':>11}  Status")
+        print("-" * 90)
+        for key, row in changed.sort_values(f'{metric}_ratio', ascending=False).iterrows():
+            print(f"{' / '.join(key):<44} {row[f'{metric}_ratio']:>7.3f} {row[f'{metric}_p_adj']:>10.2e} "
+                  f"{row[f'{metric}_q_base']:>11.1f} {row[f'{metric}_q_new']:>11.1f}  {row[f'{metric}_status']}")
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Histórico de execuções e detecção de regressões")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    register = subparsers.add_parser("register", help="Registra os resultados atuais")
+    register.add_argument("--input", default=os.path.join("results", "experiment_results.csv"))
+    subparsers.add_parser("list", help="Lista as execuções registradas")
+    compare = subparsers.add_parser("compare", help="Compara duas execuções (padrão: as duas últimas)")
+    compare.add_argument("runs", nargs="*", metavar="RUN_ID")
+    args = parser.parse_args()
+
+    if args.command == "register":
+        from dados import read_results
+        from limpeza import clean_data
+        df, cleaning = clean_data(read_results(args.input))
+        register_run(df, cleaning, source=args.input)
+    elif args.command == "list":
+        for meta in list_runs():
+            print(f"{meta['run_id']:<28} {meta['rows']:>8} linhas  {meta['source']}")
+    else:
+        runs = args.runs or [meta["run_id"] for meta in list_runs()[-2:]]
+        if len(runs) != 2:
+            print("ERRO: informe duas execuções (ou registre pelo menos duas)")
+            exit(1)
+        comparison, unmatched = compare_runs(*runs)
+        print_comparison(comparison, unmatched, *runs)
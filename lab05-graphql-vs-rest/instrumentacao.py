@@ -0,0 +1,150 @@
+"""
+Instrumentação do Experimento: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Contadores e cronômetros por fase do laço de medição (requisição,
+timestamp, registro do resultado, pausa, escrita do CSV), captura opcional
+com cProfile/tracemalloc e um relatório do overhead do próprio harness,
+incluindo a parcela de trabalho do cliente que vaza para `time_ms`.
+"""
+
+import csv
+import cProfile
+import os
+import pstats
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+
+# Configuração
+ENABLED = True
+REPORT_FILE = "instrumentation.csv"
+PROFILE_FILE = "profile.prof"
+MEMORY_TOP = 15  # Linhas exibidas no relatório do tracemalloc
+
+# Estado global da instrumentação
+PHASE_TIMES = defaultdict(float)   # Segundos acumulados por fase
+PHASE_COUNTS = defaultdict(int)    # Número de execuções por fase
+COUNTERS = defaultdict(int)        # Contadores livres (requisições, erros, ...)
+_profiler = None
+
+# ============================================
+# CRONÔMETROS E CONTADORES
+# ============================================
+
+@contextmanager
+def phase(name):
+    """Cronometra um bloco e acumula o tempo na fase `name`"""
+    if not ENABLED:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        PHASE_TIMES[name] += time.perf_counter() - start
+        PHASE_COUNTS[name] += 1
+
+def record(name, seconds):
+    """Acumula uma duração medida externamente"""
+    if ENABLED:
+        PHASE_TIMES[name] += seconds
+        PHASE_COUNTS[name] += 1
+
+def count(name, n=1):
+    """Incrementa um contador"""
+    if ENABLED:
+        COUNTERS[name] += n
+
+def reset():
+    """Zera cronômetros e contadores"""
+    PHASE_TIMES.clear()
+    PHASE_COUNTS.clear()
+    COUNTERS.clear()
+
+def timer_overhead_ns(samples=100000):
+    """Custo médio (ns) de um par de chamadas perf_counter() usado em cada medição"""
+    start = time.perf_counter_ns()
+    for _ in range(samples):
+        time.perf_counter()
+        time.perf_counter()
+    return (time.perf_counter_ns() - start) / samples
+
+# ============================================
+# PROFILING OPCIONAL (cProfile / tracemalloc)
+# ============================================
+
+def start_profiling(cpu=False, memory=False):
+    """Inicia a captura de CPU (cProfile) e/ou memória (tracemalloc)"""
+    global _profiler
+    if cpu:
+        _profiler = cProfile.Profile()
+        _profiler.enable()
+    if memory:
+        tracemalloc.start()
+
+def stop_profiling(output_dir):
+    """Encerra a captura e salva/exibe os resultados"""
+    global _profiler
+    if _profiler is not None:
+        _profiler.disable()
+        filepath = os.path.join(output_dir, PROFILE_FILE)
+        _profiler.dump_stats(filepath)
+        print(f"\nPerfil de CPU salvo em: {filepath}")
+        pstats.Stats(_profiler).sort_stats('cumulative').print_stats(15)
+        _profiler = None
+
+    if tracemalloc.is_tracing():
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"\nMemória (tracemalloc): atual = {current / 1024:.1f} KiB | pico = {peak / 1024:.1f} KiB")
+        for stat in snapshot.statistics('lineno')[:MEMORY_TOP]:
+            print(f"  {stat}")
+
+# ============================================
+# RELATÓRIO DE OVERHEAD
+# ============================================
+
+def harness_report(wall_time):
+    """Exibe quanto do tempo total foi gasto em cada fase do harness"""
+    print("\n" + "=" * 70)
+    print("INSTRUMENTAÇÃO DO HARNESS")
+    print("=" * 70)
+    print(f"Tempo total de parede: {wall_time:.2f} s")
+    print(f"{'Fase':<22} {'Total (s)':>10} {'N':>8} {'Média (µs)':>12} {'% parede':>9}")
+    print("-" * 70)
+    for name in sorted(PHASE_TIMES, key=PHASE_TIMES.get, reverse=True):
+        if name.startswith("leak:"):
+            continue
+        total = PHASE_TIMES[name]
+        n = PHASE_COUNTS[name]
+        print(f"{name:<22} {total:>10.3f} {n:>8} {1e6 * total / n:>12.1f} "
+              f"{100 * total / wall_time if wall_time else 0:>8.2f}%")
+
+    leak_names = [name for name in PHASE_TIMES if name.startswith("leak:")]
+    if leak_names:
+        print("\nOverhead do cliente contido em time_ms:")
+        for name in leak_names:
+            n = PHASE_COUNTS[name]
+            print(f"  {name[5:]:<20} média = {1000 * PHASE_TIMES[name] / n:.3f} ms ({n} medições)")
+    print(f"  {'par perf_counter()':<20} média = {timer_overhead_ns() / 1e6:.6f} ms")
+
+    if COUNTERS:
+        print("\nContadores:")
+        for name, value in sorted(COUNTERS.items()):
+            print(f"  {name:<20} {value}")
+
+def save_report(filepath):
+    """Salva fases e contadores em CSV"""
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.writer(f)
+        writer.writerow(["kind", "name", "total_s", "count", "mean_us"])
+        for name, total in PHASE_TIMES.items():
+            n = PHASE_COUNTS[name]
+            writer.writerow(["phase", name, round(total, 6), n, round(1e6 * total / n, 3)])
+        for name, value in COUNTERS.items():
+            writer.writerow(["counter", name, "", value, ""])
+    print(f"\nRelatório de instrumentação salvo em: {filepath}")
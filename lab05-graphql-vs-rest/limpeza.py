@@ -0,0 +1,169 @@
+"""
+Limpeza dos Dados: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Etapa executada entre o carregamento dos dados e a análise estatística:
+filtra respostas com status inválido ou com erro (error_class, inclusive
+erros GraphQL devolvidos com status 200), exclui janelas de tempo com
+instabilidade conhecida e, opcionalmente, remove outliers por grupo
+(api_type, complexity, repository). Todas as linhas descartadas são
+registradas em um arquivo de auditoria junto com o motivo.
+
+A remoção de outliers é desativada por padrão: em dados de latência a
+cauda é parte do resultado. Quando ativada, cada grupo é ainda separado
+pelos estratos de STRATA presentes nos dados (ex.: respostas 304 e 200 no
+modo condicional, medições com e sem novas tentativas), para que um
+estrato raro não seja descartado como outlier do estrato comum.
+"""
+
+import os
+
+import pandas as pd
+
+# Configuração padrão da limpeza
+CLEANING_CONFIG = {
+    "status": [200, 304],       # Status HTTP aceitos (None = não filtrar; 304 = revalidação por ETag)
+    "drop_errors": True,        # Remove linhas com error_class (ex.: "graphql", que vem com status 200)
+    "method": None,             # 'iqr', 'mad', 'hampel' ou None (sem remoção de outliers)
+    "strata": ["not_modified", "attempts"],  # Colunas que separam os grupos na detecção
+    "metric": "time_ms",        # Métrica usada na detecção de outliers
+    "iqr_k": 1.5,               # Limites Q1 - k*IQR e Q3 + k*IQR
+    "mad_threshold": 3.5,       # Limite do z-score modificado (Iglewicz & Hoaglin)
+    "hampel_window": 7,         # Tamanho da janela móvel (em medições)
+    "hampel_sigmas": 3.0,       # Número de desvios (MAD escalado) tolerados
+    "exclusion_windows": []     # Ex.: [("2025-11-22T13:00:00", "2025-11-22T13:05:00")]
+}
+AUDIT_FILE = "dropped_rows.csv"
+GROUP_FIELDS = ['api_type', 'complexity', 'repository']
+
+# ============================================
+# FILTROS
+# ============================================
+
+def status_mask(df, accepted):
+    """Linhas cujo status não está entre os aceitos"""
+    if accepted is None:
+        return pd.Series(False, index=df.index)
+    return ~df['status'].isin(accepted)
+
+def error_mask(df, enabled=True):
+    """Linhas com classe de erro registrada (error_class não vazia)"""
+    if not enabled or 'error_class' not in df.columns:
+        return pd.Series(False, index=df.index)
+    return df['error_class'].astype(object).fillna('').astype(str) != ''
+
+def window_mask(df, windows):
+    """Linhas cujo timestamp cai em alguma janela de exclusão"""
+    mask = pd.Series(False, index=df.index)
+    if not windows:
+        return mask
+    timestamps = pd.to_datetime(df['timestamp'])
+    for start, end in windows:
+        mask |= timestamps.between(pd.Timestamp(start), pd.Timestamp(end))
+    return mask
+
+def outlier_groups(df, strata):
+    """Campos de agrupamento da detecção: o grupo e os estratos presentes nos dados"""
+    return GROUP_FIELDS + [field for field in strata or [] if field in df.columns]
+
+def iqr_mask(df, metric, k, fields=GROUP_FIELDS):
+    """Outliers pela regra de Tukey (IQR) dentro de cada grupo"""
+    grouped = df.groupby(fields, observed=True, dropna=False)[metric]
+    q1 = grouped.transform('quantile', 0.25)
+    q3 = grouped.transform('quantile', 0.75)
+    iqr = q3 - q1
+    return (df[metric] < q1 - k * iqr) | (df[metric] > q3 + k * iqr)
+
+def mad_mask(df, metric, threshold, fields=GROUP_FIELDS):
+    """Outliers pelo z-score modificado (mediana e MAD) dentro de cada grupo"""
+    keys = [df[field] for field in fields]
+    median = df.groupby(keys, observed=True, dropna=False)[metric].transform('median')
+    abs_dev = (df[metric] - median).abs()
+    mad = abs_dev.groupby(keys, observed=True, dropna=False).transform('median')
+    modified_z = 0.6745 * abs_dev / mad.where(mad > 0)
+    return modified_z.gt(threshold)
+
+def hampel_mask(df, metric, window, sigmas, fields=GROUP_FIELDS):
+    """Outliers pelo filtro de Hampel (janela móvel na ordem temporal de cada grupo)"""
+    ordered = df.sort_values('timestamp')
+    keys = [ordered[field] for field in fields]
+
+    def rolling_median(series):
+        return series.rolling(window, center=True, min_periods=1).median()
+
+    median = ordered.groupby(keys, observed=True, dropna=False)[metric].transform(rolling_median)
+    abs_dev = (ordered[metric] - median).abs()
+    mad = abs_dev.groupby(keys, observed=True, dropna=False).transform(rolling_median)
+    mask = abs_dev > sigmas * 1.4826 * mad
+    return mask.reindex(df.index)
+
+# ============================================
+# ETAPA DE LIMPEZA
+# ============================================
+
+def clean_data(df, config=None, audit_path=None):
+    """Aplica a limpeza e retorna (dados limpos, metadados da limpeza)"""
+    cleaned, info, audit = clean_frame(df, config)
+    if audit_path is not None:
+        save_audit(audit, audit_path)
+    return cleaned, info
+
+def save_audit(audit, audit_path):
+    """Salva as linhas removidas (com o motivo) no arquivo de auditoria"""
+    directory = os.path.dirname(audit_path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    audit.to_csv(audit_path, index=False)
+    print(f"Auditoria das linhas removidas salva em: {audit_path}\n")
+
+def clean_frame(df, config=None):
+    """Aplica a limpeza e retorna (dados limpos, metadados, linhas removidas com o motivo)"""
+    config = {**CLEANING_CONFIG, **(config or {})}
+    print("=" * 70)
+    print("LIMPEZA DOS DADOS")
+    print("=" * 70)
+
+    reason = pd.Series(None, index=df.index, dtype=object)
+    reason[status_mask(df, config["status"])] = "status"
+    reason[reason.isna() & error_mask(df, config["drop_errors"])] = "error"
+    reason[reason.isna() & window_mask(df, config["exclusion_windows"])] = "exclusion_window"
+
+    # Outliers calculados apenas sobre as linhas que passaram pelos filtros anteriores
+    method = config["method"]
+    valid = df[reason.isna()]
+    if method is not None and len(valid) > 0:
+        metric = config["metric"]
+        fields = outlier_groups(valid, config["strata"])
+        if method == "iqr":
+            outliers = iqr_mask(valid, metric, config["iqr_k"], fields)
+        elif method == "mad":
+            outliers = mad_mask(valid, metric, config["mad_threshold"], fields)
+        elif method == "hampel":
+            outliers = hampel_mask(valid, metric, config["hampel_window"], config["hampel_sigmas"], fields)
+        else:
+            raise ValueError(f"Método de outlier desconhecido: {method}")
+        reason[outliers[outliers].index] = method
+
+    dropped = reason.notna()
+    counts = reason[dropped].value_counts()
+    print(f"Registros originais: {len(df)}")
+    for name in ["status", "error", "exclusion_window"] + ([method] if method else []):
+        print(f"  Removidos ({name}): {int(counts.get(name, 0))}")
+    print(f"Registros após limpeza: {int((~dropped).sum())}\n")
+
+    info = {
+        "status": ",".join(str(s) for s in config["status"]) if config["status"] is not None else "",
+        "drop_errors": config["drop_errors"],
+        "method": method or "",
+        "strata": ",".join(config["strata"] or []),
+        "metric": config["metric"],
+        "iqr_k": config["iqr_k"],
+        "mad_threshold": config["mad_threshold"],
+        "hampel_window": config["hampel_window"],
+        "hampel_sigmas": config["hampel_sigmas"],
+        "exclusion_windows": ";".join(f"{start}/{end}" for start, end in config["exclusion_windows"]),
+        "rows_before": len(df),
+        "rows_dropped": int(dropped.sum())
+    }
+    return df[~dropped], info, df[dropped].assign(reason=reason[dropped])
@@ -0,0 +1,157 @@
+"""
+Modelo Misto da Latência: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Modelo linear misto para log(time_ms):
+
+    log(time_ms) = X·beta + Z·u + e,   u ~ N(0, tau²·I),   e ~ N(0, sigma²·I)
+
+Os efeitos fixos (X) são o intercepto, a complexidade, a API e a interação
+API x complexidade; o repositório entra como intercepto aleatório (Z).
+X e Z são matrizes esparsas e as equações de Henderson são resolvidas pelo
+complemento de Schur: como Z'Z é diagonal (contagens por repositório), o
+custo cresce com linhas x efeitos fixos e com o número de repositórios,
+sem formar nenhuma matriz densa n x n. As variâncias são estimadas por EM
+(máxima verossimilhança).
+"""
+
+import numpy as np
+import pandas as pd
+from scipy import sparse, stats
+
+# Configuração
+METRIC = "time_ms"
+MAX_ITER = 500
+TOLERANCE = 1e-8   # Variação relativa das variâncias para convergência
+CONFIDENCE = 0.95
+
+# ============================================
+# MATRIZES DE DESENHO (ESPARSAS)
+# ============================================
+
+def categorical_codes(series):
+    """(códigos inteiros, categorias) de uma coluna, categórica ou não"""
+    series = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+    series = series.cat.remove_unused_categories()
+    return series.cat.codes.to_numpy(), list(series.cat.categories)
+
+def design_matrices(df, metric=METRIC):
+    """X (efeitos fixos), Z (repositórios), y = log(métrica), nomes das colunas e níveis"""
+    y = np.log(df[metric].to_numpy(dtype=float).clip(min=1e-6))
+    n = len(df)
+    complexity, complexities = categorical_codes(df['complexity'])
+    api, apis = categorical_codes(df['api_type'])
+    repository, repositories = categorical_codes(df['repository'])
+
+    # Referência: REST e a primeira complexidade
+    graphql = (np.asarray(apis)[api] == 'GraphQL').astype(float)
+    names = ['intercept'] + [f'complexity[{c}]' for c in complexities[1:]] + ['GraphQL'] + \
+            [f'GraphQL:complexity[{c}]' for c in complexities[1:]]
+    rows, cols, values = [np.arange(n)], [np.zeros(n, dtype=int)], [np.ones(n)]
+    level = complexity > 0
+    rows.append(np.flatnonzero(level))
+    cols.append(complexity[level])
+    values.append(np.ones(level.sum()))
+    rows.append(np.arange(n))
+    cols.append(np.full(n, len(complexities)))
+    values.append(graphql)
+    rows.append(np.flatnonzero(level))
+    cols.append(len(complexities) + complexity[level])
+    values.append(graphql[level])
+    X = sparse.csr_matrix((np.concatenate(values), (np.concatenate(rows), np.concatenate(cols))),
+                          shape=(n, len(names)))
+    Z = sparse.csr_matrix((np.ones(n), (np.arange(n), repository)), shape=(n, len(repositories)))
+    return X, Z, y, names, complexities, repositories
+
+# ============================================
+# AJUSTE (HENDERSON + EM)
+# ============================================
+
+def solve_mme(XtX, XtZ, Xty, Zty, counts, ratio):
+    """Resolve as equações do modelo misto para sigma²/tau² = ratio (Z'Z diagonal)"""
+    inverse = 1.0 / (counts + ratio)
+    schur = XtX - (XtZ * inverse) @ XtZ.T
+    beta = np.linalg.solve(schur, Xty - (XtZ * inverse) @ Zty)
+    u = inverse * (Zty - XtZ.T @ beta)
+    return beta, u, schur, inverse
+
+def fit_mixed_model(df, metric=METRIC, max_iter=MAX_ITER, tol=TOLERANCE):
+    """Ajusta o modelo misto e devolve efeitos fixos, covariância, variâncias e efeitos aleatórios"""
+    X, Z, y, names, complexities, repositories = design_matrices(df, metric)
+    n = len(y)
+    XtX = (X.T @ X).toarray()
+    XtZ = (X.T @ Z).toarray()
+    Xty = X.T @ y
+    Zty = Z.T @ y
+    counts = np.asarray(Z.sum(axis=0)).ravel()
+
+    sigma2, tau2 = np.var(y), np.var(y) / 10
+    for iteration in range(1, max_iter + 1):
+        beta, u, schur, inverse = solve_mme(XtX, XtZ, Xty, Zty, counts, sigma2 / tau2)
+        residual = y - X @ beta - Z @ u
+        new_tau2 = (u @ u + sigma2 * inverse.sum()) / len(counts)
+        new_sigma2 = (residual @ residual + sigma2 * (counts * inverse).sum()) / n
+        converged = (abs(new_tau2 - tau2) <= tol * tau2 and abs(new_sigma2 - sigma2) <= tol * sigma2)
+        sigma2, tau2 = new_sigma2, max(new_tau2, 1e-12)
+        if converged:
+            break
+
+    beta, u, schur, _ = solve_mme(XtX, XtZ, Xty, Zty, counts, sigma2 / tau2)
+    return {
+        'names': names,
+        'complexities': complexities,
+        'beta': pd.Series(beta, index=names),
+        'cov': pd.DataFrame(sigma2 * np.linalg.inv(schur), index=names, columns=names),
+        'sigma2': sigma2,
+        'tau2': tau2,
+        'random_effects': pd.Series(u, index=repositories),
+        'n': n,
+        'iterations': iteration,
+        'converged': converged
+    }
+
+# ============================================
+# EFEITOS AJUSTADOS E PREVISÕES
+# ============================================
+
+def contrast(fit, weights):
+    """Estimativa e erro padrão de uma combinação linear dos efeitos fixos"""
+    w = pd.Series(weights).reindex(fit['names'], fill_value=0).to_numpy()
+    return w @ fit['beta'].to_numpy(), np.sqrt(w @ fit['cov'].to_numpy() @ w)
+
+def api_effects(fit):
+    """Razão GraphQL / REST ajustada por complexidade e repositório, com IC"""
+    z = stats.norm.ppf(0.5 + CONFIDENCE / 2)
+    rows = []
+    for i, complexity in enumerate(fit['complexities']):
+        weights = {'GraphQL': 1}
+        if i > 0:
+            weights[f'GraphQL:complexity[{complexity}]'] = 1
+        estimate, se = contrast(fit, weights)
+        rows.append({'complexity': complexity, 'ratio': np.exp(estimate),
+                     'ci_low': np.exp(estimate - z * se), 'ci_high': np.exp(estimate + z * se),
+                     'p_value': 2 * stats.norm.sf(abs(estimate / se))})
+    return pd.DataFrame(rows).set_index('complexity')
+
+def predict_new_repository(fit):
+    """Latência prevista (mediana, média e intervalo de previsão) para um repositório novo"""
+    z = stats.norm.ppf(0.5 + CONFIDENCE / 2)
+    rows = []
+    for i, complexity in enumerate(fit['complexities']):
+        for api in ['REST', 'GraphQL']:
+            weights = {'intercept': 1}
+            if i > 0:
+                weights[f'complexity[{complexity}]'] = 1
+            if api == 'GraphQL':
+                weights['GraphQL'] = 1
+                if i > 0:
+                    weights[f'GraphQL:complexity[{complexity}]'] = 1
+            estimate, se = contrast(fit, weights)
+            spread = np.sqrt(se ** 2 + fit['tau2'] + fit['sigma2'])
+            rows.append({'complexity': complexity, 'api_type': api,
+                         'median_ms': np.exp(estimate),
+                         'mean_ms': np.exp(estimate + (fit['tau2'] + fit['sigma2']) / 2),
+                         'pi_low_ms': np.exp(estimate - z * spread),
+                         'pi_high_ms': np.exp(estimate + z * spread)})
+    return pd.DataFrame(rows).set_index(['complexity', 'api_type'])
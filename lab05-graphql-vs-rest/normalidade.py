@@ -0,0 +1,199 @@
+"""
+Normalidade e Ajuste de Distribuições: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Substitui o Shapiro-Wilk sobre uma única subamostra de 5000 linhas por:
+  - Anderson-Darling e Kolmogorov-Smirnov contra normal, log-normal e gama
+    ajustadas, calculados sobre o vetor ordenado completo (vetorizado) ou,
+    em grupos acima de SKETCH_ROWS linhas, só o KS a partir de um sketch de
+    quantis (quantis.py), sem ordenar o vetor;
+  - Shapiro-Wilk repetido em várias subamostras, em paralelo, resumido
+    pela mediana dos p-valores e pela taxa de rejeição.
+
+O veredito de normalidade escolhe entre o teste paramétrico (t)
+e o não-paramétrico (Mann-Whitney U) em hypothesis_tests.
+"""
+
+import atexit
+import os
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+from scipy import stats
+
+# Configuração
+ALPHA = 0.05
+CANDIDATES = ['norm', 'lognorm', 'gamma']
+SHAPIRO_SIZE = 5000      # Limite do Shapiro-Wilk por subamostra
+SHAPIRO_REPEATS = 30     # Subamostras independentes
+WORKERS = os.cpu_count() or 1
+SEED = 42
+AD_CRITICAL_5 = 0.752    # Valor crítico (5%) do A² ajustado, normal com parâmetros estimados
+SKETCH_ROWS = 1_000_000  # Acima disso (por grupo), ajuste e teste sobre todos os dados saem do sketch
+
+# ============================================
+# AJUSTE E ESTATÍSTICAS SOBRE O VETOR COMPLETO
+# ============================================
+
+def fit_distribution(data, name):
+    """Distribuição do scipy (congelada) ajustada aos dados positivos"""
+    if name == 'norm':
+        return stats.norm(data.mean(), data.std())
+    if name == 'lognorm':
+        logs = np.log(data)
+        return stats.lognorm(s=logs.std(), scale=np.exp(logs.mean()))
+    if name == 'gamma':
+        shape, _, scale = stats.gamma.fit(data, floc=0)
+        return stats.gamma(shape, scale=scale)
+    raise ValueError(f"Distribuição desconhecida: {name}")
+
+def ks_statistic(sorted_data, cdf):
+    """Estatística D de Kolmogorov-Smirnov (dados já ordenados)"""
+    n = len(sorted_data)
+    F = cdf(sorted_data)
+    i = np.arange(1, n + 1)
+    return max((i / n - F).max(), (F - (i - 1) / n).max())
+
+def ad_statistic(sorted_data, cdf):
+    """Estatística A² de Anderson-Darling (dados já ordenados)"""
+    n = len(sorted_data)
+    F = np.clip(cdf(sorted_data), 1e-300, 1 - 1e-16)
+    i = np.arange(1, n + 1)
+    return -n - np.mean((2 * i - 1) * (np.log(F) + np.log1p(-F[::-1])))
+
+def fit_report(data, candidates=CANDIDATES):
+    """A², D e p-valor nominal do KS de cada candidata, com o vetor ordenado uma única vez"""
+    data = np.sort(np.asarray(data, dtype=float))
+    data = data[data > 0]
+    report = {}
+    for name in candidates:
+        dist = fit_distribution(data, name)
+        d = ks_statistic(data, dist.cdf)
+        report[name] = {
+            'ad_statistic': ad_statistic(data, dist.cdf),
+            'ks_statistic': d,
+            # Nominal: parâmetros estimados tornam o p-valor conservador (Lilliefors)
+            'ks_p_nominal': stats.kstwo.sf(d, len(data))
+        }
+    return report
+
+def ad_normal_test(data):
+    """Anderson-Darling contra a normal (parâmetros estimados): (A², rejeita H0?)"""
+    data = np.sort(np.asarray(data, dtype=float))
+    n = len(data)
+    a2 = ad_statistic(data, fit_distribution(data, 'norm').cdf)
+    return a2, a2 * (1 + 0.75 / n + 2.25 / n ** 2) > AD_CRITICAL_5
+
+# ============================================
+# A PARTIR DE SKETCHES (SEM DADOS BRUTOS)
+# ============================================
+
+def sketch_points(sketch):
+    """Bordas (inferior, superior), valor representativo e contagem de cada bin do sketch"""
+    alpha = sketch["alpha"]
+    gamma = (1 + alpha) / (1 - alpha)
+    bins = {int(index): count for index, count in sketch["bins"].items()}
+    indices = np.array(sorted(bins))
+    counts = np.array([bins[i] for i in indices], dtype=float)
+    upper = gamma ** indices
+    return upper / gamma, upper, 2 * upper / (gamma + 1), counts
+
+def ks_from_sketch(sketch, name):
+    """D de Kolmogorov-Smirnov aproximado a partir dos bins de um sketch (erro ≤ alpha relativo)"""
+    lower, upper, values, counts = sketch_points(sketch)
+    weights = counts / counts.sum()
+    if name == 'norm':
+        mean = (weights * values).sum()
+        dist = stats.norm(mean, np.sqrt((weights * (values - mean) ** 2).sum()))
+    elif name == 'lognorm':
+        logs = np.log(values)
+        mean = (weights * logs).sum()
+        dist = stats.lognorm(s=np.sqrt((weights * (logs - mean) ** 2).sum()), scale=np.exp(mean))
+    else:
+        mean = (weights * values).sum()
+        var = (weights * (values - mean) ** 2).sum()
+        dist = stats.gamma(mean ** 2 / var, scale=var / mean)  # Método dos momentos
+    cumulative = np.cumsum(weights)
+    previous = np.r_[0.0, cumulative[:-1]]
+    return max(np.abs(dist.cdf(upper) - cumulative).max(), np.abs(dist.cdf(lower) - previous).max())
+
+def sketch_fit_report(sketch, candidates=CANDIDATES):
+    """D e p-valor nominal do KS de cada candidata a partir de um sketch (sem A²)"""
+    n = sum(sketch["bins"].values())
+    report = {}
+    for name in candidates:
+        d = ks_from_sketch(sketch, name)
+        report[name] = {'ks_statistic': d, 'ks_p_nominal': stats.kstwo.sf(d, n)}
+    return report
+
+# ============================================
+# SHAPIRO-WILK REPETIDO (PARALELO)
+# ============================================
+
+def _shapiro_batch(samples):
+    """(W, p) de cada subamostra (linhas de `samples`)"""
+    return [tuple(stats.shapiro(sample)) for sample in samples]
+
+@lru_cache(maxsize=None)
+def shapiro_pool(workers):
+    """Pool de processos do Shapiro repetido, criado uma vez e reaproveitado entre os grupos
+
+    Encerrado na saída do interpretador (atexit).
+    """
+    pool = ProcessPoolExecutor(max_workers=workers)
+    atexit.register(pool.shutdown)
+    return pool
+
+def repeated_shapiro(data, size=SHAPIRO_SIZE, repeats=SHAPIRO_REPEATS, workers=WORKERS, seed=SEED):
+    """Shapiro-Wilk em `repeats` subamostras; divide as repetições entre processos
+
+    As subamostras são sorteadas aqui: cada processo recebe só as suas
+    (size × repeats valores no total), nunca o vetor completo.
+    """
+    data = np.asarray(data)
+    size = min(size, len(data))
+    if size == len(data):
+        repeats = 1  # Amostra pequena: todas as subamostras seriam iguais
+    rng = np.random.default_rng(seed)
+    samples = np.stack([rng.choice(data, size=size, replace=False) for _ in range(repeats)]).astype(float)
+    workers = max(1, min(workers, repeats))
+    chunks = np.array_split(samples, workers)
+    if workers == 1:
+        batches = [_shapiro_batch(chunk) for chunk in chunks]
+    else:
+        batches = list(shapiro_pool(workers).map(_shapiro_batch, chunks))
+    w, p = np.array([result for batch in batches for result in batch]).T
+    return {'w_median': float(np.median(w)), 'p_median': float(np.median(p)),
+            'reject_rate': float((p < ALPHA).mean()), 'repeats': len(p), 'size': size}
+
+# ============================================
+# VEREDITO E ESCOLHA DO TESTE
+# ============================================
+
+def normality_verdict(data, sketch=None):
+    """Normal se nem o teste sobre todos os dados nem a maioria dos Shapiro rejeitam H0
+
+    O teste sobre todos os dados é o AD ou, com `sketch`, o KS contra a
+    normal calculado a partir dos bins (ad_statistic fica NaN).
+    """
+    if sketch is None:
+        a2, reject = ad_normal_test(data)
+        whole = {'ad_statistic': a2, 'ad_reject': bool(reject)}
+    else:
+        fit = sketch_fit_report(sketch, ['norm'])['norm']
+        reject = fit['ks_p_nominal'] < ALPHA
+        whole = {'ad_statistic': float('nan'), 'ks_statistic': fit['ks_statistic'], 'ks_reject': bool(reject)}
+    shapiro = repeated_shapiro(data)
+    return {**whole, **shapiro, 'normal': not reject and shapiro['p_median'] > ALPHA}
+
+def choose_test(a, b, verdicts=None):
+    """'t' se as duas amostras forem normais, senão 'mann-whitney' (com os vereditos)
+
+    `verdicts` reaproveita os vereditos já calculados (ex.: por
+    analise.normality_tests) em vez de refazer AD e Shapiro.
+    """
+    if verdicts is None:
+        verdicts = [normality_verdict(a), normality_verdict(b)]
+    return ('t' if all(v['normal'] for v in verdicts) else 'mann-whitney'), verdicts
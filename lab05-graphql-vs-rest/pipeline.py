@@ -0,0 +1,214 @@
+"""
+Pipeline em Etapas: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Etapas do experimento (run -> load -> clean -> analyse -> plot) que trocam
+um Dataset em memória. Artefatos caros (dados lidos, agregados, resultados
+dos testes) ficam em cache em disco. A chave de cada etapa combina a chave
+da etapa anterior, a configuração e o código-fonte dos módulos envolvidos,
+de modo que qualquer mudança invalida apenas as etapas dependentes.
+"""
+
+import hashlib
+import io
+import json
+import os
+import pickle
+from contextlib import redirect_stdout
+from dataclasses import dataclass, field, replace
+
+# Configuração
+CACHE_DIR = "results/.cache"
+USE_CACHE = True
+MODULE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# ============================================
+# DATASET
+# ============================================
+
+@dataclass
+class Dataset:
+    """Dados do experimento trocados entre as etapas"""
+    df: object                  # pandas.DataFrame
+    source: str                 # Caminho do CSV de origem
+    key: str                    # Chave de cache (dependências acumuladas)
+    cleaning: dict = field(default_factory=dict)
+    raw: object = None          # DataFrame antes da limpeza (erros e cauda completa)
+
+# ============================================
+# CHAVES E CACHE
+# ============================================
+
+def file_fingerprint(filepath):
+    """SHA-256 do conteúdo de um arquivo"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def data_fingerprint(source):
+    """SHA-256 do CSV e das tabelas laterais que as etapas leem do mesmo diretório
+
+    Sondas de RTT, amostras de recursos, calibração, configuração da
+    execução e tempos por sub-requisição são lidos pela análise e pelo
+    dashboard; sem elas na chave, o cache reaproveitaria resultados antigos.
+    """
+    from calibracao import CALIBRATION_FILE
+    from recursos import RESOURCES_FILE
+    from relatorio import RUN_CONFIG_FILE
+    from rtt import BASELINE_FILE
+    from subrequisicoes import SUBREQUEST_FILE
+
+    directory = os.path.dirname(source)
+    sides = {}
+    for name in [BASELINE_FILE, RESOURCES_FILE, CALIBRATION_FILE, RUN_CONFIG_FILE, SUBREQUEST_FILE]:
+        filepath = os.path.join(directory, name)
+        if os.path.exists(filepath):
+            sides[name] = file_fingerprint(filepath)
+    return make_key(file_fingerprint(source), sides)
+
+def code_fingerprint(*modules):
+    """SHA-256 do código-fonte dos módulos locais informados (ex.: 'analise')"""
+    return hashlib.sha256("".join(
+        file_fingerprint(os.path.join(MODULE_DIR, f"{name}.py")) for name in modules
+    ).encode()).hexdigest()
+
+def make_key(*parts):
+    """Chave de cache a partir de partes serializáveis em JSON"""
+    return hashlib.sha256(json.dumps(parts, sort_keys=True, default=str).encode()).hexdigest()
+
+def cached(stage, key, compute):
+    """Executa `compute` ou reaproveita o resultado salvo para (stage, key)
+
+    A saída impressa pela etapa é guardada junto com o resultado e
+    reexibida quando o cache é usado, para que o console seja o mesmo.
+    """
+    filepath = os.path.join(CACHE_DIR, f"{stage}-{key[:16]}.pkl")
+    if USE_CACHE and os.path.exists(filepath):
+        with open(filepath, 'rb') as f:
+            value, output = pickle.load(f)
+        print(output, end="")
+        print(f"[cache] {stage} reaproveitado ({key[:8]})")
+        return value
+
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        value = compute()
+    output = buffer.getvalue()
+    print(output, end="")
+
+    if USE_CACHE:
+        if not os.path.exists(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        with open(filepath, 'wb') as f:
+            pickle.dump((value, output), f)
+    return value
+
+# ============================================
+# ETAPAS
+# ============================================
+
+def stage_run():
+    """Executa o experimento (experimento.run_session) e devolve o Dataset em memória"""
+    import pandas as pd
+    import experimento
+    from dados import optimize_frame
+
+    results = experimento.run_session()
+    if not results:
+        print("ERRO: nenhuma medição registrada; nada a analisar")
+        exit(1)
+
+    source = os.path.join(experimento.OUTPUT_DIR, "experiment_results.csv")
+    df = optimize_frame(pd.DataFrame(results))
+    dataset = Dataset(df, source, make_key("load", data_fingerprint(source), code_fingerprint("analise", "dados")))
+    # Deixa os dados prontos para uma etapa `analyse`/`plot` posterior
+    if USE_CACHE:
+        cached("load", dataset.key, lambda: df)
+    return dataset
+
+def stage_load(source):
+    """Lê o CSV do experimento (com cache do DataFrame já interpretado)"""
+    import analise
+
+    analise.INPUT_DIR, analise.INPUT_FILE = os.path.split(source)
+    key = make_key("load", data_fingerprint(source), code_fingerprint("analise", "dados"))
+    return Dataset(cached("load", key, analise.load_data), source, key)
+
+def stage_clean(dataset, config=None, audit_path=None):
+    """Aplica a limpeza (limpeza.clean_frame) ao Dataset
+
+    A auditoria é gravada fora do cache, para existir também quando a
+    limpeza é reaproveitada.
+    """
+    from limpeza import CLEANING_CONFIG, clean_frame, save_audit
+
+    config = {**CLEANING_CONFIG, **(config or {})}
+    key = make_key("clean", dataset.key, config, code_fingerprint("limpeza"))
+    df, info, audit = cached("clean", key, lambda: clean_frame(dataset.df, config))
+    if audit_path is not None:
+        save_audit(audit, audit_path)
+    return replace(dataset, df=df, key=key, cleaning=info, raw=dataset.df)
+
+def stage_analyse(dataset):
+    """Estatísticas, testes e exportação de analysis_results.csv"""
+    import analise
+
+    def aggregates():
+        analise.descriptive_stats(dataset.df)
+        return analise.percentile_summary(dataset.df)
+
+    def tests():
+        normality = analise.normality_tests(dataset.df)
+        results = analise.hypothesis_tests(dataset.df, normality)
+        complexity = analise.analysis_by_complexity(dataset.df)
+        mixed = analise.mixed_model_analysis(dataset.df)
+        bayesian = analise.bayesian_analysis(dataset.df)
+        analise.rtt_corrected_analysis(dataset.df)
+        analise.protocol_analysis(dataset.df)
+        analise.nesting_analysis(dataset.df)
+        analise.volume_analysis(dataset.df)
+        analise.conditional_analysis(dataset.df)
+        analise.client_cost_analysis(dataset.df)
+        analise.error_analysis(dataset.df if dataset.raw is None else dataset.raw)
+        analise.calibration_analysis(dataset.df)
+        analise.resource_correlation(dataset.df)
+        return results, complexity, normality, mixed, bayesian
+
+    code = code_fingerprint("analise", "quantis", "rtt", "recursos", "bayesiano", "misto", "normalidade",
+                            "relatorio", "volume", "calibracao")
+    cached("aggregates", make_key("aggregates", dataset.key, code), aggregates)
+    results, complexity, normality, mixed, bayesian = cached("tests", make_key("tests", dataset.key, code), tests)
+    analise.print_summary(results)
+    analise.export_analysis_results(results, dataset.df, dataset.cleaning)
+    analise.export_report(dataset.df, results, dataset.cleaning, complexity, normality, mixed, bayesian)
+    register(dataset)
+    return results
+
+def register(dataset):
+    """Registra a execução no histórico (historico.py), uma vez por conjunto de dados"""
+    from historico import register_run
+
+    runs_dir = os.path.join(os.path.dirname(dataset.source), "runs")
+    return register_run(dataset.df, dataset.cleaning, dataset.source, dataset.key, runs_dir=runs_dir)
+
+def stage_plot(dataset):
+    """Gera o dashboard, pulando se os gráficos dos mesmos dados já existem"""
+    import dashboard
+
+    dashboard.INPUT_DIR = os.path.dirname(dataset.source)
+    key = make_key("plot", dataset.key, code_fingerprint("dashboard", "quantis", "subrequisicoes"))
+    marker = os.path.join(CACHE_DIR, f"plot-{key[:16]}.done")
+    expected = [os.path.join(dashboard.OUTPUT_DIR, name) for name in dashboard.expected_charts()]
+    if USE_CACHE and os.path.exists(marker) and all(os.path.exists(p) for p in expected):
+        print(f"[cache] gráficos já atualizados em {dashboard.OUTPUT_DIR}/ ({key[:8]})")
+        return
+
+    dashboard.setup_output_dir()
+    dashboard.generate_dashboard(dataset.df)
+    if USE_CACHE:
+        if not os.path.exists(CACHE_DIR):
+            os.makedirs(CACHE_DIR)
+        open(marker, 'w').close()
@@ -0,0 +1,186 @@
+"""
+Sketches de Quantis: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Sketches logarítmicos (estilo DDSketch) com erro relativo limitado.
+Cada sketch é um dicionário serializável em JSON e pode ser combinado
+(merge) de forma exata com outro sketch de mesma precisão, o que permite
+juntar fragmentos de execuções paralelas ou distribuídas.
+"""
+
+import json
+import math
+import os
+
+# Configuração
+RELATIVE_ACCURACY = 0.01  # Erro relativo máximo de cada quantil (1%)
+SKETCH_FILE = "sketches.json"
+METRICS = ['time_ms', 'size_bytes']
+GROUP_FIELDS = ['api_type', 'complexity', 'repository']
+
+# ============================================
+# SKETCH INDIVIDUAL
+# ============================================
+
+def new_sketch(alpha=RELATIVE_ACCURACY):
+    """Cria um sketch vazio"""
+    return {
+        "alpha": alpha,
+        "count": 0,
+        "sum": 0.0,
+        "min": None,
+        "max": None,
+        "zeros": 0,
+        "bins": {}
+    }
+
+def _gamma(sketch):
+    alpha = sketch["alpha"]
+    return (1 + alpha) / (1 - alpha)
+
+def sketch_add(sketch, value, count=1):
+    """Adiciona um valor (não negativo) ao sketch"""
+    value = float(value)
+    if value < 0:
+        raise ValueError(f"Valor negativo não suportado: {value}")
+
+    sketch["count"] += count
+    sketch["sum"] += value * count
+    sketch["min"] = value if sketch["min"] is None else min(sketch["min"], value)
+    sketch["max"] = value if sketch["max"] is None else max(sketch["max"], value)
+
+    if value == 0:
+        sketch["zeros"] += count
+        return
+
+    index = math.ceil(math.log(value) / math.log(_gamma(sketch)))
+    bins = sketch["bins"]
+    bins[index] = bins.get(index, 0) + count
+
+def sketch_merge(target, other):
+    """Combina `other` em `target` (operação exata e associativa)"""
+    if target["alpha"] != other["alpha"]:
+        raise ValueError("Sketches com precisões diferentes não podem ser combinados")
+    if other["count"] == 0:
+        return target
+
+    target["count"] += other["count"]
+    target["sum"] += other["sum"]
+    target["zeros"] += other["zeros"]
+    target["min"] = other["min"] if target["min"] is None else min(target["min"], other["min"])
+    target["max"] = other["max"] if target["max"] is None else max(target["max"], other["max"])
+
+    bins = target["bins"]
+    for index, count in other["bins"].items():
+        bins[index] = bins.get(index, 0) + count
+    return target
+
+def sketch_quantile(sketch, q):
+    """Estima o quantil q (0 <= q <= 1) com erro relativo <= alpha"""
+    if sketch["count"] == 0:
+        return float('nan')
+    if not 0 <= q <= 1:
+        raise ValueError(f"Quantil fora do intervalo [0, 1]: {q}")
+
+    rank = q * (sketch["count"] - 1)
+    if rank < sketch["zeros"]:
+        return 0.0
+
+    gamma = _gamma(sketch)
+    cumulative = sketch["zeros"]
+    for index in sorted(sketch["bins"]):
+        cumulative += sketch["bins"][index]
+        if cumulative > rank:
+            estimate = 2 * gamma ** index / (gamma + 1)
+            return min(max(estimate, sketch["min"]), sketch["max"])
+    return sketch["max"]
+
+def sketch_mean(sketch):
+    """Média exata dos valores inseridos"""
+    if sketch["count"] == 0:
+        return float('nan')
+    return sketch["sum"] / sketch["count"]
+
+# ============================================
+# SKETCHES POR GRUPO (api_type, complexity, repository)
+# ============================================
+
+def group_key(api_type, complexity, repository):
+    """Chave textual do grupo (compatível com JSON)"""
+    return f"{api_type}|{complexity}|{repository}"
+
+def split_key(key):
+    """Desfaz group_key em (api_type, complexity, repository)"""
+    return tuple(key.split("|", 2))
+
+def update_group_sketches(sketches, api_type, complexity, repository, time_ms, size_bytes):
+    """Atualiza online os sketches de um grupo com uma nova medição"""
+    key = group_key(api_type, complexity, repository)
+    if key not in sketches:
+        sketches[key] = {metric: new_sketch() for metric in METRICS}
+    sketch_add(sketches[key]['time_ms'], time_ms)
+    sketch_add(sketches[key]['size_bytes'], size_bytes)
+
+def sketches_from_dataframe(df):
+    """Constrói sketches por grupo a partir de um DataFrame já carregado"""
+    sketches = {}
+    for (api_type, complexity, repository), group in df.groupby(GROUP_FIELDS, observed=True):
+        key = group_key(api_type, complexity, repository)
+        sketches[key] = {}
+        for metric in METRICS:
+            sketch = new_sketch()
+            # Valores repetidos entram de uma só vez
+            for value, count in group[metric].value_counts().items():
+                sketch_add(sketch, value, int(count))
+            sketches[key][metric] = sketch
+    return sketches
+
+def merge_group_sketches(target, other):
+    """Combina dois conjuntos de sketches por grupo"""
+    for key, metrics in other.items():
+        if key not in target:
+            target[key] = {metric: new_sketch(metrics[metric]["alpha"]) for metric in METRICS}
+        for metric in METRICS:
+            sketch_merge(target[key][metric], metrics[metric])
+    return target
+
+def rollup(sketches, metric, by=('api_type',)):
+    """Agrega sketches para um nível mais grosso (ex.: por API e complexidade)"""
+    positions = [GROUP_FIELDS.index(field) for field in by]
+    rolled = {}
+    for key, metrics in sketches.items():
+        parts = split_key(key)
+        coarse = tuple(parts[i] for i in positions)
+        if coarse not in rolled:
+            rolled[coarse] = new_sketch(metrics[metric]["alpha"])
+        sketch_merge(rolled[coarse], metrics[metric])
+    return rolled
+
+# ============================================
+# PERSISTÊNCIA
+# ============================================
+
+def save_sketches(sketches, filepath):
+    """Salva os sketches em JSON"""
+    directory = os.path.dirname(filepath)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(sketches, f)
+
+def load_sketches(filepath):
+    """Carrega sketches salvos (chaves dos bins voltam a ser inteiros)"""
+    with open(filepath, encoding='utf-8') as f:
+        sketches = json.load(f)
+    for metrics in sketches.values():
+        for sketch in metrics.values():
+            sketch["bins"] = {int(index): count for index, count in sketch["bins"].items()}
+    return sketches
+
+def merge_sketch_files(filepaths):
+    """Combina fragmentos salvos por execuções paralelas/distribuídas"""
+    merged = {}
+    for filepath in filepaths:
+        merge_group_sketches(merged, load_sketches(filepath))
+    return merged
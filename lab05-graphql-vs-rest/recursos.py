@@ -0,0 +1,201 @@
+"""
+Uso de Recursos do Cliente: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Amostrador em segundo plano que registra, em intervalos fixos, a CPU do
+processo e do sistema, a memória residente (RSS), os sockets abertos e os
+contadores de rede da máquina cliente. As amostras vão para uma tabela
+lateral (resource_usage.csv) que se junta às medições pelo timestamp,
+permitindo correlacionar picos de latência com saturação do cliente.
+
+Usa psutil quando instalado; no Linux, sem psutil, lê /proc diretamente.
+Os dois caminhos somam as mesmas interfaces de rede: todas exceto loopback
+ou, com `loopback` (backend local, todo o tráfego em 127.0.0.1), todas.
+"""
+
+import csv
+import os
+import threading
+import time
+from datetime import datetime
+
+# Configuração
+SAMPLE_INTERVAL = 0.5               # Segundos entre amostras
+RESOURCES_FILE = "resource_usage.csv"
+MATCH_TOLERANCE = 2 * SAMPLE_INTERVAL  # Distância máxima medição -> amostra (s)
+FIELDS = ["timestamp", "process_cpu_percent", "system_cpu_percent", "rss_mb",
+          "open_sockets", "net_bytes_sent", "net_bytes_recv"]
+
+# Estado global do amostrador
+SAMPLES = []
+_thread = None
+_stop = threading.Event()
+
+# ============================================
+# LEITURA DOS RECURSOS (psutil ou /proc)
+# ============================================
+
+def proc_cpu_seconds():
+    """CPU (user + system) consumida por este processo, em segundos"""
+    times = os.times()
+    return times.user + times.system
+
+def proc_system_cpu():
+    """(ocupado, total) em jiffies a partir de /proc/stat"""
+    with open("/proc/stat") as f:
+        values = [int(v) for v in f.readline().split()[1:]]
+    idle = values[3] + (values[4] if len(values) > 4 else 0)  # idle + iowait
+    return sum(values) - idle, sum(values)
+
+def proc_rss_mb():
+    """Memória residente do processo (MiB) a partir de /proc/self/status"""
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024
+    return None
+
+def proc_open_sockets():
+    """Sockets abertos pelo processo (descritores que apontam para socket:)"""
+    count = 0
+    for fd in os.listdir("/proc/self/fd"):
+        try:
+            if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                count += 1
+        except OSError:
+            pass
+    return count
+
+def is_loopback(name):
+    """True para a interface de loopback (lo no Linux, lo0 no macOS)"""
+    return name == "lo" or (name.startswith("lo") and name[2:].isdigit())
+
+def proc_net_bytes(loopback=False):
+    """(enviados, recebidos) somados nas interfaces (loopback só se `loopback`)"""
+    sent = recv = 0
+    with open("/proc/net/dev") as f:
+        for line in f.readlines()[2:]:
+            name, data = line.split(":", 1)
+            if is_loopback(name.strip()) and not loopback:
+                continue
+            values = data.split()
+            recv += int(values[0])
+            sent += int(values[8])
+    return sent, recv
+
+def make_reader(loopback=False):
+    """Função que devolve uma amostra (dict) usando psutil ou /proc"""
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        process = psutil.Process()
+        process.cpu_percent(None)
+        psutil.cpu_percent(None)
+
+        def read_psutil():
+            nics = [counters for name, counters in psutil.net_io_counters(pernic=True).items()
+                    if loopback or not is_loopback(name)]
+            return {
+                "process_cpu_percent": process.cpu_percent(None),
+                "system_cpu_percent": psutil.cpu_percent(None),
+                "rss_mb": process.memory_info().rss / 2**20,
+                "open_sockets": len(process.net_connections(kind="inet")
+                                    if hasattr(process, "net_connections")
+                                    else process.connections(kind="inet")),
+                "net_bytes_sent": sum(nic.bytes_sent for nic in nics),
+                "net_bytes_recv": sum(nic.bytes_recv for nic in nics)
+            }
+        return read_psutil
+
+    if not os.path.exists("/proc/self/status"):
+        print("AVISO: psutil não instalado e /proc indisponível; apenas a CPU do processo será amostrada")
+    previous = {"wall": time.perf_counter(), "cpu": proc_cpu_seconds(), "system": None}
+
+    def read_proc():
+        wall, cpu = time.perf_counter(), proc_cpu_seconds()
+        sample = {"process_cpu_percent": 100 * (cpu - previous["cpu"]) / max(wall - previous["wall"], 1e-9)}
+        previous["wall"], previous["cpu"] = wall, cpu
+        if os.path.exists("/proc/self/status"):
+            busy, total = proc_system_cpu()
+            if previous["system"] is not None and total > previous["system"][1]:
+                sample["system_cpu_percent"] = (100 * (busy - previous["system"][0])
+                                                / (total - previous["system"][1]))
+            previous["system"] = (busy, total)
+            sample["rss_mb"] = proc_rss_mb()
+            sample["open_sockets"] = proc_open_sockets()
+            sample["net_bytes_sent"], sample["net_bytes_recv"] = proc_net_bytes(loopback)
+        return sample
+    return read_proc
+
+# ============================================
+# AMOSTRADOR EM SEGUNDO PLANO
+# ============================================
+
+def start_sampler(interval=SAMPLE_INTERVAL, loopback=False):
+    """Inicia a thread de amostragem (idempotente), descartando amostras de uma execução anterior"""
+    global _thread
+    if _thread is not None:
+        return
+    reader = make_reader(loopback)
+    SAMPLES.clear()
+    _stop.clear()
+
+    def loop():
+        while not _stop.wait(interval):
+            sample = reader()
+            SAMPLES.append({"timestamp": datetime.now().isoformat(),
+                            **{field: sample.get(field) for field in FIELDS[1:]}})
+
+    _thread = threading.Thread(target=loop, name="resource-sampler", daemon=True)
+    _thread.start()
+
+def stop_sampler():
+    """Encerra a thread de amostragem e devolve as amostras coletadas"""
+    global _thread
+    if _thread is not None:
+        _stop.set()
+        _thread.join()
+        _thread = None
+    return SAMPLES
+
+def save_samples(filepath):
+    """Salva as amostras na tabela lateral; sem amostras, remove a de uma execução anterior"""
+    if not SAMPLES:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+            print(f"Uso de recursos antigo removido: {filepath}")
+        return
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        for sample in SAMPLES:
+            writer.writerow({field: round(value, 3) if isinstance(value, float) else value
+                             for field, value in sample.items()})
+    print(f"Uso de recursos salvo em: {filepath} ({len(SAMPLES)} amostras)")
+
+# ============================================
+# JUNÇÃO COM AS MEDIÇÕES
+# ============================================
+
+def load_samples(filepath):
+    """Carrega as amostras e deriva as taxas de rede (bytes/s) entre amostras"""
+    import pandas as pd
+
+    samples = pd.read_csv(filepath, parse_dates=['timestamp']).sort_values('timestamp', ignore_index=True)
+    seconds = samples['timestamp'].diff().dt.total_seconds()
+    for direction in ['sent', 'recv']:
+        samples[f"net_{direction}_rate"] = samples[f"net_bytes_{direction}"].diff() / seconds
+    return samples
+
+def join_samples(df, samples, tolerance=MATCH_TOLERANCE):
+    """Associa a cada medição a amostra mais próxima no tempo (até `tolerance` s)"""
+    import pandas as pd
+
+    # O timestamp da medição é tomado no fim da requisição
+    measurements = df.assign(timestamp=pd.to_datetime(df['timestamp'])).sort_values('timestamp')
+    return pd.merge_asof(measurements, samples, on='timestamp', direction='nearest',
+                         tolerance=pd.Timedelta(seconds=tolerance))
@@ -0,0 +1,330 @@
+"""
+Relatório da Análise (JSON e HTML): GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Monta um objeto de relatório com a configuração da execução, os
+parâmetros da limpeza, as estatísticas descritivas com intervalos de
+confiança, os testes de RQ1/RQ2 e de cada nível de complexidade, os
+vereditos de normalidade e ajuste, os efeitos do modelo misto e as razões
+da análise Bayesiana, e o serializa em JSON e em um único HTML
+autocontido com gráficos SVG.
+
+O relatório guarda apenas agregados (estatísticas por grupo e histogramas
+com número fixo de classes), então o tempo de geração e o tamanho dos
+arquivos não crescem com o número de medições.
+"""
+
+import html
+import json
+import math
+import os
+import platform
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from scipy import stats
+
+# Configuração
+REPORT_JSON = "analysis_report.json"
+REPORT_HTML = "analysis_report.html"
+CONFIDENCE = 0.95
+HISTOGRAM_BINS = 40
+QUANTILES = [0.5, 0.9, 0.95, 0.99]
+RUN_CONFIG_FILE = "run_config.json"  # Gravado por experimento.save_results ao lado do CSV
+COLORS = {"REST": "#2E86AB", "GraphQL": "#E94F37"}
+
+# ============================================
+# OBJETO DO RELATÓRIO
+# ============================================
+
+def load_run_config(source):
+    """Configuração da execução que gerou `source` (run_config.json ao lado do CSV), ou {}"""
+    if not source:
+        return {}
+    filepath = os.path.join(os.path.dirname(source), RUN_CONFIG_FILE)
+    if not os.path.exists(filepath):
+        return {}
+    with open(filepath, encoding='utf-8') as f:
+        return json.load(f)
+
+def group_summary(df, metric):
+    """Estatísticas por (complexidade, API) com IC da média e percentis"""
+    grouped = df.groupby(['complexity', 'api_type'], observed=True)[metric]
+    summary = grouped.agg(['count', 'mean', 'std', 'min', 'median', 'max'])
+    quantiles = grouped.quantile(QUANTILES).unstack()
+    quantiles.columns = [f"p{int(q * 100)}" for q in QUANTILES]
+    summary = summary.join(quantiles)
+    margin = stats.t.ppf(0.5 + CONFIDENCE / 2, (summary['count'] - 1).clip(lower=1)) * \
+        summary['std'] / np.sqrt(summary['count'])
+    summary['ci_low'] = summary['mean'] - margin
+    summary['ci_high'] = summary['mean'] + margin
+    return summary.reset_index()
+
+def log_histograms(df, metric='time_ms', bins=HISTOGRAM_BINS):
+    """Histograma (classes logarítmicas comuns) da métrica por API"""
+    values = df[metric].to_numpy(dtype=float)
+    values = values[values > 0]
+    if not len(values):
+        return {}
+    edges = np.logspace(np.log10(values.min()), np.log10(values.max()), bins + 1)
+    return {
+        "edges": edges,
+        "counts": {api: np.histogram(df.loc[df['api_type'] == api, metric], bins=edges)[0]
+                   for api in ['REST', 'GraphQL']}
+    }
+
+def normality_summary(normality):
+    """Veredito e ajuste de cada (API, métrica) de analise.normality_tests, sem as subamostras"""
+    rows = []
+    for key, values in (normality or {}).items():
+        api, metric = key.split("_", 1)
+        rows.append({
+            "api_type": api,
+            "metric": metric,
+            "normal": values["normal"],
+            "w_median": values["statistic"],
+            "p_median": values["p_value"],
+            "shapiro_reject_rate": values["shapiro_reject_rate"],
+            "ad_statistic": values["ad_statistic"],
+            "best_fit": values["best_fit"],
+            **{f"ks_{name}": fit["ks_statistic"] for name, fit in values["fits"].items()}
+        })
+    return rows
+
+def mixed_summary(mixed):
+    """Variâncias, efeitos da API e previsões de analise.mixed_model_analysis (ou {})"""
+    if not mixed:
+        return {}
+    fit = mixed["fit"]
+    return {
+        "observations": fit["n"],
+        "repositories": len(fit["random_effects"]),
+        "converged": fit["converged"],
+        "tau": np.sqrt(fit["tau2"]),
+        "sigma": np.sqrt(fit["sigma2"]),
+        "icc": fit["tau2"] / (fit["tau2"] + fit["sigma2"]),
+        "effects": mixed["effects"].reset_index(),
+        "predictions": mixed["predictions"].reset_index()
+    }
+
+def bayesian_summary(bayesian):
+    """Razões REST / GraphQL por complexidade e por repositório de analise.bayesian_analysis (ou {})"""
+    if not bayesian:
+        return {}
+    return {level: frame.reset_index() for level, frame in bayesian.items()}
+
+def build_report(df, results, cleaning=None, complexity=None, source=None, extra=None,
+                 normality=None, mixed=None, bayesian=None):
+    """Objeto do relatório (apenas agregados; serializável em JSON)"""
+    return {
+        "meta": {
+            "generated_at": datetime.now().isoformat(timespec="seconds"),
+            "source": source,
+            "rows": len(df),
+            "python": platform.python_version(),
+            "pandas": pd.__version__,
+            "apis": sorted(map(str, df['api_type'].unique())),
+            "complexities": [str(c) for c in df['complexity'].unique()],
+            "repositories": int(df['repository'].nunique())
+        },
+        "run_config": load_run_config(source),
+        "cleaning": cleaning or {},
+        "descriptive": {metric: group_summary(df, metric) for metric in ['time_ms', 'size_bytes']},
+        "tests": results,
+        "complexity_tests": complexity or {},
+        "normality": normality_summary(normality),
+        "mixed_model": mixed_summary(mixed),
+        "bayesian": bayesian_summary(bayesian),
+        "histograms": {"time_ms": log_histograms(df)},
+        **(extra or {})
+    }
+
+# ============================================
+# JSON
+# ============================================
+
+def to_serializable(obj):
+    """Converte DataFrames, arrays e escalares numpy em tipos JSON (NaN -> null)"""
+    if isinstance(obj, pd.DataFrame):
+        return [to_serializable(row) for row in obj.to_dict(orient='records')]
+    if isinstance(obj, (pd.Series, np.ndarray)):
+        return [to_serializable(v) for v in obj.tolist()]
+    if isinstance(obj, dict):
+        return {"|".join(map(str, k)) if isinstance(k, tuple) else str(k): to_serializable(v)
+                for k, v in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return [to_serializable(v) for v in obj]
+    if isinstance(obj, (np.bool_, bool)):
+        return bool(obj)
+    if isinstance(obj, (np.integer, int)):
+        return int(obj)
+    if isinstance(obj, (np.floating, float)):
+        return None if not math.isfinite(obj) else float(obj)
+    if obj is None or isinstance(obj, str):
+        return obj
+    return str(obj)
+
+def save_json(report, filepath):
+    """Salva o relatório em JSON"""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        json.dump(to_serializable(report), f, ensure_ascii=False, indent=2)
+    print(f"Relatório JSON salvo em: {filepath}")
+
+# ============================================
+# GRÁFICOS SVG
+# ============================================
+
+def svg_bar_chart(summary, title, unit, width=640, height=300):
+    """Barras da média por complexidade e API com barras de erro do IC"""
+    margin = {"left": 70, "right": 20, "top": 40, "bottom": 50}
+    plot_w = width - margin["left"] - margin["right"]
+    plot_h = height - margin["top"] - margin["bottom"]
+    complexities = list(dict.fromkeys(summary['complexity'].astype(str)))
+    top = max(summary['ci_high'].max(), summary['mean'].max()) * 1.1 or 1
+    y = lambda v: margin["top"] + plot_h * (1 - v / top)
+    slot = plot_w / max(len(complexities), 1)
+    bar = slot * 0.35
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" role="img">',
+             f'<text x="{width / 2}" y="22" text-anchor="middle" class="title">{html.escape(title)}</text>']
+    for tick in np.linspace(0, top, 5):
+        parts.append(f'<line x1="{margin["left"]}" x2="{width - margin["right"]}" y1="{y(tick):.1f}" '
+                     f'y2="{y(tick):.1f}" class="grid"/>')
+        parts.append(f'<text x="{margin["left"] - 6}" y="{y(tick) + 4:.1f}" text-anchor="end">{tick:,.0f}</text>')
+    for i, complexity in enumerate(complexities):
+        x0 = margin["left"] + i * slot + slot * 0.15
+        for j, api in enumerate(['REST', 'GraphQL']):
+            row = summary[(summary['complexity'].astype(str) == complexity) & (summary['api_type'].astype(str) == api)]
+            if row.empty:
+                continue
+            row = row.iloc[0]
+            x = x0 + j * bar
+            parts.append(f'<rect x="{x:.1f}" y="{y(row["mean"]):.1f}" width="{bar * 0.9:.1f}" '
+                         f'height="{y(0) - y(row["mean"]):.1f}" fill="{COLORS[api]}">'
+                         f'<title>{api} {complexity}: {row["mean"]:,.1f} {unit} (n = {int(row["count"])})</title></rect>')
+            cx = x + bar * 0.45
+            parts.append(f'<line x1="{cx:.1f}" x2="{cx:.1f}" y1="{y(row["ci_low"]):.1f}" '
+                         f'y2="{y(row["ci_high"]):.1f}" class="err"/>')
+        parts.append(f'<text x="{x0 + bar:.1f}" y="{height - margin["bottom"] + 18}" '
+                     f'text-anchor="middle">{html.escape(complexity)}</text>')
+    parts.append(f'<text x="16" y="{margin["top"] + plot_h / 2}" transform="rotate(-90 16 '
+                 f'{margin["top"] + plot_h / 2})" text-anchor="middle">{html.escape(unit)}</text>')
+    parts.append(svg_legend(width - margin["right"] - 150, height - 18))
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+def svg_histogram(histogram, title, width=640, height=300):
+    """Histograma em escala log (contorno em degraus) por API"""
+    if not histogram:
+        return ""
+    margin = {"left": 60, "right": 20, "top": 40, "bottom": 50}
+    plot_w = width - margin["left"] - margin["right"]
+    plot_h = height - margin["top"] - margin["bottom"]
+    edges = np.log10(histogram["edges"])
+    top = max(max(counts.max() for counts in histogram["counts"].values()), 1) * 1.1
+    x = lambda v: margin["left"] + plot_w * (v - edges[0]) / ((edges[-1] - edges[0]) or 1)
+    y = lambda v: margin["top"] + plot_h * (1 - v / top)
+
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 {width} {height}" role="img">',
+             f'<text x="{width / 2}" y="22" text-anchor="middle" class="title">{html.escape(title)}</text>',
+             f'<line x1="{margin["left"]}" x2="{width - margin["right"]}" y1="{y(0)}" y2="{y(0)}" class="grid"/>']
+    for api, counts in histogram["counts"].items():
+        points = [f"{x(edges[0]):.1f},{y(0):.1f}"]
+        for left, right, count in zip(edges[:-1], edges[1:], counts):
+            points += [f"{x(left):.1f},{y(count):.1f}", f"{x(right):.1f},{y(count):.1f}"]
+        points.append(f"{x(edges[-1]):.1f},{y(0):.1f}")
+        parts.append(f'<polyline points="{" ".join(points)}" fill="{COLORS[api]}" fill-opacity="0.25" '
+                     f'stroke="{COLORS[api]}" stroke-width="1.5"/>')
+    for decade in range(int(np.floor(edges[0])), int(np.ceil(edges[-1])) + 1):
+        if edges[0] <= decade <= edges[-1]:
+            parts.append(f'<text x="{x(decade):.1f}" y="{height - margin["bottom"] + 18}" '
+                         f'text-anchor="middle">{10 ** decade:,.0f} ms</text>')
+    parts.append(svg_legend(width - margin["right"] - 150, height - 18))
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+def svg_legend(x, y):
+    """Legenda REST / GraphQL"""
+    return "".join(f'<rect x="{x + i * 75}" y="{y - 10}" width="12" height="12" fill="{COLORS[api]}"/>'
+                   f'<text x="{x + i * 75 + 16}" y="{y}">{api}</text>'
+                   for i, api in enumerate(['REST', 'GraphQL']))
+
+# ============================================
+# HTML
+# ============================================
+
+def html_table(rows, columns):
+    """Tabela HTML a partir de uma lista de dicionários"""
+    def cell(value):
+        if isinstance(value, float):
+            return f"{value:,.4g}" if abs(value) < 1e-3 and value != 0 else f"{value:,.2f}"
+        return html.escape(str(value))
+    head = "".join(f"<th>{html.escape(c)}</th>" for c in columns)
+    body = "".join("<tr>" + "".join(f"<td>{cell(row.get(c, ''))}</td>" for c in columns) + "</tr>"
+                   for row in rows)
+    return f"<table><thead><tr>{head}</tr></thead><tbody>{body}</tbody></table>"
+
+def render_html(report):
+    """HTML autocontido (CSS e SVG embutidos) do relatório"""
+    data = to_serializable(report)
+    meta = data["meta"]
+    columns = ["complexity", "api_type", "count", "mean", "ci_low", "ci_high", "median", "p90", "p95", "p99"]
+    tests = [{"RQ": rq, **{k: v for k, v in values.items() if not isinstance(v, (dict, list))}}
+             for rq, values in data["tests"].items()]
+    complexity_tests = [{"grupo": key, **values} for key, values in data["complexity_tests"].items()]
+    sections = [
+        f"<h1>GraphQL vs REST: relatório da análise</h1>",
+        f"<p class='meta'>Gerado em {meta['generated_at']} | {meta['rows']:,} medições | "
+        f"{meta['repositories']} repositórios | fonte: {html.escape(str(meta['source']))}</p>",
+        "<h2>Tempo de resposta</h2>",
+        svg_bar_chart(report["descriptive"]["time_ms"], "Tempo médio (IC 95%)", "ms"),
+        svg_histogram(report["histograms"]["time_ms"], "Distribuição do tempo (escala log)"),
+        html_table(data["descriptive"]["time_ms"], columns),
+        "<h2>Tamanho da resposta</h2>",
+        svg_bar_chart(report["descriptive"]["size_bytes"], "Tamanho médio (IC 95%)", "bytes"),
+        html_table(data["descriptive"]["size_bytes"], columns),
+        "<h2>Testes de hipóteses</h2>",
+        html_table(tests, list(tests[0].keys()) if tests else []),
+    ]
+    if complexity_tests:
+        sections += ["<h2>Testes por complexidade</h2>",
+                     html_table(complexity_tests, list(complexity_tests[0].keys()))]
+    if data["normality"]:
+        sections += ["<h2>Normalidade e ajuste de distribuições</h2>",
+                     html_table(data["normality"], list(data["normality"][0].keys()))]
+    mixed = data["mixed_model"]
+    if mixed:
+        sections += ["<h2>Modelo misto: razão GraphQL / REST ajustada por repositório</h2>",
+                     f"<p class='meta'>{mixed['observations']:,} observações | {mixed['repositories']} repositórios | "
+                     f"τ = {mixed['tau']:.4f} | σ = {mixed['sigma']:.4f} | ICC = {mixed['icc']:.3f}"
+                     f"{'' if mixed['converged'] else ' | sem convergência'}</p>",
+                     html_table(mixed["effects"], list(mixed["effects"][0].keys())),
+                     html_table(mixed["predictions"], list(mixed["predictions"][0].keys()))]
+    levels = {"complexity": "complexidade", "repository": "complexidade e repositório"}
+    for level, rows in data["bayesian"].items():
+        if rows:
+            sections += [f"<h2>Análise Bayesiana: razão REST / GraphQL por {levels.get(level, level)}</h2>",
+                         html_table(rows, list(rows[0].keys()))]
+    sections += [
+        "<h2>Limpeza</h2>", html_table([data["cleaning"]], list(data["cleaning"].keys())) if data["cleaning"] else "<p>-</p>",
+        "<h2>Configuração da execução</h2>",
+        html_table([{"parâmetro": k, "valor": v if not isinstance(v, list) else ", ".join(map(str, v))}
+                    for k, v in data["run_config"].items()], ["parâmetro", "valor"]),
+    ]
+    style = ("body{font-family:system-ui,sans-serif;max-width:980px;margin:2em auto;color:#222}"
+             "table{border-collapse:collapse;margin:1em 0;font-size:13px}"
+             "th,td{border:1px solid #ddd;padding:4px 8px;text-align:right}th{background:#f4f4f4}"
+             "svg{width:100%;max-width:640px;font-size:11px;display:block;margin:1em 0}"
+             "svg .title{font-size:14px;font-weight:bold}svg .grid{stroke:#ddd}"
+             "svg .err{stroke:#222;stroke-width:1.5}.meta{color:#666}")
+    return (f"<!DOCTYPE html><html lang='pt-BR'><head><meta charset='utf-8'>"
+            f"<title>GraphQL vs REST</title><style>{style}</style></head><body>"
+            + "\n".join(sections) + "</body></html>")
+
+def save_html(report, filepath):
+    """Salva o relatório HTML"""
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(render_html(report))
+    print(f"Relatório HTML salvo em: {filepath}")
@@ -0,0 +1,98 @@
+"""
+Correção de RTT: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Estima o tempo de processamento no servidor subtraindo de `time_ms` o RTT
+de rede medido pelas sondas de linha de base (baseline_rtt.csv) mais
+próximas no tempo (apenas sondas a até MAX_PROBE_DISTANCE segundos da
+medição; sem nenhuma, rtt_ms e server_ms ficam NaN), multiplicado pelo número de requisições sequenciais de
+cada tratamento (REST médio faz 2, REST complexo faz 4). Sub-requisições
+multiplexadas em HTTP/2 (coluna `multiplexed`) contam como uma só; lotes
+paralelos em conexões HTTP/1.1 (`parallel` sem `multiplexed`) contam cada
+requisição. Em arquivos sem a coluna, vale o protocolo (REST em HTTP/2). Nas consultas
+aninhadas vale a coluna `requests` (ou, multiplexadas, um lote paralelo por
+nível de profundidade).
+"""
+
+import warnings
+
+import numpy as np
+import pandas as pd
+
+# Configuração
+BASELINE_FILE = "baseline_rtt.csv"
+NEAREST_PROBES = 5          # Sondas mais próximas usadas na mediana do RTT
+MAX_PROBE_DISTANCE = 60.0   # Segundos: sondas mais distantes da medição são ignoradas
+
+# Requisições HTTP sequenciais por tratamento
+ROUND_TRIPS = {
+    ("REST", "simple"): 1,
+    ("REST", "medium"): 2,
+    ("REST", "complex"): 4,
+    ("GraphQL", "simple"): 1,
+    ("GraphQL", "medium"): 1,
+    ("GraphQL", "complex"): 1,
+}
+
+# ============================================
+# SONDAS DE LINHA DE BASE
+# ============================================
+
+def load_baseline(filepath):
+    """Carrega as sondas válidas (status < 400) em ordem temporal"""
+    baseline = pd.read_csv(filepath, parse_dates=['timestamp'])
+    baseline = baseline[baseline['status'] < 400]
+    return baseline.sort_values('timestamp', ignore_index=True)
+
+def nearest_rtt(timestamps, baseline, k=NEAREST_PROBES, window=MAX_PROBE_DISTANCE):
+    """Mediana do RTT das k sondas mais próximas de cada timestamp (vetorizado)
+
+    Sondas a mais de `window` segundos não entram na mediana; sem nenhuma
+    dentro da janela, o RTT da medição é NaN.
+    """
+    probe_times = baseline['timestamp'].to_numpy('datetime64[ns]').astype(np.int64)
+    probe_rtt = baseline['rtt_ms'].to_numpy(dtype=float)
+    times = pd.to_datetime(timestamps).to_numpy('datetime64[ns]').astype(np.int64)
+    k = min(k, len(probe_times))
+
+    # Candidatas: k sondas de cada lado da posição de inserção
+    pos = np.searchsorted(probe_times, times)
+    candidates = pos[:, None] + np.arange(-k, k)[None, :]
+    valid = (candidates >= 0) & (candidates < len(probe_times))
+    candidates = candidates.clip(0, len(probe_times) - 1)
+    distance = np.where(valid, np.abs(probe_times[candidates] - times[:, None]), np.iinfo(np.int64).max)
+
+    order = np.argpartition(distance, k - 1, axis=1)[:, :k]
+    nearest = np.take_along_axis(candidates, order, axis=1)
+    rtt = np.where(np.take_along_axis(distance, order, axis=1) <= window * 1e9, probe_rtt[nearest], np.nan)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # Linhas sem sonda na janela
+        return np.nanmedian(rtt, axis=1)
+
+# ============================================
+# ESTIMATIVA DO TEMPO NO SERVIDOR
+# ============================================
+
+def estimate_server_time(df, baseline, k=NEAREST_PROBES, window=MAX_PROBE_DISTANCE):
+    """Acrescenta rtt_ms, round_trips e server_ms (time_ms - round_trips * rtt_ms)"""
+    trips = {f"{api}|{complexity}": n for (api, complexity), n in ROUND_TRIPS.items()}
+    keys = df['api_type'].astype(str) + "|" + df['complexity'].astype(str)
+    round_trips = keys.map(trips).fillna(1).to_numpy(dtype=np.int16)
+    if 'requests' in df.columns:
+        nested = df['requests'].notna().to_numpy()
+        round_trips[nested] = df['requests'].to_numpy()[nested]
+    if 'multiplexed' in df.columns:
+        parallel = df['multiplexed'].fillna(False).to_numpy(dtype=bool)
+    elif 'protocol' in df.columns:
+        parallel = ((df['protocol'].astype(str) == "HTTP/2") & (df['api_type'] == "REST")).to_numpy()
+    else:
+        parallel = np.zeros(len(df), dtype=bool)
+    batches = df['depth'].fillna(1).to_numpy(dtype=np.int16) if 'depth' in df.columns else 1
+    round_trips[parallel] = np.broadcast_to(batches, round_trips.shape)[parallel]
+    rtt = nearest_rtt(df['timestamp'], baseline, k, window)
+    return df.assign(
+        rtt_ms=rtt.round(2),
+        round_trips=round_trips,
+        server_ms=(df['time_ms'].to_numpy() - round_trips * rtt).clip(min=0).round(2)
+    )
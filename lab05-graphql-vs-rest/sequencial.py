@@ -0,0 +1,68 @@
+"""
+Testes Sequenciais: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Teste sequencial em grupo (fronteiras de O'Brien-Fleming) usado pelo modo
+adaptativo do experimento. Cada célula (complexity, repository) é avaliada
+após cada rodada de medições; quando a diferença REST vs GraphQL já é
+decisiva a célula para, e o orçamento restante vai para as células
+ainda indecisas, preservando o nível de significância global da célula.
+"""
+
+import math
+import random
+from statistics import NormalDist, fmean, variance
+
+# ============================================
+# FRONTEIRAS DE O'BRIEN-FLEMING
+# ============================================
+
+def obrien_fleming_constant(max_looks, alpha=0.05, sims=20000, seed=42):
+    """Constante C tal que P(|Z_k| > C*sqrt(K/k) para algum k) = alpha sob H0
+
+    Estimada por simulação do movimento browniano nas K análises interinas.
+    """
+    rng = random.Random(seed)
+    maxima = []
+    for _ in range(sims):
+        total = 0.0
+        worst = 0.0
+        for _ in range(max_looks):
+            total += rng.gauss(0, 1)
+            # |Z_k| / sqrt(K/k) = |S_k| / sqrt(K)
+            worst = max(worst, abs(total))
+        maxima.append(worst / math.sqrt(max_looks))
+    maxima.sort()
+    return maxima[min(int((1 - alpha) * sims), sims - 1)]
+
+def boundary(look, max_looks, constant):
+    """Valor crítico |z| na análise interina `look` (1..max_looks)"""
+    return constant * math.sqrt(max_looks / look)
+
+# ============================================
+# ESTATÍSTICA E DECISÃO POR CÉLULA
+# ============================================
+
+def welch_z(a, b):
+    """Estatística z de Welch sobre o log dos tempos (a - b)"""
+    log_a = [math.log(x) for x in a]
+    log_b = [math.log(x) for x in b]
+    se = math.sqrt(variance(log_a) / len(log_a) + variance(log_b) / len(log_b))
+    if se == 0:
+        return 0.0
+    return (fmean(log_a) - fmean(log_b)) / se
+
+def cell_decision(rest_times, graphql_times, look, max_looks, constant):
+    """Retorna (decisão, z, fronteira); decisão é 'REST', 'GraphQL' (mais rápido) ou None"""
+    if min(len(rest_times), len(graphql_times)) < 2:
+        return None, 0.0, float('inf')
+    z = welch_z(rest_times, graphql_times)
+    critical = boundary(look, max_looks, constant)
+    if abs(z) < critical:
+        return None, z, critical
+    return ("GraphQL" if z > 0 else "REST"), z, critical
+
+def z_to_p(z):
+    """p-valor bilateral nominal de um z (sem ajuste sequencial)"""
+    return 2 * (1 - NormalDist().cdf(abs(z)))
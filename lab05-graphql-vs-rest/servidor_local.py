@@ -0,0 +1,734 @@
+"""
+Servidor Local de Referência (REST + GraphQL): GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Serviço REST e GraphQL sobre um conjunto de dados sintético e
+determinístico (repositórios, issues, comentários, contribuidores, branches
+e usuários), só com a biblioteca padrão (http.server). Os endpoints REST
+reproduzem os caminhos e o formato das respostas do GitHub usados pelo
+experimento (incluindo ETag / If-None-Match), e o endpoint /graphql executa
+o subconjunto do esquema do GitHub usado pelas consultas simple, medium,
+complex e aninhadas, com um interpretador GraphQL mínimo (seleções,
+argumentos, variáveis, aliases e fragmentos inline).
+
+Todas as respostas trazem um header Server-Timing: tempo do handler REST
+ou das fases GraphQL (parse, execute e cada campo do segundo nível, ex.:
+"repository.issues") e da serialização (subrequisicoes.py).
+
+Repositórios "volume/i{issues}-c{contributors}-b{branches}-t{text_size}"
+(volume.py) são gerados na primeira consulta, com o volume do nome.
+
+Como o servidor roda na própria máquina, ele pode ser perfilado e isola a
+comparação das variações de rede e de carga da API pública.
+
+Uso:
+    python servidor_local.py [--host 127.0.0.1] [--port 8765] [--seed 42]
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import re
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from datetime import datetime, timedelta
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+from volume import VOLUME_OWNER, parse_volume
+
+# Configuração
+HOST = "127.0.0.1"
+PORT = 8765
+SEED = 42
+OWNER = "local"
+NUM_REPOS = 10
+NUM_USERS = 40
+ISSUES_PER_REPO = 50
+COMMENTS_PER_ISSUE = 5
+CONTRIBUTORS_PER_REPO = 30
+BRANCHES_PER_REPO = 20
+PROJECTS_PER_USER = 3   # Repositórios próprios de cada usuário (/users/{login}/repos)
+TEXT_SIZE = 200         # Caracteres dos campos de texto livre (description, body)
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 1000     # Acima do limite do GitHub (100): páginas da varredura de volume
+START_TIMEOUT = 10.0    # Segundos para o servidor responder após subir
+
+WORDS = ("api query schema latency cache client server request response field "
+         "payload network resolver endpoint token index commit branch issue merge").split()
+LANGUAGES = ["Python", "JavaScript", "TypeScript", "Go", "Rust", "Java", "C", "C++"]
+EPOCH = datetime(2020, 1, 1)
+
+# ============================================
+# DADOS SINTÉTICOS
+# ============================================
+
+def repository_ids(num_repos=NUM_REPOS):
+    """Identificadores (owner, repo) dos repositórios usados no experimento"""
+    return [(OWNER, f"repo-{i}") for i in range(num_repos)]
+
+def text(rng, size=TEXT_SIZE):
+    """Texto pseudoaleatório com aproximadamente `size` caracteres"""
+    words, length = [], 0
+    while length < size:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return " ".join(words)[:size]
+
+def timestamp(rng, start=EPOCH, days=1500):
+    """Data ISO 8601 (formato do GitHub) sorteada após `start`"""
+    moment = start + timedelta(seconds=rng.randrange(days * 86400))
+    return moment.strftime("%Y-%m-%dT%H:%M:%SZ")
+
+def user_summary(login, base):
+    """Resumo de usuário embutido nas respostas REST (owner, user, contribuidores)"""
+    return {
+        "login": login,
+        "id": int(hashlib.sha1(login.encode()).hexdigest()[:8], 16),
+        "avatar_url": f"{base}/avatars/{login}",
+        "url": f"{base}/users/{login}",
+        "html_url": f"{base}/{login}",
+        "repos_url": f"{base}/users/{login}/repos",
+        "type": "User",
+        "site_admin": False
+    }
+
+def make_repository(rng, owner, name, logins, base, issues=ISSUES_PER_REPO,
+                    contributors=CONTRIBUTORS_PER_REPO, branches=BRANCHES_PER_REPO,
+                    comments=COMMENTS_PER_ISSUE, text_size=TEXT_SIZE):
+    """Repositório (formato REST) com issues, comentários, contribuidores e branches"""
+    full_name = f"{owner}/{name}"
+    url = f"{base}/repos/{full_name}"
+    created = timestamp(rng)
+    issue_list = []
+    for number in range(issues, 0, -1):  # Mais recentes primeiro, como no GitHub
+        author = rng.choice(logins)
+        issue_list.append({
+            "id": rng.randrange(10 ** 9),
+            "url": f"{url}/issues/{number}",
+            "html_url": f"{base}/{full_name}/issues/{number}",
+            "number": number,
+            "title": text(rng, 60),
+            "user": user_summary(author, base),
+            "labels": [{"name": rng.choice(WORDS), "color": f"{rng.randrange(16 ** 6):06x}"}
+                       for _ in range(rng.randrange(3))],
+            "state": rng.choice(["open", "closed"]),
+            "comments": comments,
+            "created_at": (EPOCH + timedelta(days=number)).strftime("%Y-%m-%dT%H:%M:%SZ"),
+            "updated_at": timestamp(rng),
+            "body": text(rng, text_size),
+            "comment_list": [{
+                "id": rng.randrange(10 ** 9),
+                "url": f"{url}/issues/comments/{number}{c}",
+                "user": user_summary(rng.choice(logins), base),
+                "created_at": timestamp(rng),
+                "body": text(rng, text_size)
+            } for c in range(comments)]
+        })
+    return {
+        "id": rng.randrange(10 ** 9),
+        "name": name,
+        "full_name": full_name,
+        "private": False,
+        "owner": user_summary(owner, base),
+        "html_url": f"{base}/{full_name}",
+        "description": text(rng, text_size),
+        "fork": False,
+        "url": url,
+        "issues_url": f"{url}/issues",
+        "contributors_url": f"{url}/contributors",
+        "branches_url": f"{url}/branches",
+        "created_at": created,
+        "updated_at": timestamp(rng),
+        "pushed_at": timestamp(rng),
+        "size": rng.randrange(100, 500000),
+        "stargazers_count": rng.randrange(100000),
+        "watchers_count": rng.randrange(100000),
+        "forks_count": rng.randrange(20000),
+        "open_issues_count": sum(issue["state"] == "open" for issue in issue_list),
+        "language": rng.choice(LANGUAGES),
+        "license": {"key": "mit", "name": "MIT License"},
+        "topics": rng.sample(WORDS, 4),
+        "default_branch": "main",
+        "issue_list": issue_list,
+        "contributor_list": [{**user_summary(login, base), "contributions": rng.randrange(1, 5000)}
+                             for login in rng.sample(logins, min(contributors, len(logins)))],
+        "branch_list": [{"name": "main" if i == 0 else f"feature-{i}",
+                         "commit": {"sha": f"{rng.getrandbits(160):040x}", "url": f"{url}/commits/{i}"},
+                         "protected": i == 0}
+                        for i in range(branches)]
+    }
+
+def make_user(rng, i, base):
+    """Usuário (formato REST) user-{i}, sem repositórios próprios"""
+    login = f"user-{i}"
+    return {**user_summary(login, base), "name": f"User {i}", "company": None,
+            "location": rng.choice(["Belo Horizonte", "São Paulo", "Lisboa", None]),
+            "bio": text(rng, 80), "followers": rng.randrange(1000),
+            "following": rng.randrange(100), "created_at": timestamp(rng),
+            "projects": [], "public_repos": 0}
+
+def ensure_users(data, count):
+    """Logins de pelo menos `count` usuários, criando os que faltarem"""
+    users = data["users"]
+    for i in range(len(users), count):
+        # Gerador próprio: os dados do usuário não dependem da ordem das consultas
+        users[f"user-{i}"] = make_user(random.Random(f"{data['seed']}:user-{i}"), i, data["base"])
+    return list(users)[:max(count, NUM_USERS)]
+
+def make_dataset(seed=SEED, base=f"http://{HOST}:{PORT}", num_repos=NUM_REPOS):
+    """Conjunto de dados completo: usuários e repositórios indexados por nome"""
+    rng = random.Random(seed)
+    users = {}
+    for i in range(NUM_USERS):
+        user = make_user(rng, i, base)
+        users[user["login"]] = user
+    logins = list(users)
+    repos = {}
+    for owner, name in repository_ids(num_repos):
+        repos[f"{owner}/{name}"] = make_repository(rng, owner, name, logins, base)
+    for login, user in users.items():
+        for i in range(PROJECTS_PER_USER):
+            project = make_repository(rng, login, f"project-{i}", logins, base, issues=0,
+                                      contributors=1, branches=1, comments=0)
+            repos[project["full_name"]] = project
+            user["projects"].append(project["full_name"])
+        user["public_repos"] = len(user["projects"])
+    return {"users": users, "repos": repos, "base": base, "seed": seed, "signature": data_signature(seed),
+            "lock": threading.Lock()}
+
+def data_signature(seed=SEED):
+    """Assinatura dos dados gerados: semente, tamanhos e código deste módulo"""
+    digest = hashlib.sha1(json.dumps([seed, NUM_REPOS, NUM_USERS, ISSUES_PER_REPO, COMMENTS_PER_ISSUE,
+                                      CONTRIBUTORS_PER_REPO, BRANCHES_PER_REPO, PROJECTS_PER_USER,
+                                      TEXT_SIZE, MAX_PER_PAGE]).encode())
+    with open(os.path.abspath(__file__), 'rb') as f:
+        digest.update(f.read())
+    return digest.hexdigest()
+
+def get_repository(data, full_name):
+    """Repositório pelo nome; os de volume são gerados (uma vez) na primeira consulta"""
+    repo = data["repos"].get(full_name)
+    if repo is not None:
+        return repo
+    owner, _, name = full_name.partition("/")
+    point = parse_volume(name) if owner == VOLUME_OWNER else None
+    if point is None:
+        return None
+    with data["lock"]:
+        if full_name not in data["repos"]:
+            rng = random.Random(f"{data['seed']}:{full_name}")
+            logins = ensure_users(data, point["contributors"])
+            data["repos"][full_name] = make_repository(
+                rng, owner, name, logins, data["base"], issues=point["issues"],
+                contributors=point["contributors"], branches=point["branches"],
+                text_size=point["text_size"])
+    return data["repos"][full_name]
+
+def public(item):
+    """Remove as listas internas (issue_list, projects, ...) do objeto REST"""
+    return {key: value for key, value in item.items() if not key.endswith(("_list", "projects"))}
+
+# ============================================
+# ENDPOINTS REST (MESMOS CAMINHOS DO GITHUB)
+# ============================================
+
+def page(items, query):
+    """Fatia de uma lista paginada por per_page e page"""
+    per_page = min(int(query.get("per_page", [DEFAULT_PER_PAGE])[0]), MAX_PER_PAGE)
+    number = max(int(query.get("page", [1])[0]), 1)
+    return items[(number - 1) * per_page:number * per_page]
+
+def rest_root(data, query):
+    return {"current_user_url": "/user", "repository_url": "/repos/{owner}/{repo}"}
+
+def rest_meta(data, query):
+    return {"seed": data["seed"], "signature": data["signature"]}  # Identidade dos dados servidos
+
+def rest_noop(data, query):
+    return {}  # Sem trabalho: piso do harness na calibração (calibracao.py)
+
+def rest_user_self(data, query):
+    return {"login": OWNER, "type": "User"}
+
+def rest_repository(data, query, full_name):
+    repo = get_repository(data, full_name)
+    return public(repo) if repo else None
+
+def rest_issues(data, query, full_name):
+    repo = get_repository(data, full_name)
+    if repo is None:
+        return None
+    state = query.get("state", ["open"])[0]
+    issues = [i for i in repo["issue_list"] if state == "all" or i["state"] == state]
+    return [public(i) for i in page(issues, query)]
+
+def rest_issue_comments(data, query, full_name, number):
+    repo = get_repository(data, full_name)
+    issue = next((i for i in repo["issue_list"] if i["number"] == int(number)), None) if repo else None
+    return page(issue["comment_list"], query) if issue else None
+
+def rest_contributors(data, query, full_name):
+    repo = get_repository(data, full_name)
+    return page(repo["contributor_list"], query) if repo else None
+
+def rest_branches(data, query, full_name):
+    repo = get_repository(data, full_name)
+    return page(repo["branch_list"], query) if repo else None
+
+def rest_user(data, query, login):
+    user = data["users"].get(login)
+    return public(user) if user else None
+
+def rest_user_repos(data, query, login):
+    user = data["users"].get(login)
+    return [public(data["repos"][name]) for name in page(user["projects"], query)] if user else None
+
+ROUTES = [
+    (re.compile(r"^/$"), rest_root),
+    (re.compile(r"^/noop$"), rest_noop),
+    (re.compile(r"^/meta$"), rest_meta),
+    (re.compile(r"^/user$"), rest_user_self),
+    (re.compile(r"^/repos/([^/]+/[^/]+)$"), rest_repository),
+    (re.compile(r"^/repos/([^/]+/[^/]+)/issues$"), rest_issues),
+    (re.compile(r"^/repos/([^/]+/[^/]+)/issues/(\d+)/comments$"), rest_issue_comments),
+    (re.compile(r"^/repos/([^/]+/[^/]+)/contributors$"), rest_contributors),
+    (re.compile(r"^/repos/([^/]+/[^/]+)/branches$"), rest_branches),
+    (re.compile(r"^/users/([^/]+)$"), rest_user),
+    (re.compile(r"^/users/([^/]+)/repos$"), rest_user_repos),
+]
+
+def route(data, url):
+    """(status, corpo) da requisição REST GET para `url` (caminho + query string)"""
+    parts = urlsplit(url)
+    query = parse_qs(parts.query)
+    for pattern, handler in ROUTES:
+        match = pattern.match(parts.path)
+        if match:
+            try:
+                payload = handler(data, query, *match.groups())
+            except ValueError:
+                return 400, {"message": "Bad Request"}
+            if payload is None:
+                return 404, {"message": "Not Found"}
+            return 200, payload
+    return 404, {"message": "Not Found"}
+
+# ============================================
+# GRAPHQL (INTERPRETADOR MÍNIMO)
+# ============================================
+
+class GraphQLError(Exception):
+    """Erro de sintaxe ou de execução de uma consulta GraphQL"""
+
+TOKEN_PATTERN = re.compile(r"""
+    (?P<skip>[\s,]+|\#[^\n]*)
+  | (?P<punct>\.\.\.|[{}()\[\]:!$=@])
+  | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+  | (?P<string>"(?:[^"\\]|\\.)*")
+  | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+""", re.VERBOSE)
+
+def tokenize(source):
+    """Lista de (tipo, texto) da consulta, terminada em ("eof", "")"""
+    tokens, pos = [], 0
+    while pos < len(source):
+        match = TOKEN_PATTERN.match(source, pos)
+        if not match:
+            raise GraphQLError(f"Caractere inesperado na posição {pos}: {source[pos]!r}")
+        if match.lastgroup != "skip":
+            tokens.append((match.lastgroup, match.group()))
+        pos = match.end()
+    tokens.append(("eof", ""))
+    return tokens
+
+def expect(tokens, i, value):
+    """Avança sobre o token `value` (ou falha)"""
+    if tokens[i][1] != value:
+        raise GraphQLError(f"Esperado '{value}', encontrado '{tokens[i][1] or 'fim da consulta'}'")
+    return i + 1
+
+def parse_document(source):
+    """Seleções da operação (query, anônima ou nomeada; definições de variáveis ignoradas)"""
+    tokens = tokenize(source)
+    i = 0
+    if tokens[i][0] == "name":
+        if tokens[i][1] != "query":
+            raise GraphQLError(f"Operação não suportada: {tokens[i][1]}")
+        i += 1
+        if tokens[i][0] == "name":
+            i += 1
+        if tokens[i][1] == "(":
+            depth = 0
+            while True:
+                if tokens[i][0] == "eof":
+                    raise GraphQLError("Definição de variáveis não terminada")
+                depth += {"(": 1, ")": -1}.get(tokens[i][1], 0)
+                i += 1
+                if depth == 0:
+                    break
+    selections, i = parse_selection_set(tokens, i)
+    if tokens[i][0] != "eof":
+        raise GraphQLError(f"Texto inesperado após a consulta: '{tokens[i][1]}'")
+    return selections
+
+def parse_selection_set(tokens, i):
+    """Campos e fragmentos inline entre chaves"""
+    i = expect(tokens, i, "{")
+    selections = []
+    while tokens[i][1] != "}":
+        if tokens[i][0] == "eof":
+            raise GraphQLError("Fim inesperado da consulta")
+        if tokens[i][1] == "...":
+            type_condition = None
+            if tokens[i + 1] == ("name", "on"):
+                type_condition, i = tokens[i + 2][1], i + 3
+            else:
+                i += 1
+            inner, i = parse_selection_set(tokens, i)
+            selections.append({"fragment": type_condition, "selections": inner})
+            continue
+        if tokens[i][0] != "name":
+            raise GraphQLError(f"Nome de campo esperado, encontrado '{tokens[i][1]}'")
+        alias = name = tokens[i][1]
+        i += 1
+        if tokens[i][1] == ":":
+            if tokens[i + 1][0] != "name":
+                raise GraphQLError(f"Nome de campo esperado após '{alias}:'")
+            name, i = tokens[i + 1][1], i + 2
+        arguments = {}
+        if tokens[i][1] == "(":
+            arguments, i = parse_arguments(tokens, i)
+        inner = None
+        if tokens[i][1] == "{":
+            inner, i = parse_selection_set(tokens, i)
+        selections.append({"name": name, "alias": alias, "arguments": arguments, "selections": inner})
+    return selections, i + 1
+
+def parse_arguments(tokens, i):
+    """Argumentos (nome: valor) entre parênteses"""
+    i = expect(tokens, i, "(")
+    arguments = {}
+    while tokens[i][1] != ")":
+        if tokens[i][0] != "name":
+            raise GraphQLError(f"Nome de argumento esperado, encontrado '{tokens[i][1]}'")
+        name = tokens[i][1]
+        i = expect(tokens, i + 1, ":")
+        arguments[name], i = parse_value(tokens, i)
+    return arguments, i + 1
+
+def parse_value(tokens, i):
+    """Valor literal, enum, lista, objeto ou variável (("$", nome))"""
+    kind, value = tokens[i]
+    if value == "$":
+        return ("$", tokens[i + 1][1]), i + 2
+    if value == "[":
+        items, i = [], i + 1
+        while tokens[i][1] != "]":
+            item, i = parse_value(tokens, i)
+            items.append(item)
+        return items, i + 1
+    if value == "{":
+        fields, i = {}, i + 1
+        while tokens[i][1] != "}":
+            name = tokens[i][1]
+            i = expect(tokens, i + 1, ":")
+            fields[name], i = parse_value(tokens, i)
+        return fields, i + 1
+    if kind == "number":
+        return (float(value) if any(c in value for c in ".eE") else int(value)), i + 1
+    if kind == "string":
+        return json.loads(value), i + 1
+    if kind == "name":
+        return {"true": True, "false": False, "null": None}.get(value, value), i + 1
+    raise GraphQLError(f"Valor inesperado: '{value}'")
+
+def resolve_value(value, variables):
+    """Substitui as variáveis de um valor de argumento"""
+    if isinstance(value, tuple):
+        if value[1] not in variables:
+            raise GraphQLError(f"Variável não informada: ${value[1]}")
+        return variables[value[1]]
+    if isinstance(value, list):
+        return [resolve_value(v, variables) for v in value]
+    if isinstance(value, dict):
+        return {k: resolve_value(v, variables) for k, v in value.items()}
+    return value
+
+def execute_selections(obj, selections, variables, timings=None, path=()):
+    """Resolve as seleções sobre um objeto (campos podem ser funções dos argumentos)
+
+    Com `timings`, acumula o tempo (ms) de cada campo com subseleção do
+    segundo nível (ex.: "repository.issues") para o header Server-Timing.
+    """
+    result = {}
+    for selection in selections:
+        if "fragment" in selection:
+            if selection["fragment"] in (None, obj.get("__typename")):
+                result.update(execute_selections(obj, selection["selections"], variables, timings, path))
+            continue
+        name = selection["name"]
+        start = time.perf_counter()
+        if name not in obj:
+            raise GraphQLError(f"Field '{name}' doesn't exist on type '{obj.get('__typename')}'")
+        value = obj[name]
+        if callable(value):
+            arguments = {k: resolve_value(v, variables) for k, v in selection["arguments"].items()}
+            try:
+                value = value(**arguments)
+            except TypeError as e:
+                raise GraphQLError(f"Argumentos inválidos para '{name}': {e}")
+        result[selection["alias"]] = complete(value, selection["selections"], variables,
+                                              None if path else timings, path + (name,))
+        if timings is not None and path and selection["selections"]:
+            key = ".".join(path + (name,))
+            timings[key] = timings.get(key, 0.0) + (time.perf_counter() - start) * 1000
+    return result
+
+def complete(value, selections, variables, timings=None, path=()):
+    """Valor final de um campo: escalar, lista ou objeto com subseleção"""
+    if value is None:
+        return None
+    if isinstance(value, list):
+        return [complete(v, selections, variables, timings, path) for v in value]
+    if isinstance(value, dict):
+        if not selections:
+            raise GraphQLError(f"O campo do tipo '{value.get('__typename')}' exige uma subseleção")
+        return execute_selections(value, selections, variables, timings, path)
+    return value
+
+def connection(items, first, node):
+    """Conexão GraphQL (nodes + totalCount); só os `first` primeiros itens viram nós"""
+    return {"__typename": "Connection", "totalCount": len(items),
+            "nodes": [node(item) for item in items[:min(first, MAX_PER_PAGE)]]}
+
+def graphql_user(data, login):
+    """Nó User (campos resolvidos sob demanda)"""
+    user = data["users"].get(login)
+    if user is None:
+        return None
+    return {
+        "__typename": "User",
+        "login": login,
+        "name": user["name"],
+        "location": user["location"],
+        "bio": user["bio"],
+        "repositories": lambda first=DEFAULT_PER_PAGE, **_: connection(
+            user["projects"], first, lambda name: graphql_repository(data, name))
+    }
+
+def graphql_issue(data, issue):
+    """Nó Issue"""
+    return {
+        "__typename": "Issue",
+        "number": issue["number"],
+        "title": issue["title"],
+        "state": issue["state"].upper(),
+        "createdAt": issue["created_at"],
+        "body": issue["body"],
+        "author": graphql_user(data, issue["user"]["login"]),
+        "comments": lambda first=DEFAULT_PER_PAGE, **_: connection(
+            issue["comment_list"], first,
+            lambda c: {"__typename": "IssueComment", "body": c["body"], "createdAt": c["created_at"],
+                       "author": graphql_user(data, c["user"]["login"])})
+    }
+
+def graphql_repository(data, full_name):
+    """Nó Repository (subconjunto do esquema do GitHub)"""
+    repo = get_repository(data, full_name)
+    if repo is None:
+        return None
+
+    def issues(first=DEFAULT_PER_PAGE, orderBy=None, states=None, **_):
+        items = repo["issue_list"]
+        if states:
+            items = [i for i in items if i["state"].upper() in states]
+        if orderBy and orderBy.get("direction") == "ASC":
+            items = items[::-1]
+        return connection(items, first, lambda issue: graphql_issue(data, issue))
+
+    return {
+        "__typename": "Repository",
+        "name": repo["name"],
+        "nameWithOwner": repo["full_name"],
+        "description": repo["description"],
+        "stargazerCount": repo["stargazers_count"],
+        "forkCount": repo["forks_count"],
+        "createdAt": repo["created_at"],
+        "updatedAt": repo["updated_at"],
+        "primaryLanguage": {"__typename": "Language", "name": repo["language"]},
+        "issues": issues,
+        "mentionableUsers": lambda first=DEFAULT_PER_PAGE, **_: connection(
+            repo["contributor_list"], first, lambda c: graphql_user(data, c["login"])),
+        "refs": lambda first=DEFAULT_PER_PAGE, refPrefix="refs/heads/", **_: connection(
+            repo["branch_list"], first, lambda b: {"__typename": "Ref", "name": b["name"], "prefix": refPrefix})
+    }
+
+def graphql_root(data):
+    """Tipo Query"""
+    return {
+        "__typename": "Query",
+        "repository": lambda owner, name, **_: graphql_repository(data, f"{owner}/{name}"),
+        "user": lambda login: graphql_user(data, login),
+        "viewer": {"__typename": "User", "login": OWNER}
+    }
+
+def execute(data, query, variables=None, timings=None):
+    """Resposta GraphQL ({"data": ...} ou {"errors": [...]}) para a consulta
+
+    Com `timings`, registra também parse e execute (ms) e os campos medidos
+    por execute_selections.
+    """
+    try:
+        start = time.perf_counter()
+        selections = parse_document(query)
+        parsed = time.perf_counter()
+        result = execute_selections(graphql_root(data), selections, variables or {}, timings)
+        if timings is not None:
+            timings["parse"] = (parsed - start) * 1000
+            timings["execute"] = (time.perf_counter() - parsed) * 1000
+        return {"data": result}
+    except GraphQLError as e:
+        return {"data": None, "errors": [{"message": str(e)}]}
+
+# ============================================
+# SERVIDOR HTTP
+# ============================================
+
+class Handler(BaseHTTPRequestHandler):
+    """GET/HEAD para os endpoints REST e POST em /graphql"""
+    protocol_version = "HTTP/1.1"
+    # Headers e corpo saem em escritas separadas: com a conexão mantida pelo
+    # cliente, Nagle + ACK atrasado somariam ~40 ms a cada resposta
+    disable_nagle_algorithm = True
+
+    def send_json(self, status, payload, body=True, timings=None):
+        start = time.perf_counter()
+        content = json.dumps(payload).encode()
+        etag = f'W/"{hashlib.sha1(content).hexdigest()}"'
+        timings = {**(timings or {}), "serialize": (time.perf_counter() - start) * 1000}
+        if status == 200 and self.headers.get("If-None-Match") == etag:
+            status, content = 304, b""
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(content)))
+        self.send_header("ETag", etag)
+        self.send_header("Server-Timing", ", ".join(f"{name};dur={ms:.3f}" for name, ms in timings.items()))
+        self.end_headers()
+        if body:
+            self.wfile.write(content)
+
+    def send_route(self, body=True):
+        start = time.perf_counter()
+        status, payload = route(self.server.data, self.path)
+        self.send_json(status, payload, body, {"handler": (time.perf_counter() - start) * 1000})
+
+    def do_GET(self):
+        self.send_route()
+
+    def do_HEAD(self):
+        self.send_route(body=False)
+
+    def do_POST(self):
+        if urlsplit(self.path).path != "/graphql":
+            return self.send_json(404, {"message": "Not Found"})
+        try:
+            request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+        except ValueError:
+            return self.send_json(400, {"message": "Problems parsing JSON"})
+        timings = {}
+        payload = execute(self.server.data, request.get("query", ""), request.get("variables"), timings)
+        self.send_json(200, payload, timings=timings)
+
+    def log_message(self, format, *args):
+        pass  # Sem log por requisição: não interfere nas medições
+
+def make_server(host=HOST, port=PORT, seed=SEED):
+    """Servidor HTTP (uma thread por conexão) com o conjunto de dados gerado"""
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    server.data = make_dataset(seed, base=f"http://{host}:{port}")
+    return server
+
+# ============================================
+# CONTROLE EM OUTRO PROCESSO
+# ============================================
+
+def is_up(url):
+    """True se o servidor já responde em `url`"""
+    try:
+        with urllib.request.urlopen(url, timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+def server_meta(host=HOST, port=PORT):
+    """Semente e assinatura informadas pelo servidor em /meta (None se não informar)"""
+    try:
+        with urllib.request.urlopen(f"http://{host}:{port}/meta", timeout=0.5) as response:
+            return json.load(response)
+    except (OSError, ValueError):
+        return None
+
+def start_process(host=HOST, port=PORT, seed=SEED, args=()):
+    """Sobe o servidor em outro processo (se a porta ainda não responde) e espera ficar pronto
+
+    Um servidor já em execução só é reaproveitado se servir os mesmos dados
+    (mesma assinatura em /meta); senão, as medições misturariam conjuntos
+    de dados diferentes.
+    """
+    url = f"http://{host}:{port}/"
+    if is_up(url):
+        meta = server_meta(host, port)
+        if meta is None or meta.get("signature") != data_signature(seed):
+            raise RuntimeError(f"Já há um servidor em {url} com outros dados "
+                               f"(semente {meta.get('seed') if meta else '?'}, esperada {seed}); "
+                               "encerre-o ou use outra porta")
+        print(f"Servidor local já em execução em {url}")
+        return None
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--host", host,
+                                "--port", str(port), "--seed", str(seed), *args])
+    deadline = time.monotonic() + START_TIMEOUT
+    while time.monotonic() < deadline:
+        if is_up(url):
+            print(f"Servidor local iniciado em {url} (pid {process.pid})")
+            return process
+        if process.poll() is not None:
+            break
+        time.sleep(0.05)
+    process.terminate()
+    raise RuntimeError(f"O servidor local não respondeu em {url}")
+
+def stop_process(process):
+    """Encerra o processo iniciado por start_process"""
+    if process is not None:
+        process.terminate()
+        process.wait(timeout=5)
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Servidor local REST + GraphQL com dados sintéticos")
+    parser.add_argument("--host", default=HOST)
+    parser.add_argument("--port", type=int, default=PORT)
+    parser.add_argument("--seed", type=int, default=SEED)
+    args = parser.parse_args()
+
+    server = make_server(args.host, args.port, args.seed)
+    print(f"Servidor local em http://{args.host}:{args.port} "
+          f"(REST e /graphql, {len(server.data['repos'])} repositórios)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,127 @@
+"""
+Gerador de Dados Sintéticos: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Gera conjuntos de dados com o mesmo esquema de experiment_results.csv e
+distribuições ajustadas aos dados observados em cada grupo
+(api_type, complexity, repository): tempo log-normal e tamanho amostrado
+da distribuição empírica. Usado pelos benchmarks de analise.py e
+dashboard.py em escalas de 10^3 a 10^8 linhas.
+"""
+
+import argparse
+import os
+
+import numpy as np
+import pandas as pd
+
+# Configuração
+INPUT_DIR = "results"
+INPUT_FILE = "experiment_results.csv"
+CHUNK_SIZE = 1_000_000  # Linhas geradas por bloco ao escrever CSVs grandes
+GROUP_FIELDS = ['api_type', 'complexity', 'repository']
+COLUMNS = ['timestamp', 'api_type', 'complexity', 'repository',
+           'execution', 'time_ms', 'size_bytes', 'status']
+
+# ============================================
+# PERFIL DOS DADOS OBSERVADOS
+# ============================================
+
+def fit_profile(df):
+    """Ajusta, por grupo, os parâmetros usados na geração"""
+    profile = []
+    for (api_type, complexity, repository), group in df.groupby(GROUP_FIELDS, observed=True):
+        log_time = np.log(group['time_ms'].to_numpy(dtype=float))
+        sizes = group['size_bytes'].value_counts(normalize=True)
+        statuses = group['status'].value_counts(normalize=True)
+        profile.append({
+            "api_type": api_type,
+            "complexity": complexity,
+            "repository": repository,
+            "log_mu": float(log_time.mean()),
+            "log_sigma": float(log_time.std(ddof=1)) if len(log_time) > 1 else 0.0,
+            "size_values": sizes.index.to_numpy(dtype=np.int64),
+            "size_probs": sizes.to_numpy(dtype=float),
+            "status_values": statuses.index.to_numpy(dtype=np.int64),
+            "status_probs": statuses.to_numpy(dtype=float)
+        })
+    return profile
+
+def load_profile(filepath=None):
+    """Ajusta o perfil a partir do CSV do experimento"""
+    filepath = filepath or os.path.join(INPUT_DIR, INPUT_FILE)
+    return fit_profile(pd.read_csv(filepath))
+
+# ============================================
+# GERAÇÃO
+# ============================================
+
+def generate(n_rows, profile, seed=42, start="2025-11-22T13:00:00", offset=0):
+    """Gera um DataFrame sintético com `n_rows` linhas (vetorizado)"""
+    rng = np.random.default_rng(seed)
+    n_groups = len(profile)
+
+    # Grupos balanceados como no desenho do experimento, em ordem aleatória
+    group_idx = (np.arange(offset, offset + n_rows) % n_groups)
+    execution = (np.arange(offset, offset + n_rows) // n_groups + 1).astype(np.int64)
+    order = rng.permutation(n_rows)
+    group_idx, execution = group_idx[order], execution[order]
+
+    time_ms = np.empty(n_rows)
+    size_bytes = np.empty(n_rows, dtype=np.int64)
+    status = np.empty(n_rows, dtype=np.int64)
+    for i, group in enumerate(profile):
+        mask = group_idx == i
+        n = int(mask.sum())
+        if n == 0:
+            continue
+        time_ms[mask] = rng.lognormal(group["log_mu"], group["log_sigma"], n)
+        size_bytes[mask] = rng.choice(group["size_values"], n, p=group["size_probs"])
+        status[mask] = rng.choice(group["status_values"], n, p=group["status_probs"])
+
+    # Uma medição a cada ~1.1 s, como na execução real (requisição + pausa)
+    gaps = rng.exponential(1.1, n_rows).cumsum()
+    timestamps = pd.Timestamp(start) + pd.to_timedelta(gaps + 1.1 * offset, unit='s')
+
+    return pd.DataFrame({
+        'timestamp': timestamps.strftime('%Y-%m-%dT%H:%M:%S.%f'),
+        'api_type': np.array([g["api_type"] for g in profile])[group_idx],
+        'complexity': np.array([g["complexity"] for g in profile])[group_idx],
+        'repository': np.array([g["repository"] for g in profile])[group_idx],
+        'execution': execution,
+        'time_ms': time_ms.round(2),
+        'size_bytes': size_bytes,
+        'status': status
+    }, columns=COLUMNS)
+
+def generate_csv(n_rows, filepath, profile=None, seed=42, chunk_size=CHUNK_SIZE):
+    """Escreve um CSV sintético em blocos (memória limitada a `chunk_size` linhas)"""
+    profile = profile or load_profile()
+    directory = os.path.dirname(filepath)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+    written = 0
+    chunk = 0
+    while written < n_rows:
+        n = min(chunk_size, n_rows - written)
+        df = generate(n, profile, seed=seed + chunk, offset=written)
+        df.to_csv(filepath, mode='w' if written == 0 else 'a', header=(written == 0), index=False)
+        written += n
+        chunk += 1
+    return filepath
+
+# ============================================
+# MAIN
+# ============================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gera dados sintéticos no esquema do experimento")
+    parser.add_argument("rows", type=int, help="Número de linhas")
+    parser.add_argument("--output", default=os.path.join(INPUT_DIR, "synthetic_results.csv"))
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    generate_csv(args.rows, args.output, seed=args.seed)
+    print(f"{args.rows} linhas sintéticas salvas em: {args.output}")
@@ -0,0 +1,154 @@
+"""
+Tempos por Sub-requisição: GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Tabela lateral em formato longo (subrequest_timings.csv) com uma linha por
+sub-requisição de cada medição, ligada à linha principal por (run_id,
+request_id), já que request_id recomeça em 1 a cada execução:
+  - kind "call": rótulo (repo, issues, contributors, branches, graphql ou o
+    nível das consultas aninhadas), início relativo ao início da medição,
+    duração, status, bytes e tentativas;
+  - kind "server": fases informadas pelo servidor no header Server-Timing
+    da sub-requisição (o servidor local envia parse, execute, serialize e o
+    tempo de cada campo do segundo nível, ex.: "repository.issues").
+
+Com ela, o dashboard desenha a cascata (Gantt) de uma medição típica e a
+composição média da latência: por endpoint no REST e por fase/resolvedor
+no GraphQL.
+"""
+
+import csv
+import os
+
+# Configuração
+SUBREQUEST_FILE = "subrequest_timings.csv"
+KEY = ["run_id", "request_id"]  # Liga a tabela às linhas de experiment_results.csv
+FIELDS = ["run_id", "request_id", "call", "kind", "label", "start_ms", "duration_ms", "status", "size_bytes", "attempts"]
+NETWORK_COMPONENT = "rede + cliente"  # Parte da chamada GraphQL fora do Server-Timing
+OTHER_FIELDS = "outros campos"        # execute menos os campos medidos
+
+# Estado global (linhas acumuladas durante a execução)
+ROWS = []
+
+# ============================================
+# REGISTRO
+# ============================================
+
+def parse_server_timing(header):
+    """(nome, duração em ms) de cada métrica de um header Server-Timing"""
+    metrics = []
+    for entry in filter(None, (part.strip() for part in header.split(","))):
+        name, *params = [p.strip() for p in entry.split(";")]
+        duration = next((float(p[4:]) for p in params if p.startswith("dur=")), None)
+        if duration is not None:
+            metrics.append((name, duration))
+    return metrics
+
+def record_calls(run_id, request_id, start_ns, calls):
+    """Acrescenta as sub-requisições de uma medição (e as fases do Server-Timing)
+
+    `calls` traz (rótulo, início_ns, fim_ns, status, bytes, tentativas,
+    Server-Timing) de cada sub-requisição; os instantes viram ms relativos
+    ao início da medição.
+    """
+    for index, (label, call_start, call_end, status, size, attempts, server_timing) in enumerate(calls):
+        ROWS.append({
+            "run_id": run_id,
+            "request_id": request_id,
+            "call": index,
+            "kind": "call",
+            "label": label,
+            "start_ms": round((call_start - start_ns) / 1e6, 3),
+            "duration_ms": round((call_end - call_start) / 1e6, 3),
+            "status": status,
+            "size_bytes": size,
+            "attempts": attempts
+        })
+        for name, duration in parse_server_timing(server_timing):
+            ROWS.append({"run_id": run_id, "request_id": request_id, "call": index, "kind": "server",
+                         "label": name, "duration_ms": round(duration, 3)})
+
+def save_subrequests(filepath):
+    """Salva a tabela de sub-requisições; sem linhas, remove a de uma execução anterior"""
+    if not ROWS:
+        if os.path.exists(filepath):
+            os.remove(filepath)
+            print(f"Tabela de sub-requisições antiga removida: {filepath}")
+        return
+    with open(filepath, 'w', newline='', encoding='utf-8') as f:
+        writer = csv.DictWriter(f, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(ROWS)
+    print(f"Tempos por sub-requisição salvos em: {filepath} ({len(ROWS)} linhas)")
+
+def load_subrequests(filepath):
+    """Tabela de sub-requisições com rótulos categóricos"""
+    import pandas as pd
+    return pd.read_csv(filepath, dtype={'run_id': str, 'kind': 'category', 'label': 'category'})
+
+def matching_runs(timings, df):
+    """True se a tabela é da mesma execução que as linhas de `df` (mesmos run_id)"""
+    if 'run_id' not in timings.columns or 'run_id' not in df.columns:
+        return False
+    return bool(set(timings['run_id'].dropna()) & set(df['run_id'].astype(str)))
+
+# ============================================
+# RESUMOS PARA O DASHBOARD
+# ============================================
+
+def median_requests(df):
+    """(run_id, request_id) da medição sem erro mais próxima da mediana de cada (complexity, api_type)"""
+    ok = df[df['status'].between(200, 399)]
+    if 'error_class' in ok.columns:
+        ok = ok[ok['error_class'].astype(object).fillna('').astype(str) == '']  # Ex.: erros GraphQL com 200
+    chosen = {}
+    for (complexity, api), group in ok.groupby(['complexity', 'api_type'], observed=True):
+        distance = (group['time_ms'] - group['time_ms'].median()).abs()
+        row = group.loc[distance.idxmin()]
+        chosen[(complexity, api)] = (str(row['run_id']), int(row['request_id']))
+    return chosen
+
+def graphql_components(calls, server):
+    """Componentes de cada chamada GraphQL: fases e campos do Server-Timing e o restante
+
+    Chamadas sem Server-Timing (ex.: API do GitHub) entram inteiras com o rótulo da chamada.
+    """
+    import pandas as pd
+    untimed = calls[~calls.set_index(KEY + ['call']).index.isin(server.set_index(KEY + ['call']).index)]
+    whole = untimed[KEY + ['label', 'duration_ms']].rename(columns={'label': 'component'})
+    if len(untimed) == len(calls):
+        return whole
+    phases = server.pivot_table(index=KEY + ['call'], columns='label', values='duration_ms',
+                                aggfunc='sum', fill_value=0.0, observed=True)
+    timed = calls.join(phases, on=KEY + ['call'], how='inner')
+    fields = [name for name in phases.columns if '.' in name]
+    steps = [name for name in ['parse', 'serialize'] if name in phases.columns]
+    execute = timed['execute'] if 'execute' in phases.columns else timed[fields].sum(axis=1)
+    timed[OTHER_FIELDS] = (execute - timed[fields].sum(axis=1)).clip(lower=0)
+    timed[NETWORK_COMPONENT] = (timed['duration_ms'] - execute - timed[steps].sum(axis=1)).clip(lower=0)
+    components = steps + fields + [OTHER_FIELDS, NETWORK_COMPONENT]
+    parts = timed[KEY + components].melt(id_vars=KEY, var_name='component', value_name='duration_ms')
+    parts['component'] = parts['component'].str.split('.').str[-1]  # "repository.issues" -> "issues"
+    return pd.concat([parts, whole], ignore_index=True)
+
+def latency_composition(timings, df):
+    """Tempo médio (ms) de cada componente por (complexity, api_type), em formato largo
+
+    REST: duração somada de cada endpoint (em HTTP/2 multiplexado as chamadas
+    se sobrepõem e a soma passa do tempo total). GraphQL: graphql_components.
+    """
+    import pandas as pd
+    meta = df[KEY + ['api_type', 'complexity']].astype({'run_id': str})
+    calls = timings[timings['kind'] == 'call'].merge(meta, on=KEY)
+    server = timings[timings['kind'] == 'server']
+    rest = calls[calls['api_type'] == 'REST'][KEY + ['label', 'duration_ms']]
+    graphql = calls[calls['api_type'] == 'GraphQL'][KEY + ['call', 'label', 'duration_ms']]
+    graphql_ids = server.set_index(KEY).index.isin(graphql.set_index(KEY).index)
+    parts = pd.concat([rest.rename(columns={'label': 'component'}),
+                       graphql_components(graphql, server[graphql_ids])], ignore_index=True)
+    parts['component'] = parts['component'].astype(str)
+    per_request = parts.merge(meta, on=KEY).groupby(
+        ['complexity', 'api_type'] + KEY + ['component'], observed=True)['duration_ms'].sum()
+    wide = per_request.unstack('component', fill_value=0.0)
+    return wide.groupby(level=['complexity', 'api_type'], observed=True).mean()
@@ -0,0 +1,102 @@
+"""
+Volume de Dados (servidor local): GraphQL vs REST
+Disciplina: Laboratório de Experimentação de Software
+Curso: Engenharia de Software
+
+Define os eixos de volume dos repositórios gerados pelo servidor local
+(número de issues, contribuidores e branches e tamanho dos campos de texto)
+e o plano de varredura desses eixos. Cada ponto do plano é um repositório
+"volume/i{issues}-c{contributors}-b{branches}-t{text_size}", que o servidor
+gera sob demanda; assim a varredura usa as mesmas consultas simple, medium
+e complex, com os pontos de volume aleatorizados junto com os tratamentos.
+
+Com AXIS_PAGES, nos pontos de volume cada lista (issues, contribuidores,
+branches) é pedida com página igual ao nível do seu eixo, para que o volume
+das listas apareça na resposta; sem isso, só text_size muda o tamanho.
+PAGE_SCALE multiplica o tamanho das páginas (first / per_page) nas demais
+consultas.
+"""
+
+import re
+from itertools import product
+
+# Configuração
+VOLUME_OWNER = "volume"
+VOLUME_AXES = {
+    "issues": [10, 100, 1000],
+    "contributors": [10, 100, 1000],
+    "branches": [10, 100, 1000],
+    "text_size": [50, 500, 5000]   # Caracteres de description, body dos issues e comentários
+}
+VOLUME_BASE = {"issues": 100, "contributors": 100, "branches": 100, "text_size": 500}
+SWEEP_DESIGN = "one-at-a-time"   # "one-at-a-time" (um eixo por vez, os demais na base) ou "factorial"
+PAGE_SCALE = 1                   # Multiplicador de first / per_page (limitado a MAX_PAGE)
+MAX_PAGE = 100                   # Limite de página da API do GitHub
+AXIS_PAGES = True                # Pontos de volume: página de cada lista = nível do eixo
+MAX_AXIS_PAGE = 1000             # Limite das páginas por eixo (MAX_PER_PAGE do servidor local)
+LIST_AXES = ["issues", "contributors", "branches"]
+FIELD_AXES = {"issues": "issues", "mentionableUsers": "contributors", "refs": "branches"}  # Campo GraphQL -> eixo
+
+NAME_PATTERN = re.compile(r"^i(\d+)-c(\d+)-b(\d+)-t(\d+)$")
+
+# ============================================
+# PONTOS DE VOLUME <-> REPOSITÓRIOS
+# ============================================
+
+def volume_name(point):
+    """Nome do repositório de um ponto de volume"""
+    return f"i{point['issues']}-c{point['contributors']}-b{point['branches']}-t{point['text_size']}"
+
+def parse_volume(name):
+    """Ponto de volume codificado no nome do repositório (None se não for um)"""
+    match = NAME_PATTERN.match(name)
+    if match is None:
+        return None
+    return dict(zip(["issues", "contributors", "branches", "text_size"], map(int, match.groups())))
+
+def volume_grid(axes=VOLUME_AXES, base=VOLUME_BASE, design=SWEEP_DESIGN):
+    """Pontos do plano de varredura (sem repetição)"""
+    if design == "factorial":
+        return [dict(zip(axes, values)) for values in product(*axes.values())]
+    if design != "one-at-a-time":
+        raise ValueError(f"Plano desconhecido: {design}")
+    points = [dict(base)]
+    for axis, levels in axes.items():
+        for level in levels:
+            point = {**base, axis: level}
+            if point not in points:
+                points.append(point)
+    return points
+
+def volume_repos(axes=VOLUME_AXES, base=VOLUME_BASE, design=SWEEP_DESIGN):
+    """Identificadores (owner, repo) dos pontos do plano"""
+    return [(VOLUME_OWNER, volume_name(point)) for point in volume_grid(axes, base, design)]
+
+# ============================================
+# TAMANHO DAS PÁGINAS
+# ============================================
+
+def scale_page(size, axis=None, repo="", scale=None):
+    """Tamanho de página da lista do eixo `axis` em `repo`
+
+    Em um ponto de volume (com AXIS_PAGES) é o nível do eixo, limitado a
+    MAX_AXIS_PAGE; nos demais casos, `size` escalado (limitado a MAX_PAGE).
+    Sem `scale`, vale o PAGE_SCALE do módulo no momento da chamada.
+    """
+    scale = PAGE_SCALE if scale is None else scale
+    point = parse_volume(repo) if AXIS_PAGES and axis in LIST_AXES else None
+    if point is not None:
+        return min(point[axis], MAX_AXIS_PAGE)
+    return min(size * scale, MAX_PAGE)
+
+def scale_query(query, repo="", scale=None):
+    """Consulta GraphQL com o `first: N` de cada lista ajustado por scale_page"""
+    scale = PAGE_SCALE if scale is None else scale
+    if scale == 1 and not (AXIS_PAGES and parse_volume(repo)):
+        return query
+
+    def replace(match):
+        field, arguments, size = match.groups()
+        return f"{field}({arguments}first: {scale_page(int(size), FIELD_AXES.get(field), repo, scale)}"
+
+    return re.sub(r"(\w+)\s*\(([^()]*?)first:\s*(\d+)", replace, query)